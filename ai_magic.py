@@ -1,37 +1,88 @@
-import json
 import os
-import time
-import google.generativeai as genai
 import sys
 
+from llm_cache import cache_from_env
+from metrics import METRICS
+from model_json import Report, clean_bullets, salvage_array, salvage_object
+from model_resolver import genai, resolve_model
+from rate_limiter import RATE_LIMITED, classify_error, scheduler_from_env
+from records import read_records, resolve_input, write_records
+
 # --- CONFIGURATION ---
 API_KEY = os.environ.get("GEMINI_API_KEY")
+INPUT_FILE = "2.jsonl"
+OUTPUT_FILE = "4.jsonl"
+
+# --- BATCH MODE ---
+# Ek request me kai articles jaate hain, isliye ab 2.jsonl ke saare articles process ho sakte hain.
+BATCH_MODE = True
+BATCH_TOKEN_BUDGET = 12000   # Ek batch ke prompt ka andaazan input token budget
+MAX_BATCH_ITEMS = 8          # Output bhi limit me rahe (har article ~3 bullets)
+MAX_CONTENT_CHARS = 15000    # Token limit safety (per article)
+CHARS_PER_TOKEN = 4          # Rough estimate, tokenizer ke bina
+
+# Free tier limit management: RPM/TPM bucket + backoff (dekho rate_limiter.py)
+SCHEDULER = scheduler_from_env("gemini-summaries")
+
+# Rerun par same article dobara summarize na ho (dekho llm_cache.py).
+# Prompt ya output format badle to version badlo.
+SUMMARY_TEMPLATE_VERSION = "summary-v1"
+CACHE = cache_from_env()
+
+def cache_content(title, content):
+    """Cache key ke liye article ka wahi hissa jo model ko jaata hai."""
+    return f"{title}\n{content[:MAX_CONTENT_CHARS]}"
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
 
 def get_best_model():
-    """Auto-detect the best available model using official SDK"""
+    """Summaries ke liye model (GEMINI_MODEL pin ya cached listing, dekho model_resolver.py)."""
     if not API_KEY:
         print("❌ CRITICAL ERROR: GEMINI_API_KEY not found!")
         sys.exit(1)
 
-    genai.configure(api_key=API_KEY)
-    
     try:
-        available_models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
-        
-        preferred_order = ["models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro"]
-        for pref in preferred_order:
-            if pref in available_models:
-                return pref
-                
-        return available_models[0] if available_models else None
+        return resolve_model("summary")
     except Exception as e:
         print(f"❌ Error fetching models: {e}")
         return None
 
+def generate_json_text(model_name, prompt):
+    """Ek raw JSON-mode request. Retry/rate limit SCHEDULER karta hai, yahan nahi."""
+    sdk = genai()
+    model = sdk.GenerativeModel(model_name)
+    # Native JSON Mode applied
+    response = model.generate_content(
+        prompt,
+        generation_config=sdk.GenerationConfig(
+            response_mime_type="application/json",
+        )
+    )
+    return response.text
+
+def request_failure(e):
+    """Scheduler ke retries khatam hone ke baad wali error ko purane failure strings me badalta hai."""
+    if classify_error(e) == RATE_LIMITED:
+        return "Summary Failed (Quota Exceeded)"
+    return f"API ERROR: {str(e)[:50]}"
+
+def format_bullets(bullets):
+    """
+    Model ke facts ko PWA UI ke bullet points me badalta hai. Return: (summary, None) ya
+    (None, reject reason). Chatter / error strings yahin hat jaate hain (dekho model_json.py).
+    """
+    bullets, reason = clean_bullets(bullets)
+    if reason:
+        return None, reason
+    return "\n".join(f"• {b}" for b in bullets), None
+
 def summarize_with_ai(model_name, title, content):
     """AI se strictly 3 facts nikalwayega from CONTENT using JSON mode"""
-    model = genai.GenerativeModel(model_name)
-    
+    cached = CACHE.get(model_name, SUMMARY_TEMPLATE_VERSION, cache_content(title, content))
+    if cached:
+        return cached
+
     prompt = f"""
     Analyze the following news content and extract EXACTLY 3 most important facts for Banking/SSC exams.
     Ensure facts contain amounts, dates, names, or new rules if present.
@@ -40,91 +91,178 @@ def summarize_with_ai(model_name, title, content):
     Example: {{"bullets": ["Fact 1", "Fact 2", "Fact 3"]}}
 
     News Title: {title}
-    News Content: {content[:15000]}  # Token limit safety
+    News Content: {content[:MAX_CONTENT_CHARS]}  # Token limit safety
     """
-    
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            # Native JSON Mode applied
-            response = model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    response_mime_type="application/json",
-                )
-            )
-            
-            # Parse the JSON response
-            result = json.loads(response.text)
-            bullets = result.get('bullets', [])
-            
-            # Join array into bullet points for PWA UI
-            if len(bullets) >= 3:
-                formatted_summary = "\n".join([f"• {b}" for b in bullets[:3]])
-                return formatted_summary
-            else:
-                return "Error: AI generated incomplete points."
-
-        except Exception as e:
-            error_str = str(e).lower()
-            if "429" in error_str or "quota" in error_str:
-                print(f"   ⚠️ Quota Hit! Waiting 60s before retry {attempt+1}/{max_retries}...")
-                time.sleep(60)
-                continue
-            else:
-                return f"API ERROR: {str(e)[:50]}"
 
-    return "Summary Failed (Quota Exceeded)"
+    try:
+        text = SCHEDULER.call(generate_json_text, model_name, prompt, tokens=estimate_tokens(prompt))
+    except Exception as e:
+        return request_failure(e)
 
-def process_news():
-    print("🚀 Step 3: AI Magic Starting (Slow Mode for Free Tier)...")
+    # {"bullets": [...]} ki list seedha padho: response kata ho to bhi complete facts bachte hain
+    bullets, truncated = salvage_array(text)
+    summary, reason = format_bullets(bullets)
+    if not summary:
+        METRICS.incr("ai.rejected")
+        return f"API ERROR: {reason}{f' ({truncated})' if truncated else ''}"
+    if truncated:
+        METRICS.incr("ai.salvaged")
+    CACHE.put(model_name, SUMMARY_TEMPLATE_VERSION, cache_content(title, content), summary)
+    return summary
 
-    if not os.path.exists("2.json"): 
-        print("❌ '2.json' not found. Run cleaner first.")
-        return
+def make_batches(records, budget=BATCH_TOKEN_BUDGET, max_items=MAX_BATCH_ITEMS):
+    """Records ko token budget ke andar wale batches me todta hai (order same rehta hai)."""
+    batch, used = [], 0
+    for item in records:
+        cost = estimate_tokens(item.get('title', '')) + estimate_tokens(item.get('content', '')[:MAX_CONTENT_CHARS])
+        if batch and (used + cost > budget or len(batch) >= max_items):
+            yield batch
+            batch, used = [], 0
+        batch.append(item)
+        used += cost
+    if batch:
+        yield batch
 
-    with open("2.json", "r", encoding="utf-8") as f:
-        try: 
-            full_data = json.load(f)
-        except json.JSONDecodeError: 
-            print("❌ '2.json' is corrupted.")
-            return
+def summarize_batch_with_ai(model_name, articles):
+    """
+    Kai articles ek hi JSON-mode request me bhejta hai.
+    articles: {id: (title, content)}. Return: {id: summary ya "ERROR: ..." string}.
+    Ek article ka jawab kharab ho to sirf wahi fail hota hai, baaki nahi.
+    Cache me pade articles request me jaate hi nahi.
+    """
+    summaries = {}
+    for article_id, (title, content) in articles.items():
+        cached = CACHE.get(model_name, SUMMARY_TEMPLATE_VERSION, cache_content(title, content))
+        if cached:
+            summaries[article_id] = cached
+    articles = {article_id: article for article_id, article in articles.items() if article_id not in summaries}
+    if not articles:
+        return summaries
 
-    latest_news = full_data[:10]  # First 10 news items
-    processed_data = []
+    article_blocks = "\n\n".join(
+        f"[id: {article_id}]\nNews Title: {title}\nNews Content: {content[:MAX_CONTENT_CHARS]}"
+        for article_id, (title, content) in articles.items()
+    )
+    prompt = f"""
+    Analyze each news article below and extract EXACTLY 3 most important facts for Banking/SSC exams from EACH article.
+    Ensure facts contain amounts, dates, names, or new rules if present.
+    Never mix facts from different articles.
 
-    best_model = get_best_model()
-    if not best_model:
-        print("❌ Error: No AI Model Available.")
-        return
-        
-    print(f"🤖 Selected Model: {best_model}\n")
+    Output strictly as a JSON object keyed by the article id. Each value is a list of 3 strings.
+    Example: {{"1": ["Fact 1", "Fact 2", "Fact 3"], "2": ["Fact 1", "Fact 2", "Fact 3"]}}
 
-    for i, item in enumerate(latest_news):
-        title = item.get('title', 'No Title')
-        content = item.get('content', '') # Ab real content use hoga
-        
+    ### ARTICLES:
+    {article_blocks}
+    """
+
+    try:
+        text = SCHEDULER.call(generate_json_text, model_name, prompt, tokens=estimate_tokens(prompt))
+    except Exception as e:
+        summaries.update({article_id: request_failure(e) for article_id in articles})
+        return summaries
+
+    # Kata hua response: jitne articles ke jawab complete hain wo bachte hain, sirf baaki fail
+    result, truncated = salvage_object(text)
+    report = Report("ai.summaries")
+    report.mark_truncated(truncated)
+    for article_id, (title, content) in articles.items():
+        if article_id not in result:
+            reason = f"missing in batch response{f' ({truncated})' if truncated else ''}"
+        else:
+            summary, reason = format_bullets(result[article_id])
+        if reason:
+            report.reject(article_id, reason)
+            summaries[article_id] = f"API ERROR: {reason}"
+            continue
+        report.valid += 1
+        CACHE.put(model_name, SUMMARY_TEMPLATE_VERSION, cache_content(title, content), summary)
+        summaries[article_id] = summary
+    if report.truncated and report.valid:
+        METRICS.incr("ai.salvaged", report.valid)
+    return summaries
+
+def is_failure(ai_summary):
+    return "ERROR" in ai_summary or "Failed" in ai_summary
+
+def summarize_batches(records, model_name):
+    """
+    Generator (batch mode): har batch ke liye ek request. Batches SCHEDULER ke through
+    concurrently chalte hain (RPM/TPM limit ke andar), output order input jaisa rehta hai.
+    """
+    def run_batch(batch):
+        articles = {str(i + 1): (item.get('title', 'No Title'), item.get('content', ''))
+                    for i, item in enumerate(batch)}
+        METRICS.observe("ai.batch_size", len(batch))
+        summaries = summarize_batch_with_ai(model_name, articles)
+        return [(item, summaries[article_id]) for article_id, item in zip(articles, batch)]
+
+    done = 0
+    for results in SCHEDULER.map(run_batch, make_batches(records)):
+        for item, ai_summary in results:
+            done += 1
+            title = item.get('title', 'No Title')
+
+            if not is_failure(ai_summary):
+                print(f"   ✅ [{done}] Done: {title[:40]}...")
+                item['content'] = ai_summary
+                yield item
+            else:
+                METRICS.incr("ai.failed")
+                print(f"   ❌ [{done}] Failed: {title[:40]}... (Reason: {ai_summary})")
+
+def summarize_records(records, model_name):
+    """Generator: har record ka content AI summary se replace karke yield karta hai (ek request per article)."""
+    def run_one(item):
         # Ab AI dono (title aur content) analyze karega
-        ai_summary = summarize_with_ai(best_model, title, content)
+        return item, summarize_with_ai(model_name, item.get('title', 'No Title'), item.get('content', ''))
 
-        if "ERROR" not in ai_summary and "Failed" not in ai_summary:
+    for i, (item, ai_summary) in enumerate(SCHEDULER.map(run_one, records)):
+        title = item.get('title', 'No Title')
+
+        if not is_failure(ai_summary):
             print(f"   ✅ [{i+1}] Done: {title[:40]}...")
-            
+
             # Update item with AI summary and save
             item['content'] = ai_summary
-            processed_data.append(item)
+            yield item
         else:
+            METRICS.incr("ai.failed")
             print(f"   ❌ [{i+1}] Failed: {title[:40]}... (Reason: {ai_summary})")
 
-        # Free tier limit management
-        if i < len(latest_news) - 1:
-            print("      ⏳ Cooling down (15s)...")
-            time.sleep(15) 
+def process_news(input_file=INPUT_FILE, output_file=OUTPUT_FILE, checkpoint=None):
+    """Return: summarized articles ka count (error par None)."""
+    print("🚀 Step 3: AI Magic Starting (Batch Mode for Free Tier)...")
+
+    source = resolve_input(input_file)
+    if not source:
+        print(f"❌ '{input_file}' not found. Run cleaner first.")
+        return None
+
+    best_model = get_best_model()
+    if not best_model:
+        print("❌ Error: No AI Model Available.")
+        return None
+        
+    print(f"🤖 Selected Model: {best_model}\n")
 
-    with open("4.json", "w", encoding="utf-8") as f:
-        json.dump(processed_data, f, indent=4, ensure_ascii=False)
+    news = read_records(source)
+    summarize = summarize_batches if BATCH_MODE else summarize_records
+    if checkpoint:
+        # Pichle run me jo articles summarize ho chuke, unpe dobara API call nahi
+        summaries = checkpoint.wrap(news, lambda rest: summarize(rest, best_model))
+    else:
+        summaries = summarize(news, best_model)
+    try:
+        count = write_records(output_file, summaries)
+    except ValueError:
+        print(f"❌ '{source}' is corrupted.")
+        return None
 
-    print(f"\n🎉 Success! Premium exam facts saved to 4.json.")
+    print(SCHEDULER.summary())
+    print(CACHE.summary())
+    CACHE.close()
+    print(f"\n🎉 Success! {count} premium exam facts saved to {output_file}.")
+    return count
 
 if __name__ == "__main__":
     process_news()
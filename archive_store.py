@@ -0,0 +1,372 @@
+"""
+Sharded, memory-mapped archive store.
+
+Articles `date` ke mahine ke hisaab se shards me jaate hain:
+
+    archive/2026-03.jsonl   # us mahine ke articles (append-only JSON Lines)
+    archive/2026-03.idx     # fixed-size binary entries, har article ke liye ek
+    archive/meta.json       # index format + category order
+
+Har index entry (ENTRY struct) me link hash, shard me byte offset/length, `date`
+aur `archived_on` ke day numbers aur keyword category bitmask hai. Index files
+`mmap` hoti hain, isliye:
+
+- "date X ke saare articles" sirf us mahine ka index aur matching bytes padhta hai,
+- category filter (e.g. "Banking, March me") bina JSON parse kiye index se hota hai,
+- link lookup / duplicate check ek in-memory hash map se (index se banta hai),
+- naya article sirf shard ke end me judta hai (full rewrite nahi).
+
+Index hamesha shard se dobara ban sakta hai; shard index se aage ho (crash / git
+merge) to sirf naya hissa re-index hota hai, adhuri last line truncate hoti hai.
+
+PWA `archive_news.json` (poora archive, purana JSON array format) padhta hai. cut3 har
+run ke naye records usme bhi jodta hai, par file dobara nahi likhta: records.append_json_array
+sirf closing `]` ke pehle append karta hai. `export` command use shards se poora
+dobara banata hai (e.g. file kabhi peeche reh gayi ho).
+
+CLI:
+    python archive_store.py migrate        # archive_news.json / archive_news.jsonl -> shards
+    python archive_store.py query --from 2026-03-01 --to 2026-03-31 [--field archived_on] [--category "Banking & Economy"]
+    python archive_store.py export         # archive_news.json ko shards se poora dobara likho
+    python archive_store.py stats
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from keywords import EXAM_KEYWORD_CATEGORIES, MATCHER
+from records import read_records, write_records
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_LOG = "archive_news.jsonl"     # Pichla single-log store, sirf migration ke liye
+LEGACY_ARCHIVE = "archive_news.json"   # PWA ka poora archive (append-only); store khaali ho to isse migrate
+UNDATED_SHARD = "undated"
+INDEX_VERSION = 1
+
+QUERY_FIELDS = ("date", "archived_on")
+CATEGORIES = list(EXAM_KEYWORD_CATEGORIES)
+
+# link hash (u64), offset (u32), length (u32), date day, archived_on day, category bits
+ENTRY = struct.Struct("<QIIIIH")
+
+def link_hash(link):
+    return int.from_bytes(hashlib.blake2b(link.encode("utf-8"), digest_size=8).digest(), "little")
+
+def day_number(value):
+    """'YYYY-MM-DD...' -> ordinal day (0 agar missing/galat)."""
+    try:
+        return datetime.date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return 0
+
+def category_bits(title):
+    bits = 0
+    for name in MATCHER.categories(title or ""):
+        bits |= 1 << CATEGORIES.index(name)
+    return bits
+
+def shard_name(record):
+    day = str(record.get("date") or "")[:10]
+    return day[:7] if day_number(day) else UNDATED_SHARD
+
+def make_entry(record, offset, length):
+    return ENTRY.pack(link_hash(record.get("link", "")), offset, length,
+                      day_number(record.get("date")), day_number(record.get("archived_on")),
+                      category_bits(record.get("title")))
+
+def map_file(path):
+    """Read-only mmap, ya None (khali / missing file ko mmap nahi kar sakte)."""
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return None
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class Shard:
+    """Ek mahine ka data file + uska binary index."""
+
+    def __init__(self, directory, name):
+        self.name = name
+        self.data_path = os.path.join(directory, f"{name}.jsonl")
+        self.index_path = os.path.join(directory, f"{name}.idx")
+        self._data = None
+        self._index = None
+        self.sync()
+
+    def _unmap(self):
+        for mapped in (self._data, self._index):
+            if mapped is not None:
+                mapped.close()
+        self._data = self._index = None
+
+    def _data_size(self):
+        return os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+
+    def sync(self):
+        """Index ko data file ke saath match karta hai (sirf jo hissa index me nahi hai)."""
+        self._unmap()
+        index_size = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        whole = index_size - index_size % ENTRY.size
+
+        covered = 0
+        if whole:
+            with open(self.index_path, "rb") as f:
+                f.seek(whole - ENTRY.size)
+                _, offset, length, _, _, _ = ENTRY.unpack(f.read(ENTRY.size))
+            covered = offset + length
+
+        actual = self._data_size()
+        if covered > actual:
+            # Data chhota ho gaya (rewrite/reset) -> poora index dobara banao
+            whole, covered = 0, 0
+        if whole != index_size:
+            with open(self.index_path, "ab") as f:
+                f.truncate(whole)
+        if covered == actual:
+            return
+
+        entries = []
+        end = covered
+        with open(self.data_path, "rb") as f:
+            f.seek(covered)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Adhuri line (crash ke beech likhi gayi) -> neeche truncate
+                if line.strip():
+                    entries.append(make_entry(json.loads(line), end, len(line)))
+                end += len(line)
+
+        if end < actual:
+            with open(self.data_path, "r+b") as f:
+                f.truncate(end)
+        with open(self.index_path, "ab") as f:
+            f.write(b"".join(entries))
+
+    def append(self, chunks, records):
+        """Pehle data fsync, phir index: beech me crash ho to agla sync() index theek kar leta hai."""
+        self._unmap()
+        offset = self._data_size()
+        entries = []
+        for data, record in zip(chunks, records):
+            entries.append(make_entry(record, offset, len(data)))
+            offset += len(data)
+
+        with open(self.data_path, "ab") as f:
+            f.write(b"".join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+        with open(self.index_path, "ab") as f:
+            f.write(b"".join(entries))
+
+    def entries(self):
+        """(link_hash, offset, length, date_day, archived_day, bits) tuples, seedha mmap se."""
+        if self._index is None:
+            self._index = map_file(self.index_path)
+        if self._index is None:
+            return iter(())
+        return ENTRY.iter_unpack(self._index)
+
+    def read(self, offset, length):
+        if self._data is None:
+            self._data = map_file(self.data_path)
+        return json.loads(self._data[offset:offset + length])
+
+    def close(self):
+        self._unmap()
+
+class ArchiveStore:
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._check_meta()
+        self.shards = {}
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".jsonl"):
+                self.shards[name[:-6]] = Shard(directory, name[:-6])
+        self._links = None
+
+    def _check_meta(self):
+        """Index format ya keyword categories badli ho to saare indexes dobara bante hain."""
+        meta_path = os.path.join(self.directory, "meta.json")
+        # Keywords badle to category bits bhi badlenge, isliye poori keyword list meta me
+        meta = {"version": INDEX_VERSION, "entry_size": ENTRY.size, "categories": EXAM_KEYWORD_CATEGORIES}
+        current = None
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                current = json.load(f)
+        if current == meta:
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".idx"):
+                os.remove(os.path.join(self.directory, name))
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+    def _link_map(self):
+        """link hash -> (shard, offset, length); pehli zaroorat par saare indexes se banta hai."""
+        if self._links is None:
+            links = {}
+            for name, shard in self.shards.items():
+                for h, offset, length, _, _, _ in shard.entries():
+                    links.setdefault(h, (name, offset, length))
+            self._links = links
+        return self._links
+
+    # --- writes ---
+
+    def append(self, records, added_records=None):
+        """
+        Naye records apne mahine ke shard ke end me; jo link pehle se hai wo skip.
+        `added_records` list di ho to jude hue records usme bhi. Return: kitne jude.
+        """
+        links = self._link_map()
+        batches = {}
+
+        for record in records:
+            link = record.get("link")
+            if not link:
+                continue
+            h = link_hash(link)
+            if h in links:
+                continue
+            name = shard_name(record)
+            data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            chunks, batch = batches.setdefault(name, ([], []))
+            chunks.append(data)
+            batch.append(record)
+            links[h] = (name, None, None)  # Offset niche, shard likhne ke baad
+            if added_records is not None:
+                added_records.append(record)
+
+        added = 0
+        for name, (chunks, batch) in sorted(batches.items()):
+            shard = self.shards.get(name) or Shard(self.directory, name)
+            self.shards[name] = shard
+            start = shard._data_size()
+            shard.append(chunks, batch)
+            for data, record in zip(chunks, batch):
+                links[link_hash(record["link"])] = (name, start, len(data))
+                start += len(data)
+            added += len(batch)
+        self.shards = dict(sorted(self.shards.items()))
+        return added
+
+    def migrate_from_json(self, path=LEGACY_ARCHIVE):
+        """
+        Purana archive (archive_news.json array ya archive_news.jsonl log) ek baar import karta hai.
+        Store me pehle se data ho to kuch nahi karta. Return: kitne import hue.
+        """
+        if len(self) or not os.path.exists(path):
+            return 0
+        return self.append(read_records(path))
+
+    # --- reads ---
+
+    def __contains__(self, link):
+        return link_hash(link) in self._link_map()
+
+    def __len__(self):
+        return len(self._link_map())
+
+    def get(self, link):
+        location = self._link_map().get(link_hash(link))
+        if not location:
+            return None
+        record = self.shards[location[0]].read(location[1], location[2])
+        return record if record.get("link") == link else None
+
+    def _shards_for(self, start, end, field):
+        if field != "date":
+            return list(self.shards.values())
+        if not start and not end:
+            return list(self.shards.values())
+        low, high = (start or "0000-00")[:7], (end or "9999-99")[:7]
+        return [shard for name, shard in self.shards.items()
+                if name != UNDATED_SHARD and low <= name <= high]
+
+    def query(self, start=None, end=None, field="date", category=None):
+        """
+        `field` (date / archived_on) ki inclusive day range (aur optional keyword category)
+        ke records yield karta hai, `field` ke order me. Filtering poori tarah index par hoti
+        hai; sirf matching records ke bytes padhe jaate hain.
+        """
+        if field not in QUERY_FIELDS:
+            raise ValueError(f"Unknown archive field: {field}")
+        mask = 0
+        if category is not None:
+            if category not in CATEGORIES:
+                raise ValueError(f"Unknown category: {category} (choose from {', '.join(CATEGORIES)})")
+            mask = 1 << CATEGORIES.index(category)
+
+        low = day_number(start) if start else 0
+        high = day_number(end) if end else float("inf")
+        column = 3 if field == "date" else 4
+
+        hits = []
+        for order, shard in enumerate(self._shards_for(start, end, field)):
+            for entry in shard.entries():
+                day = entry[column]
+                if (start and day < low) or day > high:
+                    continue
+                if mask and not entry[5] & mask:
+                    continue
+                hits.append((day, order, entry[1], entry[2], shard))
+
+        hits.sort(key=lambda hit: hit[:3])
+        for _, _, offset, length, shard in hits:
+            yield shard.read(offset, length)
+
+    def by_category(self, category, start=None, end=None):
+        return self.query(start, end, category=category)
+
+    def __iter__(self):
+        return self.query()
+
+    def stats(self):
+        shards = {name: sum(1 for _ in shard.entries()) for name, shard in self.shards.items()}
+        size = sum(os.path.getsize(os.path.join(self.directory, f)) for f in os.listdir(self.directory))
+        return {"articles": len(self), "shards": shards, "bytes": size}
+
+    def close(self):
+        for shard in self.shards.values():
+            shard.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive store utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help=f"Import {LEGACY_ARCHIVE} / {ARCHIVE_LOG} into the sharded store")
+    query = sub.add_parser("query", help="Print archived articles as JSON Lines")
+    query.add_argument("--from", dest="start")
+    query.add_argument("--to", dest="end")
+    query.add_argument("--field", choices=QUERY_FIELDS, default="date")
+    query.add_argument("--category", choices=CATEGORIES)
+    sub.add_parser("export", help=f"Rewrite {LEGACY_ARCHIVE} from the shards (archive order)")
+    sub.add_parser("stats", help="Articles per shard")
+    args = parser.parse_args()
+
+    store = ArchiveStore()
+    if args.command == "migrate":
+        added = store.migrate_from_json(ARCHIVE_LOG) or store.migrate_from_json(LEGACY_ARCHIVE)
+        print(f"✅ {added} purane articles store me migrate hue. Total: {len(store)}")
+    elif args.command == "export":
+        # Shard order (mahine, phir append order) me; date order ke liye query() nahi
+        records = (shard.read(offset, length) for shard in store.shards.values()
+                   for _, offset, length, _, _, _ in shard.entries())
+        count = write_records(LEGACY_ARCHIVE, records, array=True)
+        print(f"✅ {count} articles '{LEGACY_ARCHIVE}' me likhe gaye.")
+    elif args.command == "stats":
+        stats = store.stats()
+        print(f"📚 {stats['articles']} articles, {len(stats['shards'])} shards, {stats['bytes'] / 1e6:.1f} MB")
+        for name, count in stats["shards"].items():
+            print(f"   {name}: {count}")
+    else:
+        for record in store.query(args.start, args.end, args.field, args.category):
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,650 @@
+"""
+Offline benchmarks for the pipeline hot paths.
+
+Do tarah ke benchmarks hain:
+  * micro (keywords, cleaner, history, scheduler): naya vs purana implementation
+  * stage (relevance, extract, clean, summarize, store, quiz): recorded fixtures
+    (`bench_fixtures/`: RSS XML, article HTML, canned model JSON) par aaj ke data ka
+    10x / 100x, throughput + peak memory. Network ya Gemini key ki zaroorat nahi,
+    model `fake_genai` serve karta hai.
+
+Stage results `benchmark_results.jsonl` me append hote hain (date, commit) aur har
+run pichle run se compare hota hai.
+
+Usage:
+    python benchmark.py                          # saare benchmarks
+    python benchmark.py keywords                 # sirf ek
+    python benchmark.py clean quiz --scales 10   # sirf 10x
+    python benchmark.py --no-save                # results file me mat likho
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from cut import KILL_PHRASES, smart_clean_text
+from keywords import EXAM_KEYWORDS, MATCHER
+import fake_genai
+from rate_limiter import RATE_LIMITED, TRANSIENT, Scheduler
+from records import read_records, write_records
+from url_history import FingerprintHistory, JsonHistory
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+def best_of(func, repeat=3):
+    """Function ko kuch baar chala kar sabse fast wall time (seconds) deta hai."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# --- KEYWORD MATCHER ---
+
+def legacy_is_exam_relevant(title):
+    """Purana implementation: har keyword ke liye alag re.search."""
+    for keyword in EXAM_KEYWORDS:
+        pattern = r'\b' + re.escape(keyword) + r'\b'
+        if re.search(pattern, title, re.IGNORECASE):
+            return True
+    return False
+
+FILLER_WORDS = (
+    "government india state minister new plan city record talks market police "
+    "court river farmers project power villages district festival weather train "
+    "famous ranking reporter funding hosted signsboard exercise global cricket"
+).split()
+
+def synthetic_titles(count, seed=42):
+    """Real headlines jaise random titles; ~30% me koi exam keyword hota hai."""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        words = rng.choices(FILLER_WORDS, k=rng.randint(6, 14))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(EXAM_KEYWORDS))
+        titles.append(" ".join(words).capitalize())
+    return titles
+
+@benchmark("keywords")
+def bench_keywords(count=20000):
+    titles = synthetic_titles(count)
+
+    mismatches = [t for t in titles if legacy_is_exam_relevant(t) != MATCHER.is_relevant(t)]
+    if mismatches:
+        print(f"❌ Matcher disagrees with legacy on {len(mismatches)} titles, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+
+    legacy = best_of(lambda: [legacy_is_exam_relevant(t) for t in titles])
+    matcher = best_of(lambda: [MATCHER.is_relevant(t) for t in titles])
+    categories = best_of(lambda: [MATCHER.categories(t) for t in titles])
+
+    print(f"🔑 is_exam_relevant on {count} titles")
+    print(f"   legacy (per-keyword re.search): {legacy:.3f}s  ({count / legacy:,.0f} titles/s)")
+    print(f"   KeywordMatcher.is_relevant:     {matcher:.3f}s  ({count / matcher:,.0f} titles/s)  x{legacy / matcher:.1f}")
+    print(f"   KeywordMatcher.categories:      {categories:.3f}s  ({count / categories:,.0f} titles/s)")
+
+# --- LINE CLEANER (cut.py) ---
+
+def legacy_smart_clean_text(text):
+    """Purana cut.smart_clean_text: har line par kill-phrase loop + alag re calls."""
+    if not text: return ""
+    cleaned_lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line: continue
+        line_lower = line.lower()
+        if any(phrase.lower() in line_lower for phrase in KILL_PHRASES): continue
+        if re.match(r'^(published|updated|by|source|image)\s*[:\-]?\s*[a-z]+', line_lower): continue
+        line = re.sub(r'^([A-Z][a-zA-Z\s]+(:\s*|—\s*|-\s*))', '', line)
+        if len(line.split()) <= 4 and not line.endswith('.'): continue
+        if "@" in line and ("gmail" in line_lower or "yahoo" in line_lower or "contact" in line_lower): continue
+        if re.search(r'(twitter|facebook|instagram|telegram)\.com', line_lower): continue
+        cleaned_lines.append(line)
+    final_text = "\n".join(cleaned_lines)
+    final_text = re.sub(r'\n{2,}', '\n\n', final_text)
+    return final_text.strip()
+
+@benchmark("cleaner")
+def bench_cleaner(scale=20):
+    contents = [item.get("content", "") for item in fixture_articles()]
+
+    for text in contents:
+        if smart_clean_text(text) != legacy_smart_clean_text(text):
+            print("❌ smart_clean_text output differs from legacy on fixture articles")
+            sys.exit(1)
+
+    corpus = contents * scale
+    megabytes = sum(len(t.encode("utf-8")) for t in corpus) / 1e6
+
+    legacy = best_of(lambda: [legacy_smart_clean_text(t) for t in corpus])
+    engine = best_of(lambda: [smart_clean_text(t) for t in corpus])
+
+    print(f"🧹 smart_clean_text on {len(corpus)} articles ({megabytes:.1f} MB, output identical to legacy)")
+    print(f"   legacy (per-phrase loop): {legacy:.3f}s  ({megabytes / legacy:.1f} MB/s)")
+    print(f"   LineFilter engine:        {engine:.3f}s  ({megabytes / engine:.1f} MB/s)  x{legacy / engine:.1f}")
+
+# --- URL HISTORY BACKENDS ---
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+@benchmark("history")
+def bench_history(sizes=(10_000, 100_000, 1_000_000), lookups=10_000):
+    print("🗂️  URL history: load / membership / save")
+    for size in sizes:
+        urls = [f"https://www.example.com/news/article-{i}.html" for i in range(size)]
+        probes = urls[::max(1, size // (lookups // 2))][:lookups // 2]
+        probes += [url + "?miss" for url in probes]
+        fresh = [f"https://www.example.com/new/{i}" for i in range(100)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, make in (
+                ("json", lambda: JsonHistory(os.path.join(tmp, "h.json"))),
+                ("fingerprint", lambda: FingerprintHistory(os.path.join(tmp, "h.bin"), legacy_path=None)),
+            ):
+                seed = make()
+                for url in urls:
+                    seed.add(url)
+                if isinstance(seed, FingerprintHistory):
+                    seed.compact()
+                else:
+                    seed.save()
+
+                load_s, history = timed(make)
+                member_s, _ = timed(lambda: [url in history for url in probes])
+                for url in fresh:
+                    history.add(url)
+                save_s, _ = timed(history.save)
+
+                disk = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)
+                           if f.startswith("h." + ("json" if name == "json" else "bin")))
+                print(f"   {size:>9,} {name:<12} load {load_s * 1000:8.1f} ms | "
+                      f"{len(probes)} lookups {member_s * 1000:7.1f} ms | "
+                      f"save +100 {save_s * 1000:8.1f} ms | disk {disk / 1e6:6.2f} MB")
+
+# --- RATE LIMITER / SCHEDULER (fake quota model) ---
+
+@benchmark("scheduler")
+def bench_scheduler(jobs=60, quota_per_s=20, concurrency=4):
+    """Fake model 1s window me sirf `quota_per_s` requests leta hai; scheduler zyada RPM se shuru hota hai."""
+    backend = fake_genai.install(rpm=quota_per_s, window_s=1.0, latency_s=0.01)
+    scheduler = Scheduler(rpm=quota_per_s * 60 * 2, concurrency=concurrency, max_retries=8, name="fake",
+                          backoff={RATE_LIMITED: (0.2, 2.0), TRANSIENT: (0.05, 0.5)})
+    model = fake_genai.GenerativeModel("models/gemini-1.5-flash")
+
+    def job(i):
+        return scheduler.call(model.generate_content, f"Output strictly 'bullets' for item {i}", tokens=10).text
+
+    start = time.perf_counter()
+    results = list(scheduler.map(job, range(jobs)))
+    elapsed = time.perf_counter() - start
+
+    # map() exception par raise karta hai, isliye count nahi: content aur retry hisaab check
+    expected = fake_genai.default_responder("Output strictly 'bullets' for item 0")
+    if any(text != expected for text in results) or scheduler.stats[RATE_LIMITED] != backend.quota.rejected:
+        print(f"❌ scheduler: galat results ya {scheduler.stats[RATE_LIMITED]} quota retries "
+              f"!= {backend.quota.rejected} rejected")
+        sys.exit(1)
+    print(f"⏱️  Scheduler vs fake quota ({quota_per_s} req/s): {jobs} jobs in {elapsed:.2f}s "
+          f"({jobs / elapsed:.1f} req/s), {backend.quota.rejected} rejected by quota")
+    print(f"   {scheduler.summary()}")
+
+# --- STAGE BENCHMARKS (recorded fixtures, 10x / 100x) ---
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "bench_fixtures")
+RESULTS_FILE = os.path.join(BENCH_DIR, "benchmark_results.jsonl")
+SCALES = (10, 100)
+RESULTS = {}  # benchmark -> {"10x": {...}, "100x": {...}}, is run ke stage results
+
+def fixture_path(name):
+    return os.path.join(FIXTURES_DIR, name)
+
+def fixture_articles():
+    """Ek din ke recorded scraped articles (scraper ka 1.jsonl output)."""
+    return list(read_records(fixture_path("articles.jsonl")))
+
+def fixture_titles():
+    """Recorded RSS feed ke saare headlines."""
+    root = ET.parse(fixture_path("feed.xml")).getroot()
+    return [item.findtext("title", "") for item in root.iter("item")]
+
+def replicate(articles, scale):
+    """Data ko `scale` guna karta hai; har copy ka link unique taaki dedup/archive skip na kare."""
+    out = []
+    for i in range(scale):
+        for item in articles:
+            copy = dict(item)
+            copy["link"] = f"{item['link']}?copy={i}"
+            out.append(copy)
+    return out
+
+def canned_responder():
+    """Recorded model responses se valid JSON (summaries / batch / quiz prompts ke hisaab se)."""
+    with open(fixture_path("model_responses.json"), "r", encoding="utf-8") as f:
+        canned = json.load(f)
+    summaries, questions = canned["summaries"], canned["questions"]
+    counter = itertools.count()
+
+    def respond(prompt):
+        n = next(counter)
+        ids = re.findall(r"\[id: ([^\]]+)\]", prompt)
+        if ids:
+            return json.dumps({i: summaries[(n + k) % len(summaries)] for k, i in enumerate(ids)})
+        if "'bullets'" in prompt:
+            return json.dumps({"bullets": summaries[n % len(summaries)]})
+        limit = re.search(r"up to (\d+)", prompt)
+        limit = int(limit.group(1)) if limit else 15
+        start = (n * limit) % len(questions)
+        return json.dumps((questions[start:] + questions[:start])[:limit], ensure_ascii=False)
+
+    return respond
+
+def use_fake_model():
+    """ai_magic / gen_pro_quiz import hone se pehle: fake genai, bina quota, bina cache."""
+    os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+    os.environ["GEMINI_RPM"] = "1000000"
+    os.environ["GEMINI_TPM"] = "1000000000"
+    os.environ["LLM_CACHE_DISABLED"] = "1"
+    os.environ["MODEL_CACHE_TTL_H"] = "0"
+    fake_genai.install(canned_responder())
+
+def measure(func):
+    """Ek baar bina tracing (time) aur ek baar tracemalloc ke saath (peak memory). Stdout chup."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return seconds, peak / (1024 * 1024)
+
+def run_scaled(name, unit, make_work, scales):
+    """`make_work(scale)` -> (items, func). Har scale ka result print + RESULTS me."""
+    for scale in scales:
+        items, func = make_work(scale)
+        seconds, peak_mb = measure(func)
+        result = {
+            "items": items,
+            "seconds": round(seconds, 4),
+            "per_s": round(items / seconds, 1) if seconds else None,
+            "peak_mb": round(peak_mb, 2),
+        }
+        RESULTS.setdefault(name, {})[f"{scale}x"] = result
+        print(f"   {scale:>4}x  {items:>7,} {unit:<9} {seconds:8.3f}s  "
+              f"({result['per_s']:,.0f} {unit}/s)  peak {peak_mb:7.2f} MB")
+
+@benchmark("relevance")
+def bench_relevance(scales=SCALES):
+    titles = fixture_titles()
+    print(f"🔑 is_exam_relevant on feed.xml headlines ({len(titles)} per day)")
+
+    def work(scale):
+        batch = titles * scale
+        return len(batch), lambda: [MATCHER.is_relevant(t) for t in batch]
+    run_scaled("relevance", "titles", work, scales)
+
+@benchmark("extract")
+def bench_extract(scales=SCALES):
+    try:
+        import scraper
+    except ImportError as e:
+        print(f"⚠️ extract: {e}, benchmark skip.")
+        return
+
+    with open(fixture_path("article.html"), "r", encoding="utf-8") as f:
+        page = f.read()
+    articles = fixture_articles()
+    print(f"📰 fetch_clean_articles on article.html ({len(page) / 1000:.0f} KB, download replaced by fixture, "
+          f"{scraper.EXTRACT_PROCESSES} extract processes)")
+
+    # Network hata ke sirf extraction measure karo (fixture bytes jaise HTTP se aate)
+    page_bytes = page.encode("utf-8")
+    scraper.download_article = lambda url: page_bytes
+
+    def work(scale):
+        urls = [item["link"] for item in replicate(articles, scale)]
+        def run():
+            with scraper.ThreadPoolExecutor(max_workers=scraper.MAX_WORKERS) as pool:
+                list(scraper.fetch_clean_articles(urls, pool))
+        return len(urls), run
+    run_scaled("extract", "pages", work, scales)
+
+@benchmark("clean")
+def bench_clean(scales=SCALES):
+    contents = [item.get("content", "") for item in fixture_articles()]
+    megabytes = sum(len(t.encode("utf-8")) for t in contents) / 1e6
+    print(f"🧹 smart_clean_text on articles.jsonl ({len(contents)} articles, {megabytes:.2f} MB per day)")
+
+    def work(scale):
+        batch = contents * scale
+        return len(batch), lambda: [smart_clean_text(t) for t in batch]
+    run_scaled("clean", "articles", work, scales)
+
+@benchmark("summarize")
+def bench_summarize(scales=SCALES):
+    use_fake_model()
+    import ai_magic
+
+    articles = fixture_articles()
+    model = ai_magic.get_best_model()
+    print(f"🤖 summarize_with_ai / summarize_batches vs fake model ({len(articles)} articles per day)")
+
+    def single(scale):
+        batch = replicate(articles, scale)
+        return len(batch), lambda: [ai_magic.summarize_with_ai(model, a["title"], a["content"]) for a in batch]
+
+    def batched(scale):
+        batch = replicate(articles, scale)
+        return len(batch), lambda: list(ai_magic.summarize_batches((dict(a) for a in batch), model))
+
+    print("   per-article (summarize_with_ai):")
+    run_scaled("summarize", "articles", single, scales)
+    print("   batch mode (summarize_batches):")
+    run_scaled("summarize_batches", "articles", batched, scales)
+
+@benchmark("store")
+def bench_store(scales=SCALES):
+    import cut3
+
+    articles = fixture_articles()
+    print(f"🗄️  clean_and_store: 4.jsonl -> 3.json + archive store ({len(articles)} articles per day)")
+
+    def work(scale):
+        batch = replicate(articles, scale)
+        def run():
+            # Har run khali directory me: archive me sab naye articles (worst case append)
+            with tempfile.TemporaryDirectory() as tmp:
+                cwd = os.getcwd()
+                os.chdir(tmp)
+                try:
+                    write_records("4.jsonl", batch)
+                    cut3.clean_and_store("4.jsonl", "3.json")
+                finally:
+                    os.chdir(cwd)
+        return len(batch), run
+    run_scaled("store", "articles", work, scales)
+
+@benchmark("quiz")
+def bench_quiz(scales=SCALES):
+    use_fake_model()
+    try:
+        import gen_pro_quiz
+    except ImportError as e:
+        print(f"⚠️ quiz: {e}, benchmark skip.")
+        return
+
+    contents = [item.get("content", "") for item in fixture_articles()]
+    model = gen_pro_quiz.get_available_model()
+    mode = "generate_questions_chunked" if gen_pro_quiz.CHUNKED_MODE else "generate_questions"
+    print(f"❓ {mode} vs fake model ({len(contents)} articles per day)")
+
+    def work(scale):
+        batch = contents * scale
+        if gen_pro_quiz.CHUNKED_MODE:
+            return len(batch), lambda: gen_pro_quiz.generate_questions_chunked(batch, model)
+        news_text = gen_pro_quiz.format_news(gen_pro_quiz.within_budget(batch, gen_pro_quiz.SINGLE_SHOT_TOKEN_BUDGET))
+        return len(batch), lambda: gen_pro_quiz.generate_questions(news_text, model)
+    run_scaled("quiz", "articles", work, scales)
+
+# --- SHARDED ARCHIVE (archive_store.py) ---
+
+def synthetic_archive(count, seed=7):
+    """`count` archive records, ~2 saal ke dates par phaile hue (real archive jaise)."""
+    rng = random.Random(seed)
+    titles = synthetic_titles(count, seed)
+    first_day = datetime.date(2025, 1, 1).toordinal()
+    body = " ".join(FILLER_WORDS) * 4
+    for i, title in enumerate(titles):
+        day = datetime.date.fromordinal(first_day + rng.randrange(730)).isoformat()
+        yield {
+            "title": title,
+            "content": f"• {body[:rng.randint(300, 900)]}",
+            "link": f"https://www.example.com/news/{day}/article-{i}.html",
+            "date": day,
+            "archived_on": f"{day} 07:30:00",
+        }
+
+def record_result(name, size, items, seconds, peak_mb=0.0):
+    RESULTS.setdefault(name, {})[str(size)] = {
+        "items": items,
+        "seconds": round(seconds, 4),
+        "per_s": round(items / seconds, 1) if seconds else None,
+        "peak_mb": round(peak_mb, 2),
+    }
+
+@benchmark("archive")
+def bench_archive(sizes=(100_000, 300_000)):
+    from archive_store import ArchiveStore
+
+    print("📚 Sharded archive: append / open / queries (vs parsing one big JSON file)")
+    for size in sizes:
+        records = list(synthetic_archive(size))
+        probes = [r["link"] for r in random.Random(1).sample(records, 1000)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = os.path.join(tmp, "archive")
+            store = ArchiveStore(directory)
+            append_s, _ = timed(lambda: store.append(iter(records)))
+            store.close()
+
+            open_s, store = timed(lambda: ArchiveStore(directory))
+            links_s, _ = timed(lambda: len(store))  # link map (pehla lookup) yahin banta hai
+            day_s, day_hits = timed(lambda: list(store.query("2026-03-15", "2026-03-15")))
+            month_s, month_hits = timed(lambda: list(store.query("2026-03-01", "2026-03-31",
+                                                                 category="Banking & Economy")))
+            get_s, found = timed(lambda: [store.get(link) for link in probes])
+            disk = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+            store.close()
+
+            # Purana tareeka: poora archive_news.json parse karke filter
+            legacy_path = os.path.join(tmp, "archive_news.json")
+            with open(legacy_path, "w", encoding="utf-8") as f:
+                json.dump(records, f, indent=4, ensure_ascii=False)
+            def legacy_day():
+                with open(legacy_path, "r", encoding="utf-8") as f:
+                    return [r for r in json.load(f) if r["date"] == "2026-03-15"]
+            legacy_s, legacy_hits = timed(legacy_day)
+
+        if len(day_hits) != len(legacy_hits) or not all(found):
+            print(f"❌ archive: query results differ from full scan ({len(day_hits)} vs {len(legacy_hits)})")
+            sys.exit(1)
+
+        print(f"   {size:>9,} articles | append {append_s:6.2f}s | open {open_s * 1000:6.1f} ms "
+              f"+ link map {links_s * 1000:6.1f} ms | disk {disk / 1e6:6.1f} MB")
+        print(f"   {'':>9}          | 1 day ({len(day_hits)}) {day_s * 1000:6.1f} ms vs full JSON parse "
+              f"{legacy_s * 1000:7.1f} ms (x{legacy_s / day_s:,.0f})")
+        print(f"   {'':>9}          | 1 month + category ({len(month_hits)}) {month_s * 1000:6.1f} ms | "
+              f"1000 get(link) {get_s * 1000:6.1f} ms")
+
+        record_result("archive_append", size, size, append_s)
+        record_result("archive_open", size, size, open_s + links_s)
+        record_result("archive_query_day", size, len(day_hits), day_s)
+        record_result("archive_query_month_category", size, len(month_hits), month_s)
+        record_result("archive_get", size, len(probes), get_s)
+
+# --- SEARCH INDEX (search_index.py) ---
+
+SEARCH_QUERIES = ["RBI repo rate", "India defence deal", "GST registration", "North Korea drone unit",
+                  "Supreme Court judge", "forex reserves billion", "trade deal tariff", "scheme launched"]
+
+def synthetic_documents(count, seed=11):
+    """Fixture articles ke real sentences mila kar `count` archive records (asli vocabulary)."""
+    rng = random.Random(seed)
+    sentences = [line.strip() for item in fixture_articles() for line in item["content"].split(".")
+                 if len(line.split()) > 4]
+    for record in synthetic_archive(count, seed):
+        record["content"] = ". ".join(rng.sample(sentences, 6))
+        yield record
+
+@benchmark("search")
+def bench_search(sizes=(100_000,), batch=2000, repeat=20):
+    from search_index import SearchIndex
+
+    print("🔎 Search index: incremental build / open / BM25 query latency")
+    for size in sizes:
+        records = list(synthetic_documents(size))
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = os.path.join(tmp, "search_index")
+            index = SearchIndex(directory)
+            # Roz ke runs jaise chhote batches (har batch ek segment, MAX_SEGMENTS par merge)
+            build_s, _ = timed(lambda: [index.add_news(records[i:i + batch]) for i in range(0, size, batch)])
+            index.close()
+
+            open_s, index = timed(lambda: SearchIndex(directory))
+            latencies = []
+            for query in SEARCH_QUERIES:
+                for _ in range(repeat):
+                    seconds, hits = timed(lambda: index.search(query, since="2026-01-01"))
+                    latencies.append(seconds)
+            stats = index.stats()
+            index.close()
+
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000
+        print(f"   {size:>9,} docs | build {build_s:6.1f}s ({size // batch} batches) | open {open_s * 1000:6.1f} ms "
+              f"| {stats['terms']:,} terms, {stats['bytes'] / 1e6:.1f} MB")
+        print(f"   {'':>9}      | query p50 {p50:5.2f} ms, p95 {p95:5.2f} ms ({len(SEARCH_QUERIES)} queries x {repeat})")
+
+        record_result("search_build", size, size, build_s)
+        record_result("search_open", size, size, open_s)
+        record_result("search_query_p95", size, 1, p95 / 1000)
+
+# --- QUIZ BUNDLES (quiz_publish.py) ---
+
+@benchmark("bundles")
+def bench_bundles(days=30, path="quiz.json"):
+    import gzip
+    import quiz_publish
+
+    if not os.path.exists(path):
+        print(f"⚠️ bundles: '{path}' nahi mila, benchmark skip.")
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    rng = random.Random(5)
+    start_day = datetime.date(2026, 1, 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        seconds = 0.0
+        for n in range(days):
+            day = (start_day + datetime.timedelta(days=n)).isoformat()
+            batch = rng.sample(questions, len(questions))
+            elapsed, manifest = timed(lambda: quiz_publish.publish(batch, day, tmp))
+            seconds += elapsed
+        manifest_bytes = os.path.getsize(os.path.join(tmp, quiz_publish.MANIFEST_FILE))
+
+    with open(path, "rb") as f:
+        pretty = f.read()
+    latest = manifest["days"][manifest["latest"]]
+    best = "br" if "br" in latest else "gz"
+    biggest = max(manifest["categories"].values(), key=lambda e: e["bytes"])
+
+    print(f"📦 quiz_publish.publish: {days} days x {len(questions)} questions, {seconds / days * 1000:.1f} ms per run")
+    print(f"   quiz.json (indent=4):   {len(pretty) / 1024:7.1f} KB  (gz {len(gzip.compress(pretty)) / 1024:.1f} KB)")
+    print(f"   latest day shard:       {latest['bytes'] / 1024:7.1f} KB  ({best} {latest[best] / 1024:.1f} KB) + manifest {manifest_bytes / 1024:.1f} KB")
+    print(f"   largest category shard: {biggest['bytes'] / 1024:7.1f} KB  ({biggest['count']} questions, {days} days)")
+    record_result("bundles_publish", days, days * len(questions), seconds)
+
+# --- RESULT HISTORY ---
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def previous_results(path=RESULTS_FILE):
+    """Har benchmark/scale ka sabse latest stored result (saath me date/commit), comparison ke liye."""
+    latest = {}
+    if not os.path.exists(path):
+        return latest
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            for name, scaled in entry.get("results", {}).items():
+                for scale, result in scaled.items():
+                    latest[(name, scale)] = dict(result, date=entry.get("date"), commit=entry.get("commit"))
+    return latest
+
+def compare(previous, results):
+    """Same benchmark/scale ke pichle result se time aur memory ka % change."""
+    rows = [(name, scale, now, previous[(name, scale)])
+            for name, scaled in results.items() for scale, now in scaled.items() if (name, scale) in previous]
+    if not rows:
+        return
+    print("\n📊 Compared with previous runs:")
+    for name, scale, now, before in rows:
+        time_change = (now["seconds"] / before["seconds"] - 1) * 100 if before["seconds"] else 0
+        mem_change = (now["peak_mb"] / before["peak_mb"] - 1) * 100 if before["peak_mb"] else 0
+        flag = "⚠️" if time_change > 10 or mem_change > 10 else "  "
+        print(f"   {flag} {name:<18} {scale:>5}  time {time_change:+6.1f}%  memory {mem_change:+6.1f}%  "
+              f"(vs {before['date']}, {before['commit'] or 'unknown commit'})")
+
+def save_results(results, path=RESULTS_FILE):
+    entry = {
+        "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmarks")
+    parser.add_argument("names", nargs="*", help=f"Benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--scales", default=",".join(map(str, SCALES)), help="Stage benchmarks ke scales, e.g. 10,100")
+    parser.add_argument("--no-save", action="store_true", help="Results benchmark_results.jsonl me append mat karo")
+    args = parser.parse_args()
+
+    selected = args.names or list(BENCHMARKS)
+    scales = tuple(int(s) for s in args.scales.split(",") if s.strip())
+    for name in selected:
+        if name not in BENCHMARKS:
+            print(f"❌ Unknown benchmark: {name}. Available: {', '.join(BENCHMARKS)}")
+            sys.exit(1)
+
+    for name in selected:
+        func = BENCHMARKS[name]
+        if "scales" in func.__code__.co_varnames[:func.__code__.co_argcount]:
+            func(scales=scales)
+        else:
+            func()
+
+    if RESULTS:
+        compare(previous_results(), RESULTS)
+        if not args.no_save:
+            save_results(RESULTS)
+            print(f"\n💾 Results appended to '{os.path.basename(RESULTS_FILE)}'")
@@ -0,0 +1,92 @@
+"""
+Per-record stage checkpoints (pipeline.py ke liye).
+
+Har stage ka ek journal (`.pipeline/<stage>.jsonl`) hota hai jisme har complete
+hua record (key = link) aur uska output turant append hota hai. Agar stage beech
+me mar jaaye (e.g. ai_magic article 7 par), rerun sirf bache hue records process
+karta hai; complete records ka output journal se aata hai. Failed records journal
+me nahi jaate, isliye rerun par unhe dobara try kiya jaata hai. Jaan-boojh kar drop hue
+records (e.g. bahut chhota article) bina output ke journal hote hain: wo bhi finished
+hain, pipeline unhe carry forward nahi karti.
+"""
+import json
+import os
+
+CHECKPOINT_DIR = ".pipeline"
+
+def record_key(record):
+    return record.get("link") or record.get("title", "")
+
+class StageCheckpoint:
+    def __init__(self, stage, directory=CHECKPOINT_DIR):
+        self.stage = stage
+        self.path = os.path.join(directory, f"{stage}.jsonl")
+        self.resumed = 0
+        self.processed = 0
+        self._done = {}
+        os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Crash ke waqt adhuri likhi last line
+                    self._done[entry["key"]] = entry["output"]
+
+    def __contains__(self, key):
+        return key in self._done
+
+    def record(self, key, output):
+        """Ek record complete: turant disk par (flush), taaki crash me bhi bacha rahe."""
+        self._done[key] = output
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "output": output}, ensure_ascii=False) + "\n")
+            f.flush()
+
+    def drop(self, record, key=record_key):
+        """Stage ne record drop kiya (retry se kuch nahi badlega): finished, output None."""
+        self.record(key(record), None)
+
+    def prune(self, keys):
+        """Journal me sirf current input ke records rakho (purane din ke entries hatao)."""
+        keys = set(keys)
+        self._done = {k: v for k, v in self._done.items() if k in keys}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, output in self._done.items():
+                f.write(json.dumps({"key": key, "output": output}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def wrap(self, records, transform, key=record_key):
+        """
+        `transform(records)` (generator jo sirf successful outputs yield kare, aur drop kiye
+        records `drop()` kare) ko sirf un records par chalata hai jo journal me nahi hain, aur
+        phir input order me saare outputs (naye + journal wale) yield karta hai.
+        """
+        order = []
+
+        def pending():
+            for record in records:
+                k = key(record)
+                order.append(k)
+                if k in self._done:
+                    self.resumed += 1
+                    continue
+                yield record
+
+        for output in transform(pending()):
+            self.processed += 1
+            self.record(key(output), output)
+
+        for k in order:
+            output = self._done.get(k)
+            if output is not None:
+                yield output
+        self.prune(order)
+
+    def clear(self):
+        self._done = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,37 +1,38 @@
-import json
-import os
 import datetime
 import re
 
-def clean_and_store():
-    print("🧹 Step 4: Running Smart AI-Output Cleaner...")
-
-    # --- 1. Load Data from 3.json ---
-    if not os.path.exists("3.json"):
-        print("❌ Error: '3.json' nahi mila.")
-        return
-
-    with open("3.json", "r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            print("❌ Error: '3.json' corrupted hai.")
-            return
-
-    cleaned_data = []
-    removed_count = 0
-
-    # Exact API Errors ki list (No generic words)
-    API_ERRORS = [
-        "api error", "quota exceeded", "429", "too many requests", 
-        "invalid api key", "internal server error", "overloaded"
-    ]
-
-    # --- 2. Remove Bad Entries & Clean Content ---
-    for item in data:
+from archive_store import ARCHIVE_DIR, ARCHIVE_LOG, LEGACY_ARCHIVE, ArchiveStore
+from metrics import METRICS
+from records import append_json_array, read_records, resolve_input, write_records
+from search_index import SearchIndex
+
+AI_OUTPUT_FILE = "4.jsonl"         # ai_magic.py ka output (is stage ka input)
+TODAY_FILE = "3.json"              # PWA frontend isi array file ko padhta hai
+FRONTEND_ARCHIVE = LEGACY_ARCHIVE   # PWA ka poora archive (JSON array), har run sirf append
+LEGACY_ARCHIVE_FILES = [ARCHIVE_LOG, FRONTEND_ARCHIVE]  # Store khaali ho to inse migrate
+
+# Exact API Errors ki list (No generic words)
+API_ERRORS = [
+    "api error", "quota exceeded", "429", "too many requests", 
+    "invalid api key", "internal server error", "overloaded"
+]
+
+def clean_records(records, stats, on_drop=None):
+    """
+    Generator: failed/rejected items hata ke (`on_drop(item)` ke saath) baaki ka AI chatter
+    saaf karta hai.
+    """
+    for item in records:
         content = item.get('content', '').strip()
         title = item.get('title', 'No Title')
 
+        # ai_magic ab generation ke waqt hi bullets validate karta hai (model_json.clean_bullets):
+        # uske "• ..." summaries me chatter/error nahi hota, regex scan sirf purane format ke liye
+        if content.startswith("• "):
+            item['content'] = content
+            yield item
+            continue
+
         # Check 1: Smart API Errors Check
         is_corrupted = False
         content_lower = content.lower()
@@ -43,7 +44,10 @@ def clean_and_store():
         
         if is_corrupted or content == "REJECT": # Agar humne AI ko REJECT bolne sikhaya tha
             print(f"⚠️ Removing API Error/Rejected: {title[:40]}...")
-            removed_count += 1
+            stats["removed"] += 1
+            METRICS.incr("store.removed_failed")
+            if on_drop:
+                on_drop(item)
             continue 
 
         # Check 2: Smart AI Chatter Remover (Regex)
@@ -55,43 +59,78 @@ def clean_and_store():
 
         # Updated content wapas item me save karein (extra spaces trim karke)
         item['content'] = content.strip()
-        cleaned_data.append(item)
+        yield item
 
-    # --- 3. Save Back to 3.json (For Today's PWA Frontend) ---
-    with open("3.json", "w", encoding="utf-8") as f:
-        json.dump(cleaned_data, f, indent=4, ensure_ascii=False)
-
-    print(f"✅ '3.json' Cleaned! Removed {removed_count} failed items.")
-
-    # --- 4. Smart Backup (Using JSON instead of TXT) ---
-    # Hum ek 'archive.json' banayenge. Isse tumhara backend kabhi bhi old data fetch kar sakta hai.
-    archive_file = "archive_news.json"
-    archive_data = []
-
-    if os.path.exists(archive_file):
-        with open(archive_file, "r", encoding="utf-8") as f:
-            try:
-                archive_data = json.load(f)
-            except json.JSONDecodeError:
-                archive_data = []
+def clean_and_store(input_file=AI_OUTPUT_FILE, output_file=TODAY_FILE, checkpoint=None):
+    """Return: `output_file` me bache articles ka count (error par None)."""
+    print("🧹 Step 4: Running Smart AI-Output Cleaner...")
 
-    # Duplicates se bachne ke liye existing links extract karo
-    existing_links = {item['link'] for item in archive_data}
+    # --- 1. Load AI Output (4.jsonl) ---
+    source = resolve_input(input_file)
+    if not source:
+        print(f"❌ Error: '{input_file}' nahi mila. Pehle ai_magic.py run karo.")
+        return None
 
-    new_additions = 0
-    for item in cleaned_data:
-        if item['link'] not in existing_links:
-            # Add timestamp for the archive
-            item['archived_on'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            archive_data.append(item)
-            new_additions += 1
+    # --- 2. Remove Bad Entries & Clean Content ---
+    # --- 3. Save to 3.json (For Today's PWA Frontend) ---
+    # Records stream hote hain; temp file me likh kar atomically replace hota hai
+    stats = {"removed": 0}
+    records = read_records(source)
+    if checkpoint:
+        cleaned = checkpoint.wrap(records, lambda rest: clean_records(rest, stats, checkpoint.drop))
+    else:
+        cleaned = clean_records(records, stats)
+    try:
+        count = write_records(output_file, cleaned, array=True)
+    except ValueError:
+        print(f"❌ Error: '{source}' corrupted hai.")
+        return None
+
+    print(f"✅ '{output_file}' Cleaned! Removed {stats['removed']} failed items.")
+
+    # --- 4. Smart Backup (Sharded Archive Store) ---
+    # Articles 'archive/<YYYY-MM>.jsonl' shards me append hote hain, har shard ka mmap index saath me.
+    # Isse tumhara backend kabhi bhi old data fetch kar sakta hai (dekho archive_store.query).
+    store = ArchiveStore()
+    for legacy in LEGACY_ARCHIVE_FILES:
+        migrated = store.migrate_from_json(legacy)
+        if migrated:
+            print(f"📦 {migrated} purane articles '{legacy}' se archive store me migrate hue.")
+
+    def stamped(records):
+        archived_on = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for item in records:
+            # Add timestamp for the archive (duplicates store khud skip karta hai)
+            item['archived_on'] = archived_on
+            yield item
+
+    added = []
+    with METRICS.timer("archive.append_s"):
+        new_additions = store.append(stamped(read_records(output_file)), added)
+        # PWA ka archive_news.json bhi poora rahe: sirf naye records closing ']' se pehle jodte hain
+        try:
+            append_json_array(FRONTEND_ARCHIVE, added)
+        except ValueError as e:
+            print(f"⚠️ {e}. 'python archive_store.py export' se dobara banao.")
+    METRICS.incr("archive.added", new_additions)
+
+    # --- 5. Search Index (BM25 topic search, dekho search_index.py) ---
+    # Index me news na ho (pehli baar / cache miss) to poora archive, warna sirf aaj ke articles
+    # (duplicates skip). Index git me nahi, Actions cache me rehta hai.
+    index = SearchIndex()
+    with METRICS.timer("search_index.add_s"):
+        indexed = index.add_news(store.query() if not index.count("news") else read_records(output_file))
+    index.close()
+    store.close()
+    if indexed:
+        print(f"🔎 {indexed} articles search index me add hue.")
 
     if new_additions > 0:
-        with open(archive_file, "w", encoding="utf-8") as f:
-            json.dump(archive_data, f, indent=4, ensure_ascii=False)
-        print(f"✅ {new_additions} fresh articles securely backed up in 'archive_news.json'.")
+        print(f"✅ {new_additions} fresh articles securely backed up in '{ARCHIVE_DIR}/'.")
     else:
         print("ℹ️ No new articles to backup today.")
 
+    return count
+
 if __name__ == "__main__":
-    clean_and_store()
\ No newline at end of file
+    clean_and_store()
@@ -0,0 +1,149 @@
+"""
+Step 2b: Near-duplicate story detection (cut.py aur ai_magic.py ke beech).
+
+Same khabar livemint, Business Standard, ET, The Hindu sab se alag URLs par aati
+hai, aur URL-dedup unhe nahi pakadta. Ye stage har article ke `content` ke
+word-shingles ka MinHash signature banata hai, LSH banding se sirf milte-julte
+articles ko compare karta hai (roughly linear time), aur har cluster me sabse
+"rich" (sabse lamba content) article rakhta hai. Baaki articles ke links
+`alt_links` me record ho jaate hain, taaki AI quota ek hi story par dobara na jale.
+"""
+import random
+import re
+import zlib
+
+from metrics import METRICS
+from records import read_records, resolve_input, write_records
+
+INPUT_FILE = "2.jsonl"
+OUTPUT_FILE = "2.jsonl"   # In-place (atomic replace)
+
+SHINGLE_SIZE = 3          # Words per shingle
+NUM_BANDS = 20
+ROWS_PER_BAND = 3
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+SIMILARITY_THRESHOLD = 0.5  # Estimated Jaccard isse upar = near-duplicate
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20260322)  # Fixed seed: har run me same signatures
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERM)]
+_WORD = re.compile(r"[a-z0-9]+")
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Lowercase word n-grams ke 32-bit hashes."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+def minhash(hashes):
+    """NUM_PERM hash functions ke minimum values ka signature."""
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+def similarity(sig_a, sig_b):
+    """Signature agreement = Jaccard similarity ka estimate."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+def find_clusters(signatures, threshold=SIMILARITY_THRESHOLD):
+    """
+    LSH banding: jin articles ka koi ek band poora match kare wahi candidates hain;
+    candidates ko signature similarity se verify karke union karta hai.
+    Return: har article index ka cluster root.
+    """
+    uf = _UnionFind(len(signatures))
+    buckets = {}
+    for i, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(NUM_BANDS):
+            key = (band, sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+            buckets.setdefault(key, []).append(i)
+
+    checked = set()
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                if similarity(signatures[i], signatures[j]) >= threshold:
+                    uf.union(i, j)
+    return [uf.find(i) for i in range(len(signatures))]
+
+def dedup_records(path, threshold=SIMILARITY_THRESHOLD, stats=None):
+    """
+    Do pass: pehle sirf signatures + lengths (memory me content nahi rehta), phir
+    file dobara stream karke har cluster ka richest article `alt_links` ke saath yield.
+    """
+    signatures, lengths, links = [], [], []
+    for item in read_records(path):
+        content = item.get('content', '')
+        signatures.append(minhash(shingles(content)))
+        lengths.append(len(content))
+        links.append(item.get('link', ''))
+
+    roots = find_clusters(signatures, threshold)
+    clusters = {}
+    for i, root in enumerate(roots):
+        clusters.setdefault(root, []).append(i)
+
+    keep = {}
+    for members in clusters.values():
+        # Richest = sabse lamba content; tie par pehla wala
+        best = max(members, key=lambda i: (lengths[i], -i))
+        keep[best] = [links[i] for i in members if i != best and links[i]]
+
+    if stats is not None:
+        stats["input"] = len(signatures)
+        stats["clusters"] = sum(1 for members in clusters.values() if len(members) > 1)
+        stats["removed"] = len(signatures) - len(keep)
+
+    for i, item in enumerate(read_records(path)):
+        if i not in keep:
+            continue
+        if keep[i]:
+            item['alt_links'] = keep[i]
+        yield item
+
+def run_dedup(input_file=INPUT_FILE, output_file=OUTPUT_FILE):
+    """Return: unique stories ka count (error par None)."""
+    print("🧬 Step 2b: Near-Duplicate Story Detection...\n")
+
+    source = resolve_input(input_file)
+    if not source:
+        print(f"❌ Error: '{input_file}' nahi mila. Pehle cleaner run karo.")
+        return None
+
+    stats = {}
+    try:
+        count = write_records(output_file, dedup_records(source, stats=stats))
+    except ValueError:
+        print(f"❌ Error: '{source}' khali ya corrupted hai.")
+        return None
+
+    METRICS.incr("dedup.clusters", stats["clusters"])
+    METRICS.incr("dedup.removed", stats["removed"])
+    print(f"✅ {stats['input']} articles -> {count} unique stories "
+          f"({stats['clusters']} duplicate clusters, {stats['removed']} duplicates merged into alt_links).")
+    return count
+
+if __name__ == "__main__":
+    run_dedup()
@@ -0,0 +1,110 @@
+"""
+Local stand-in for `google.generativeai` (offline benchmarks / quota simulation).
+
+Sirf wahi API subset hai jo pipeline use karti hai: configure, list_models,
+GenerationConfig, GenerativeModel(...).generate_content(...). Quota ek sliding
+window par simulate hota hai: limit paar hote hi 429 ResourceExhausted error.
+
+    import fake_genai
+    fake_genai.install(rpm=5, window_s=1.0)   # 'import google.generativeai' ab fake dega
+"""
+import json
+import re
+import sys
+import threading
+import time
+import types
+from collections import deque
+
+MODEL_NAMES = ["models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro"]
+
+class ResourceExhausted(Exception):
+    """google.api_core.exceptions.ResourceExhausted jaisa error."""
+
+class FakeQuota:
+    """Sliding window quota: `window_s` me max `rpm` requests aur `tpm` tokens."""
+
+    def __init__(self, rpm=None, tpm=None, window_s=60.0, clock=time.monotonic):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window_s = window_s
+        self.clock = clock
+        self._events = deque()  # (time, tokens)
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def check(self, tokens):
+        with self._lock:
+            now = self.clock()
+            while self._events and self._events[0][0] <= now - self.window_s:
+                self._events.popleft()
+            used_tokens = sum(t for _, t in self._events)
+            if (self.rpm is not None and len(self._events) >= self.rpm) or \
+               (self.tpm is not None and used_tokens + tokens > self.tpm):
+                self.rejected += 1
+                raise ResourceExhausted("429 Resource has been exhausted (e.g. check quota).")
+            self._events.append((now, tokens))
+
+def default_responder(prompt):
+    """Prompt ki shape dekh kar valid canned JSON banata hai."""
+    ids = re.findall(r"\[id: ([^\]]+)\]", prompt)
+    if ids:
+        return json.dumps({i: [f"Fact {n} for article {i}." for n in (1, 2, 3)] for i in ids})
+    if "'bullets'" in prompt:
+        return json.dumps({"bullets": ["Fact 1.", "Fact 2.", "Fact 3."]})
+    facts = [line[2:] for line in prompt.splitlines() if line.strip().startswith("- ")][:40]
+    return json.dumps([
+        {"q": f"Which fact is reported: {fact[:60]}?", "a": "Option A",
+         "options": ["Option A", "Option B", "Option C", "Option D", "Option E"], "cat": "Amount"}
+        for fact in facts
+    ])
+
+class FakeBackend:
+    def __init__(self, responder=default_responder, quota=None, latency_s=0.0):
+        self.responder = responder
+        self.quota = quota
+        self.latency_s = latency_s
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt):
+        if self.quota:
+            self.quota.check(len(prompt) // 4)
+        with self._lock:
+            self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return types.SimpleNamespace(text=self.responder(prompt))
+
+BACKEND = FakeBackend()
+
+class GenerationConfig:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+class GenerativeModel:
+    def __init__(self, model_name, **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        return BACKEND.generate(prompt)
+
+def configure(**kwargs):
+    pass
+
+def list_models():
+    return [types.SimpleNamespace(name=name, supported_generation_methods=["generateContent"])
+            for name in MODEL_NAMES]
+
+def install(responder=default_responder, rpm=None, tpm=None, window_s=60.0, latency_s=0.0):
+    """Is module ko `google.generativeai` ki jagah register karta hai aur backend reset karta hai."""
+    global BACKEND
+    quota = FakeQuota(rpm, tpm, window_s) if (rpm or tpm) else None
+    BACKEND = FakeBackend(responder, quota, latency_s)
+
+    this = sys.modules[__name__]
+    google = sys.modules.get("google") or types.ModuleType("google")
+    google.generativeai = this
+    sys.modules["google"] = google
+    sys.modules["google.generativeai"] = this
+    return BACKEND
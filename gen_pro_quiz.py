@@ -1,81 +1,92 @@
 import os
+import datetime
 import json
-import requests
-import google.generativeai as genai
 import sys
+from itertools import zip_longest
+
+from llm_cache import cache_from_env
+from metrics import METRICS
+from model_json import check_question, salvage_array, validate
+from model_resolver import genai, resolve_model
+from rate_limiter import scheduler_from_env
+from quiz_bank import QuizBank, normalize as question_key, public_question
+from quiz_publish import publish, summary as bundle_summary
+from quiz_sources import load_articles, source_names
+from search_index import SearchIndex
 
 # --- CONFIGURATION ---
 API_KEY = os.environ.get("GEMINI_API_KEY")
-NEWS_SOURCE = "[https://raw.githubusercontent.com/GOLutheGhosT-4444/Today-Current-Affairs/refs/heads/main/2.json](https://raw.githubusercontent.com/GOLutheGhosT-4444/Today-Current-Affairs/refs/heads/main/2.json)"
 OUTPUT_FILE = "quiz.json"
+QUIZ_METRICS_FILE = "quiz_metrics.json"  # Per-run timings/latency (dekho metrics.py)
+SCHEDULER = scheduler_from_env("gemini-quiz")  # RPM/TPM limit + retry with backoff
+QUIZ_TEMPLATE_VERSION = "quiz-v2"  # Prompt badle to version badlo (cache invalidate)
+
+# --- CHUNKED MODE ---
+# Poori news ek prompt me 28000 chars pe cut hoti thi; ab token-budget wale chunks banenge.
+CHUNKED_MODE = True
+CHUNK_TOKEN_BUDGET = 6000    # Har chunk ke news text ka andaazan token budget
+QUESTIONS_PER_CHUNK = 15     # Chhota response = truncation ka kam risk
+MAX_QUESTIONS = 60           # Final quiz cap
+CHARS_PER_TOKEN = 4
+SINGLE_SHOT_TOKEN_BUDGET = 7000  # Single-shot mode ka poora news budget (~28000 chars)
+CACHE = cache_from_env()
 
 # --- 1. AUTO-DETECT BEST MODEL ---
 def get_available_model():
+    """Quiz ke liye model (GEMINI_MODEL pin ya cached listing, dekho model_resolver.py)."""
     if not API_KEY:
         print("❌ CRITICAL ERROR: GEMINI_API_KEY not found in Secrets!")
         sys.exit(1)
 
-    genai.configure(api_key=API_KEY)
-    print("🔍 Scanning available AI models for your API Key...")
     try:
-        available_models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
-        
-        preferred_order = [
-            "models/gemini-1.5-pro",
-            "models/gemini-1.5-flash", 
-            "models/gemini-pro"
-        ]
-
-        for model in preferred_order:
-            if model in available_models:
-                print(f"✅ SELECTED BEST MODEL: {model}")
-                return model
-
-        if available_models:
-            print(f"⚠️ Preferred models not found. Using fallback: {available_models[0]}")
-            return available_models[0]
+        model = resolve_model("quiz")
+    except Exception as e:
+        print(f"❌ Error listing models: {e}")
+        sys.exit(1)
 
+    if not model:
         print("❌ No text-generation models found for this API Key.")
         sys.exit(1)
+    print(f"✅ SELECTED BEST MODEL: {model}")
+    return model
 
-    except Exception as e:
-        print(f"❌ Error listing models: {e}")
-        sys.exit(1)
+def format_news(articles):
+    """Articles ko prompt ke '- content' bullet format me ek hi join se jodta hai."""
+    return "".join(f"- {content}\n" for content in articles)
+
+def within_budget(articles, budget_tokens):
+    """Shuru ke utne poore articles jo `budget_tokens` me aa jaayein (pehla bada ho to truncate)."""
+    budget_chars = budget_tokens * CHARS_PER_TOKEN
+    picked, used = [], 0
+    for content in articles:
+        size = len(content) + 3  # "- " + newline
+        if used + size > budget_chars:
+            if not picked:
+                picked.append(content[:budget_chars - 3])
+            break
+        picked.append(content)
+        used += size
+    return picked
 
 # --- 2. FETCH NEWS ---
 def fetch_news():
-    print(f"📥 Fetching News from: {NEWS_SOURCE}")
-    try:
-        response = requests.get(NEWS_SOURCE)
-        response.raise_for_status()
-        
-        data = response.json()
-        text_data = ""
-        for item in data:
-            content = item.get('content', '') or item.get('summary', '')
-            if len(content) > 50:
-                text_data += f"- {content}\n"
-
-        if len(text_data) < 100:
-            print("❌ News data is too short or empty.")
-            sys.exit(1)
-
-        print(f"✅ News Loaded. Length: {len(text_data)} chars")
-        return text_data
-
-    except Exception as e:
-        print(f"❌ Network/JSON Error: {e}")
+    """Aaj ke article contents: local pipeline output / archive / URL (dekho quiz_sources.py)."""
+    print(f"📥 Loading News (sources: {', '.join(source_names())})")
+    articles, source = load_articles()
+    if not articles:
+        print("❌ News data is too short or empty (kisi source se news nahi mili).")
         sys.exit(1)
 
-# --- 3. GENERATE QUIZ ---
-def generate_questions(news_text, model_name):
-    model = genai.GenerativeModel(model_name)
-    print("🧠 Starting Generation with strict JSON Mode...")
+    total_chars = sum(len(content) for content in articles)
+    print(f"✅ News Loaded from '{source}'. {len(articles)} articles, {total_chars} chars")
+    return articles
 
+# --- 3. GENERATE QUIZ ---
+def build_prompt(news_data, max_questions=40):
     # Naya Prompt: Exact 60 ki jagah "Maximize" bolna better hai taaki fake news na banaye.
     prompt = f"""
     You are a Ruthless Banking Exam Setter (IBPS/SBI PO Level).
-    Extract as many One-Liner MCQs as possible (up to 40) STRICTLY based on the exact facts in the news text below. 
+    Extract as many One-Liner MCQs as possible (up to {max_questions}) STRICTLY based on the exact facts in the news text below. 
     DO NOT invent any facts or numbers. If the text does not contain enough data, generate fewer questions.
 
     ### STRICT QUESTION CRITERIA (The 5 Pillars):
@@ -96,40 +107,149 @@ def generate_questions(news_text, model_name):
     - Structure: [{{"q": "Question text", "a": "Correct Option text", "options": ["A", "B", "C", "D", "E"], "cat": "Category"}}]
 
     ### NEWS DATA:
-    {news_text[:28000]}
+    {news_data}
     """
+    return prompt
 
-    try:
-        # 🌟 GAME CHANGER: response_mime_type forces exact JSON output
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.GenerationConfig(
-                response_mime_type="application/json",
-            )
-        )
+def quiz_cache_content(news_data, max_questions):
+    return f"{max_questions}\n{news_data}"
 
-        # Ab markdown replace karne ki zaroorat nahi
-        quiz_data = json.loads(response.text)
+def request_quiz_json(news_data, model_name, max_questions=40):
+    """
+    Ek prompt ka raw JSON text (cache ya model se). Rate limit / retry SCHEDULER karta hai.
+    Response parse karna caller ka kaam hai; valid hone par hi cache me daalo.
+    """
+    cached = CACHE.get(model_name, QUIZ_TEMPLATE_VERSION, quiz_cache_content(news_data, max_questions))
+    if cached:
+        return cached, True
 
-        count = len(quiz_data)
-        print(f"⚡ AI Generated {count} Questions.")
+    sdk = genai()
+    model = sdk.GenerativeModel(model_name)
+    prompt = build_prompt(news_data, max_questions)
+    # 🌟 GAME CHANGER: response_mime_type forces exact JSON output
+    response = SCHEDULER.call(
+        model.generate_content,
+        prompt,
+        generation_config=sdk.GenerationConfig(
+            response_mime_type="application/json",
+        ),
+        tokens=len(prompt) // 4,
+    )
+    return response.text, False
 
-        if count < 3:
-            print("❌ Error: AI generated too few questions. Maybe news lacks facts.")
-            sys.exit(1)
+def generate_questions(news_text, model_name):
+    """Single-shot mode: poori news ek prompt me (format_news ka token budget caller lagata hai)."""
+    print("🧠 Starting Generation with strict JSON Mode...")
+    news_data = news_text
+
+    try:
+        # Same news pe pichla quiz cache me ho to model call skip
+        response_text, from_cache = request_quiz_json(news_data, model_name)
+        if from_cache:
+            print("🗃️ Same news ka quiz cache me mila, AI call skip.")
+    except Exception as e:
+        print(f"❌ AI Critical Error: {e}")
+        sys.exit(1)
 
-        return quiz_data
+    # Kata hua (truncated) response bhi: jitne complete questions hain wo bachte hain
+    items, truncated = salvage_array(response_text)
+    quiz_data, report = validate(items, check_question, "quiz", truncated)
+    print(f"⚡ AI Generated {len(quiz_data)} Questions.")
+    if report.summary():
+        print(f"   ⚠️ {report.summary()}")
 
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON Parsing Error (AI Output Truncated): {e}")
-        print("Raw AI Output:", response.text[:500]) # Debugging ke liye
+    if len(quiz_data) < 3:
+        print("❌ Error: AI generated too few questions. Maybe news lacks facts.")
+        print("Raw AI Output:", response_text[:500]) # Debugging ke liye
         sys.exit(1)
+
+    CACHE.put(model_name, QUIZ_TEMPLATE_VERSION, quiz_cache_content(news_data, 40), response_text)
+    return quiz_data
+
+# --- 3b. CHUNKED (MAP-REDUCE) QUIZ ---
+def group_articles(articles, budget_tokens=CHUNK_TOKEN_BUDGET):
+    """
+    Articles ko token budget wale groups me baantta hai (ek article kabhi do groups me nahi
+    toot-ta; budget se bada article truncate hota hai). Koi news silently drop nahi hoti.
+    """
+    budget_chars = budget_tokens * CHARS_PER_TOKEN
+    groups, current, used = [], [], 0
+    for content in articles:
+        content = content[:budget_chars]
+        if current and used + len(content) > budget_chars:
+            groups.append(current)
+            current, used = [], 0
+        current.append(content)
+        used += len(content)
+    if current:
+        groups.append(current)
+    return groups
+
+def generate_chunk_questions(chunk_no, chunk, model_name):
+    """Ek chunk ke valid MCQs (kata hua response bhi salvage). Fail hone par [] (poora quiz abort nahi hota)."""
+    try:
+        response_text, from_cache = request_quiz_json(chunk, model_name, QUESTIONS_PER_CHUNK)
     except Exception as e:
-        print(f"❌ AI Critical Error: {e}")
+        print(f"   ⚠️ Chunk {chunk_no}: AI Error: {str(e)[:80]}. Skipping chunk.")
+        return []
+
+    items, truncated = salvage_array(response_text)
+    valid, report = validate(items, check_question, "quiz", truncated)
+    if valid and not from_cache:
+        CACHE.put(model_name, QUIZ_TEMPLATE_VERSION, quiz_cache_content(chunk, QUESTIONS_PER_CHUNK), response_text)
+    note = f" ({report.summary()})" if report.summary() else ""
+    print(f"   {'✅' if valid else '⚠️'} Chunk {chunk_no}: {len(valid)} questions{' (cache)' if from_cache else ''}{note}")
+    return valid
+
+def merge_questions(per_chunk, limit=MAX_QUESTIONS):
+    """
+    Chunks ke questions ko round-robin merge karta hai (taaki cap lagne par bhi har chunk
+    ki news represent ho), duplicate questions hata ke `limit` tak rakhta hai.
+    """
+    merged, seen = [], set()
+    for round_items in zip_longest(*per_chunk):
+        for item in round_items:
+            if item is None:
+                continue
+            key = question_key(item["q"])
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(item)
+            if len(merged) >= limit:
+                return merged
+    return merged
+
+def generate_questions_chunked(articles, model_name, bank=None):
+    """
+    Map: har chunk ke MCQs parallel (rate limit ke andar). Reduce: merge + dedup + cap.
+    `bank` (QuizBank) diya ho to har chunk ke questions uske articles ke saath bank me jaate hain.
+    """
+    groups = group_articles(articles)
+    chunks = [format_news(group) for group in groups]
+    print(f"🧠 Chunked Generation: {len(articles)} articles -> {len(chunks)} chunks (strict JSON Mode)...")
+
+    per_chunk = list(SCHEDULER.map(
+        lambda job: generate_chunk_questions(job[0], job[1], model_name),
+        enumerate(chunks, start=1),
+    ))
+    failed = sum(1 for questions in per_chunk if not questions)
+    quiz_data = merge_questions(per_chunk)
+    if bank is not None:
+        # Fail/empty chunk ke articles bank me mark nahi hote, agle run me dobara try honge
+        for group, questions in zip(groups, per_chunk):
+            if questions:
+                bank.add(group, questions)
+
+    print(f"⚡ AI Generated {len(quiz_data)} Questions ({failed}/{len(chunks)} chunks failed or empty).")
+    # Bank ke saath kam naye questions bhi chalenge (aaj ka quiz bank se banta hai)
+    if bank is None and len(quiz_data) < 3:
+        print("❌ Error: AI generated too few questions. Maybe news lacks facts.")
         sys.exit(1)
+    return quiz_data
 
 # --- 4. SAVE FILE ---
-def save_quiz(data):
+def save_quiz(data, bank=None):
     try:
         with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=4, ensure_ascii=False) # Hindi/Special chars safe
@@ -138,9 +258,52 @@ def save_quiz(data):
         print(f"❌ File Save Error: {e}")
         sys.exit(1)
 
+    # Questions topic search me bhi aayein (dekho search_index.py); fail hone par quiz phir bhi save hai.
+    # Index Actions cache se aata hai; usme quiz docs na hon (cache miss) to poora bank pehle.
+    try:
+        index = SearchIndex()
+        added = index.add_quiz(bank.questions) if bank is not None and not index.count("quiz") else 0
+        added += index.add_quiz(data, date=datetime.date.today().isoformat())
+        index.close()
+        print(f"🔎 {added} naye questions search index me add hue.")
+    except Exception as e:
+        print(f"⚠️ Search index update failed: {e}")
+
+    # PWA ke liye minified day/category shards + manifest (dekho quiz_publish.py); quiz.json compatibility ke liye waisa hi
+    try:
+        today = datetime.date.today().isoformat()
+        print(bundle_summary(publish(data, today), today))
+    except Exception as e:
+        print(f"⚠️ Quiz bundle publish failed: {e}")
+
 # --- EXECUTION ---
 if __name__ == "__main__":
-    best_model = get_available_model()
-    news = fetch_news()
-    questions = generate_questions(news, best_model)
-    save_quiz(questions)
+    with METRICS.stage("fetch_news"):
+        articles = fetch_news()
+
+    # Sirf bank me na hone wali news ke liye AI call (dekho quiz_bank.py)
+    bank = QuizBank()
+    new_articles = bank.new_articles(articles)
+    print(f"🏦 {len(articles) - len(new_articles)} articles ke questions bank me pehle se, {len(new_articles)} naye.")
+    with METRICS.stage("generate") as info:
+        questions = []
+        if new_articles:
+            best_model = get_available_model()
+            if CHUNKED_MODE:
+                questions = generate_questions_chunked(new_articles, best_model, bank)
+            else:
+                # Budget se bahar ke articles bank me mark nahi hote, agle run me aayenge
+                batch = within_budget(new_articles, SINGLE_SHOT_TOKEN_BUDGET)
+                questions = generate_questions(format_news(batch), best_model)
+                bank.add(batch, questions)
+        info["count"] = len(questions)
+    print(bank.summary())
+
+    quiz = [public_question(item) for item in bank.questions_for(articles, MAX_QUESTIONS)]
+    if len(quiz) < 3:
+        print("❌ Error: Bank me aaj ki news ke 3 se kam questions. Maybe news lacks facts.")
+        sys.exit(1)
+    save_quiz(quiz, bank)
+    print(CACHE.summary())
+    CACHE.close()
+    METRICS.write(QUIZ_METRICS_FILE)
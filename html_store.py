@@ -0,0 +1,138 @@
+"""
+Raw HTML snapshot store: scraper ke downloaded pages gzip blobs me, URL hash se.
+
+Iska fayda: KILL_PHRASES ya trafilatura options badle to same articles par dobara
+test kar sakte ho (`python scraper.py --reextract`), bina network ke. Scrape karne
+tak article set badal chuka hota hai, isliye snapshot zaroori hai.
+
+Layout:
+    html_store/ab/abcdef....html.gz      # sha256(url), gzip compressed
+    html_store/runs/2026-08-22.json      # us din ke candidates (title, link) ka manifest
+
+Eviction: LRU (file mtime, har read par touch) jab total size `max_mb` se upar ho.
+
+Config (env vars): HTML_STORE=1 (enable), HTML_STORE_DIR, HTML_STORE_MAX_MB
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+HTML_STORE_DIR = "html_store"
+DEFAULT_MAX_MB = 200
+MAX_MANIFESTS = 30       # Itne din ke run manifests rakho
+COMPRESS_LEVEL = 6       # gzip level: 6 par HTML ~5-8x chhota, CPU sasta
+
+def url_hash(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+class HtmlStore:
+    def __init__(self, directory=HTML_STORE_DIR, max_mb=DEFAULT_MAX_MB):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.runs_dir = os.path.join(directory, "runs")
+        self.stats = {"stored": 0, "hits": 0, "misses": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        os.makedirs(self.runs_dir, exist_ok=True)
+
+    def _path(self, url):
+        digest = url_hash(url)
+        return os.path.join(self.directory, digest[:2], digest + ".html.gz")
+
+    def put(self, url, html):
+        """Raw bytes save (temp file + rename, taaki adhuri blob kabhi na dikhe)."""
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(gzip.compress(html, COMPRESS_LEVEL))
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.stats["stored"] += 1
+
+    def get(self, url):
+        """Stored raw bytes, ya None. Read par mtime touch hota hai (LRU)."""
+        path = self._path(url)
+        try:
+            with open(path, "rb") as f:
+                data = gzip.decompress(f.read())
+        except (OSError, EOFError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        os.utime(path)
+        with self._lock:
+            self.stats["hits"] += 1
+        return data
+
+    def __contains__(self, url):
+        return os.path.exists(self._path(url))
+
+    def _blobs(self):
+        for root, _, files in os.walk(self.directory):
+            if root == self.runs_dir:
+                continue
+            for name in files:
+                if name.endswith(".html.gz"):
+                    path = os.path.join(root, name)
+                    st = os.stat(path)
+                    yield st.st_mtime, st.st_size, path
+
+    def size(self):
+        return sum(size for _, size, _ in self._blobs())
+
+    def evict(self):
+        """Sabse purane (least recently used) blobs hatao jab tak size cap ke andar na aa jaye."""
+        blobs = sorted(self._blobs())
+        total = sum(size for _, size, _ in blobs)
+        removed = 0
+        for _, size, path in blobs:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+        self.stats["evicted"] += removed
+        return removed
+
+    def save_manifest(self, day, articles):
+        """
+        Us din ke candidates [{title, link, date}] manifest me add (same din ke dusre run
+        ke links merge hote hain). MAX_MANIFESTS se purane manifests hat jaate hain.
+        """
+        _, existing = self.load_manifest(day)
+        known = {item["link"] for item in existing}
+        merged = existing + [item for item in articles if item["link"] not in known]
+
+        path = os.path.join(self.runs_dir, f"{day}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(merged, f, ensure_ascii=False, indent=1)
+        os.replace(path + ".tmp", path)
+
+        for old in sorted(os.listdir(self.runs_dir))[:-MAX_MANIFESTS]:
+            os.remove(os.path.join(self.runs_dir, old))
+
+    def load_manifest(self, day=None):
+        """(day, articles) us din ka (default: latest run), ya (None, []) agar koi manifest nahi."""
+        days = sorted(name[:-5] for name in os.listdir(self.runs_dir) if name.endswith(".json"))
+        if day is None:
+            day = days[-1] if days else None
+        if day not in days:
+            return None, []
+        with open(os.path.join(self.runs_dir, f"{day}.json"), "r", encoding="utf-8") as f:
+            return day, json.load(f)
+
+    def summary(self):
+        s = self.stats
+        return (f"🗃️ HTML Store: {s['stored']} stored, {s['hits']} hits, {s['misses']} misses, "
+                f"{s['evicted']} evicted ({self.size() / (1024 * 1024):.1f} MB / {self.max_bytes // (1024 * 1024)} MB)")
+
+def store_from_env(force=False):
+    """HTML_STORE=1 ho (ya force) to HtmlStore, warna None (snapshotting off)."""
+    if not force and os.environ.get("HTML_STORE") != "1":
+        return None
+    return HtmlStore(
+        directory=os.environ.get("HTML_STORE_DIR", HTML_STORE_DIR),
+        max_mb=float(os.environ.get("HTML_STORE_MAX_MB", DEFAULT_MAX_MB)),
+    )
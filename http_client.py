@@ -0,0 +1,101 @@
+"""
+Shared HTTP layer: ek `requests.Session` jo feeds, articles aur quiz news sab use karte hain.
+
+- Per-host keep-alive connection pool (har request par naya TCP/TLS handshake nahi)
+- gzip/deflate (aur brotli, agar `brotli` package installed ho)
+- (connect, read) timeouts, taaki koi slow server poora run na latkaye
+- Retry policy: connection errors, 429 aur 5xx par exponential backoff (Retry-After
+  respect, par MAX_RETRY_AFTER tak: wait karta thread HostThrottle ka slot pakde rehta hai)
+
+    from http_client import get
+    response = get(url)            # requests.Response
+    response.content               # raw bytes -> feedparser / trafilatura.extract
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics import METRICS
+
+CONNECT_TIMEOUT = 5      # seconds
+READ_TIMEOUT = 20        # seconds
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5     # 0.5s, 1s, 2s ...
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRY_AFTER = 10     # seconds; server "Retry-After: 3600" bhi bheje to isse zyada nahi rukte
+POOL_HOSTS = 32          # Kitne alag hosts ke pools rakhe jaayein
+POOL_PER_HOST = 16       # Ek host ke max parallel keep-alive connections (scraper MAX_WORKERS)
+
+USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+try:
+    import brotli  # noqa: F401  (urllib3 'br' responses tabhi decode karta hai)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+class CappedRetry(Retry):
+    """Retry jo Retry-After header ko MAX_RETRY_AFTER par cap karta hai."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+            METRICS.incr("http.retry_after_capped")
+            return MAX_RETRY_AFTER
+        return retry_after
+
+def build_session(max_retries=MAX_RETRIES, pool_hosts=POOL_HOSTS, pool_per_host=POOL_PER_HOST):
+    retry = CappedRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Retries khatam: last response hi return, status caller dekhe
+    )
+    adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_per_host,
+                          max_retries=retry, pool_block=False)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    })
+    return session
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Process-wide shared session (pehli call par banta hai)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+def get(url, headers=None, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), **kwargs):
+    """Shared pooled session se GET. Network errors `requests.RequestException` raise karte hain."""
+    response = get_session().get(url, headers=headers, timeout=timeout, **kwargs)
+    METRICS.incr(f"http.status_{response.status_code}")
+    return response
+
+def close():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,99 @@
+import re
+
+# Category -> keywords. Scraper aur baaki stages isi list se relevance decide karte hain.
+EXAM_KEYWORD_CATEGORIES = {
+    # 🏦 Banking, Finance & Economy
+    "Banking & Economy": [
+        "Quarterly Result", "Fiscal Deficit", "Direct Tax", "GST", "Forex Reserves",
+        "World Bank", "IMF", "RBI", "SEBI", "Repo Rate", "Inflation", "UPI", "NPCI",
+        "Fund", "Allocated", "Budget", "Penalty", "Fined", "Acquires", "Merger",
+        "Stake", "Dividend", "Economy", "GDP Growth",
+    ],
+
+    # 🏅 Ranks, Reports & Indices
+    "Ranks & Reports": [
+        "Ranked", "Index", "Rank", "Report", "Position", "Topped",
+    ],
+
+    # 👔 Appointments, Resignations & Obituaries
+    "Appointments": [
+        "Appointed as", "Takes charge as", "Selected as", "Elected", "Takes over",
+        "Resigns", "Steps down", "Passes away",
+    ],
+
+    # 🤝 Agreements & Partnerships
+    "Agreements": [
+        "MoU", "Bilateral Agreement", "Signs", "Pact", "Agrees", "Partnered",
+        "Collaborates", "Deal",
+    ],
+
+    # 🚀 Defence, Space & Science
+    "Defence & Science": [
+        "DRDO", "ISRO", "Military Exercise", "Naval Exercise", "Air Force", "Missile",
+        "Spacecraft", "Satellite", "Defence Ministry", "Inducted", "Commissioned",
+    ],
+
+    # 🏛️ National, Schemes & Judiciary
+    "Schemes & Polity": [
+        "Yojana", "Scheme", "Cabinet Approval", "Supreme Court", "Election Commission",
+        "Launched", "Unveiled", "Inaugurated", "Approved", "Sanctioned", "Portal", "Initiative",
+    ],
+
+    # 🏆 Awards & Sports
+    "Awards & Sports": [
+        "Nobel Prize", "Sahitya Akademi", "Awarded", "Honoured", "Host", "Venue",
+        "Medal", "Tournament", "Championship", "Cup", "Trophy", "Grand Slam", "Olympics",
+    ],
+}
+
+# Purana flat list (backward compatibility ke liye)
+EXAM_KEYWORDS = [kw for words in EXAM_KEYWORD_CATEGORIES.values() for kw in words]
+
+
+class KeywordMatcher:
+    """
+    Saare keywords ko ek hi precompiled regex me jodta hai.
+    Pehle har title par ~90 alag re.search chalte the, ab sirf ek scan hota hai.
+
+    Pattern ek zero-width lookahead hai, isliye har position par match try hota hai
+    aur overlapping keywords (e.g. 'Rank' / 'Ranked') bhi miss nahi hote.
+    """
+
+    def __init__(self, categories):
+        self._category_of = {}
+        for category, words in categories.items():
+            for word in words:
+                self._category_of.setdefault(word.lower(), category)
+
+        # Lambe keywords pehle, taaki same position par sabse specific match mile
+        alternation = "|".join(
+            re.escape(word) for word in sorted(self._category_of, key=len, reverse=True)
+        )
+        self._any = re.compile(r"\b(?:" + alternation + r")\b", re.IGNORECASE)
+        self._all = re.compile(r"\b(?=(" + alternation + r")\b)", re.IGNORECASE)
+
+    def is_relevant(self, title):
+        """Koi bhi keyword exact word boundary ke saath mile to True."""
+        return self._any.search(title) is not None
+
+    def matches(self, title):
+        """Title me mile saare keywords (lowercase, first-seen order me)."""
+        found = []
+        for m in self._all.finditer(title):
+            word = m.group(1).lower()
+            if word not in found:
+                found.append(word)
+        return found
+
+    def categories(self, title):
+        """Title kin keyword categories me aata hai, e.g. ['Banking & Economy']."""
+        found = []
+        for word in self.matches(title):
+            category = self._category_of[word]
+            if category not in found:
+                found.append(category)
+        return found
+
+
+# Import par ek hi baar build hota hai
+MATCHER = KeywordMatcher(EXAM_KEYWORD_CATEGORIES)
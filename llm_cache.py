@@ -0,0 +1,147 @@
+"""
+Content-hash keyed cache for LLM responses.
+
+Key = sha256(model, prompt template version, normalized content). Agar same
+article/news dobara aata hai (workflow_dispatch rerun, partial failure ke baad
+retry) to model call hi nahi hota. Prompt badle to template version badlo,
+purane entries apne aap miss ho jaayenge.
+
+Storage: SQLite (`llm_cache.db`). Eviction: `max_age_days` se purane entries
+aur `max_mb` se upar ka sabse kam recently used data close() par hat jaata hai.
+File git me commit nahi hoti (.gitignore); dono workflows ise Actions cache me
+rakhte hain (key prefix `llm-cache-`), cache miss par bas model calls dobara hote hain.
+
+Config (env vars): LLM_CACHE_FILE, LLM_CACHE_MAX_AGE_DAYS, LLM_CACHE_MAX_MB,
+LLM_CACHE_DISABLED=1
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from metrics import METRICS
+
+CACHE_FILE = "llm_cache.db"
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_MAX_MB = 20
+CHARS_PER_TOKEN = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key        TEXT PRIMARY KEY,
+    value      TEXT NOT NULL,
+    tokens     INTEGER NOT NULL,
+    size       INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize(content):
+    """Whitespace differences se cache miss na ho."""
+    return _WHITESPACE.sub(" ", content).strip()
+
+def cache_key(model, template_version, content):
+    h = hashlib.sha256()
+    for part in (model, template_version, normalize(content)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def estimate_tokens(*texts):
+    return sum(len(t) for t in texts) // CHARS_PER_TOKEN
+
+class ResponseCache:
+    def __init__(self, path=CACHE_FILE, max_age_days=DEFAULT_MAX_AGE_DAYS, max_mb=DEFAULT_MAX_MB,
+                 enabled=True):
+        self.path = path
+        self.max_age_s = max_age_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.stats = {"hits": 0, "misses": 0, "tokens_saved": 0}
+        self._lock = threading.Lock()
+        self.db = None
+        if enabled:
+            # Scheduler ke worker threads se bhi use hota hai
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.executescript(SCHEMA)
+
+    def get(self, model, template_version, content):
+        """Cached response text, ya None (miss)."""
+        if not self.enabled:
+            return None
+        key = cache_key(model, template_version, content)
+        with self._lock:
+            row = self.db.execute("SELECT value, tokens FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                METRICS.incr("llm_cache.misses")
+                return None
+            with self.db:
+                self.db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.stats["hits"] += 1
+            METRICS.incr("llm_cache.hits")
+            self.stats["tokens_saved"] += row[1]
+            return row[0]
+
+    def put(self, model, template_version, content, value, tokens=None):
+        """Sirf successful responses save karo; failures cache nahi hote."""
+        if not self.enabled:
+            return
+        key = cache_key(model, template_version, content)
+        tokens = estimate_tokens(content, value) if tokens is None else tokens
+        now = time.time()
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, tokens, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, tokens, len(value.encode("utf-8")), now, now),
+            )
+
+    def evict(self):
+        """Purane (age) aur extra (size) entries hatata hai. Return: kitne hate."""
+        if not self.enabled:
+            return 0
+        with self._lock, self.db:
+            removed = self.db.execute(
+                "DELETE FROM responses WHERE last_used < ?", (time.time() - self.max_age_s,)
+            ).rowcount
+
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                # Least recently used pehle
+                for key, size in self.db.execute(
+                        "SELECT key, size FROM responses ORDER BY last_used").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    removed += 1
+        if removed:
+            self.db.execute("VACUUM")
+        return removed
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        ratio = self.stats["hits"] / lookups if lookups else 0.0
+        return (f"🗃️ LLM cache: {self.stats['hits']}/{lookups} hits ({ratio:.0%}), "
+                f"~{self.stats['tokens_saved']:,} tokens saved")
+
+    def close(self):
+        if self.db is not None:
+            self.evict()
+            self.db.close()
+            self.db = None
+
+def cache_from_env():
+    return ResponseCache(
+        path=os.environ.get("LLM_CACHE_FILE", CACHE_FILE),
+        max_age_days=float(os.environ.get("LLM_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)),
+        max_mb=float(os.environ.get("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB)),
+        enabled=os.environ.get("LLM_CACHE_DISABLED") != "1",
+    )
@@ -0,0 +1,170 @@
+"""
+Lightweight instrumentation: timers, counters aur histograms, sab scripts ke liye shared.
+
+    from metrics import METRICS
+
+    METRICS.incr("feed.not_modified")
+    with METRICS.timer("article.extract_s", label=url):
+        ...
+    METRICS.observe("gemini.latency_s", 1.8, label="gemini-summaries")
+
+Run ke end me `METRICS.write()` ek machine-readable `metrics.json` likhta hai
+(counters + histogram summary: count/sum/min/p50/p95/max). Ye file commit hoti hai,
+isliye git history me regressions dikh jaate hain.
+
+Optional profiling (env vars), `METRICS.stage(name)` ke andar:
+    METRICS_PROFILE=1      -> cProfile; top functions metrics.json me, full stats `.pipeline/profile_<stage>.pstats`
+    METRICS_TRACEMALLOC=1  -> stage ka peak Python memory (MB)
+"""
+import cProfile
+import datetime
+import io
+import json
+import os
+import platform
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+METRICS_FILE = "metrics.json"
+PROFILE_DIR = ".pipeline"
+PROFILE_TOP = 15
+MAX_LABELS = 200  # Per-histogram label entries ki limit (metrics.json chhota rahe)
+
+def percentile(values, q):
+    """Sorted list ka nearest-rank percentile."""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(q / 100.0 * len(values) + 0.5)) - 1))
+    return values[index]
+
+def summarize(values):
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "sum": round(sum(ordered), 4),
+        "min": round(ordered[0], 4),
+        "p50": round(percentile(ordered, 50), 4),
+        "p95": round(percentile(ordered, 95), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+class Metrics:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._start = self.clock()
+            self.counters = {}
+            self.histograms = {}
+            self.labels = {}
+            self.stages = {}
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value, label=None):
+        """Histogram me ek value; `label` (e.g. feed URL) ke saath last value alag bhi rakhi jaati hai."""
+        with self._lock:
+            self.histograms.setdefault(name, []).append(value)
+            if label is not None:
+                by_label = self.labels.setdefault(name, {})
+                if label in by_label or len(by_label) < MAX_LABELS:
+                    by_label[label] = round(value, 4)
+
+    @contextmanager
+    def timer(self, name, label=None):
+        """Block ka wall time (seconds) `name` histogram me."""
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.observe(name, self.clock() - started, label)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Poore stage ka timer, plus optional cProfile / tracemalloc (env vars se on).
+        Result `stages[name]` me jaata hai.
+        """
+        profile = os.environ.get("METRICS_PROFILE") == "1"
+        trace = os.environ.get("METRICS_TRACEMALLOC") == "1"
+        info = {}
+
+        profiler = cProfile.Profile() if profile else None
+        started_trace = trace and not tracemalloc.is_tracing()
+        if started_trace:
+            tracemalloc.start()
+        elif trace:
+            tracemalloc.reset_peak()
+        started = self.clock()
+        if profiler:
+            profiler.enable()
+        try:
+            yield info
+        finally:
+            if profiler:
+                profiler.disable()
+            info["seconds"] = round(self.clock() - started, 4)
+            if trace:
+                info["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+                if started_trace:
+                    tracemalloc.stop()
+            if profiler:
+                info["profile"] = self._profile_top(profiler, name)
+            with self._lock:
+                self.stages[name] = info
+
+    def _profile_top(self, profiler, name):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(os.path.join(PROFILE_DIR, f"profile_{name}.pstats"))
+
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        top = []
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            top.append({
+                "function": f"{os.path.basename(filename)}:{line}({func})",
+                "calls": calls,
+                "tottime": round(tottime, 4),
+                "cumtime": round(cumtime, 4),
+            })
+        top.sort(key=lambda row: row["tottime"], reverse=True)
+        return top[:PROFILE_TOP]
+
+    def snapshot(self):
+        with self._lock:
+            histograms = {}
+            for name, values in sorted(self.histograms.items()):
+                histograms[name] = summarize(values)
+                if name in self.labels:
+                    histograms[name]["by_label"] = dict(sorted(self.labels[name].items()))
+            return {
+                "started_at": self.started_at,
+                "duration_s": round(self.clock() - self._start, 4),
+                "python": platform.python_version(),
+                "stages": dict(self.stages),
+                "counters": dict(sorted(self.counters.items())),
+                "histograms": histograms,
+            }
+
+    def write(self, path=None, extra=None):
+        """metrics.json likhta hai (atomically). `extra` dict top-level me merge hota hai."""
+        path = path or os.environ.get("METRICS_FILE", METRICS_FILE)
+        data = self.snapshot()
+        if extra:
+            data.update(extra)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+# Process-wide shared instance
+METRICS = Metrics()
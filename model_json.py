@@ -0,0 +1,211 @@
+"""
+Model JSON responses ka tolerant parser + record validation.
+
+JSON mode ke baad bhi response kabhi kabhi max tokens par kat jaata hai
+(`[{...}, {...}, {"q": "Wh`). Pehle `json.loads` poora response fail kar deta tha
+aur quiz process exit ho jaata tha. Yahan:
+
+  * `salvage_array(text)` / `salvage_object(text)`: value by value incremental decode,
+    jitne complete elements / key-value pairs mile wo sab, plus truncation reason
+  * `check_question(item)` / `clean_bullets(bullets)`: har record generation ke waqt hi
+    validate, reject ho to reason ke saath (cut3 ko baad me regex scan na karna pade)
+  * `Report`: per-record reasons ka hisaab (print + METRICS counters)
+
+    items, truncated = salvage_array(response.text)
+    valid, report = validate(items, check_question, "quiz")
+"""
+import json
+import re
+from collections import Counter
+
+from metrics import METRICS
+
+MIN_BULLETS = 2          # Isse kam usable facts = summary reject (3 maange jaate hain)
+MAX_BULLETS = 3
+MIN_BULLET_CHARS = 15
+
+# Model ke error/refusal strings jo kabhi summary me store nahi hone chahiye (pehle cut3 me the)
+# ("429" / "overloaded" akele nahi: asli news me bhi aate hain, e.g. "Rs 429 crore")
+ERROR_PHRASES = [
+    "api error", "quota exceeded", "too many requests", "resource has been exhausted",
+    "invalid api key", "internal server error", "model is overloaded",
+]
+CHATTER_RE = re.compile(r"^(Here|Sure|Okay|Summary|Below)\b.*:\s*$", re.IGNORECASE)
+BULLET_PREFIX_RE = re.compile(r"^\s*(?:[•*\-]|\d+[.)])\s*")
+FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+_decoder = json.JSONDecoder()
+
+def strip_fences(text):
+    """```json ... ``` markdown wrapper hatao (JSON mode ke bina kuch models dete hain)."""
+    return FENCE_RE.sub("", text or "")
+
+def _skip(text, pos):
+    while pos < len(text) and text[pos] in " \t\r\n,":
+        pos += 1
+    return pos
+
+def _cut_at_end(text, end):
+    """
+    Value bracket/quote par khatam nahi hui (number, true/false/null) aur uske baad `,` `]`
+    ya `}` nahi aaya: adhuri ho sakti hai (`12.` / `12e` bhi 12 decode hote hain, asal me
+    `12.5` tha), bharosa nahi (records._iter_json_array jaisa).
+    """
+    if text[end - 1] in '}]"':
+        return False
+    while end < len(text) and text[end] in " \t\r\n":
+        end += 1
+    return end >= len(text) or text[end] not in ",]}"
+
+def salvage_array(text):
+    """
+    JSON array ke saare complete elements. Return: (items, truncated) jahan truncated None
+    (poora valid) ya reason string. Array ke bajaye {"questions": [...]} jaisa wrapper ho
+    to pehla array padha jaata hai.
+    """
+    text = strip_fences(text)
+    pos = text.find("[")
+    if pos < 0:
+        return [], "no JSON array in response"
+
+    items, pos = [], pos + 1
+    while True:
+        pos = _skip(text, pos)
+        if pos >= len(text):
+            return items, f"truncated after {len(items)} items"
+        if text[pos] == "]":
+            return items, None
+        try:
+            value, end = _decoder.raw_decode(text, pos)
+        except json.JSONDecodeError as e:
+            return items, f"{e.msg} (char {e.pos}, after {len(items)} items)"
+        if _cut_at_end(text, end):
+            return items, f"truncated after {len(items)} items"
+        items.append(value)
+        pos = end
+
+def salvage_object(text):
+    """JSON object ke saare complete key-value pairs. Return: (dict, truncated reason ya None)."""
+    text = strip_fences(text)
+    pos = text.find("{")
+    if pos < 0:
+        return {}, "no JSON object in response"
+
+    result, pos = {}, pos + 1
+    while True:
+        pos = _skip(text, pos)
+        if pos >= len(text):
+            return result, f"truncated after {len(result)} keys"
+        if text[pos] == "}":
+            return result, None
+        try:
+            key, pos = _decoder.raw_decode(text, pos)
+            pos = _skip(text, pos)
+            if not isinstance(key, str) or text[pos:pos + 1] != ":":
+                return result, f"malformed key at char {pos} (after {len(result)} keys)"
+            value, pos = _decoder.raw_decode(text, _skip(text, pos + 1))
+        except json.JSONDecodeError as e:
+            return result, f"{e.msg} (char {e.pos}, after {len(result)} keys)"
+        if _cut_at_end(text, pos):
+            return result, f"truncated after {len(result)} keys"
+        result[key] = value
+
+# --- VALIDATION ---
+
+def has_error_phrase(text):
+    text = text.lower()
+    return any(phrase in text for phrase in ERROR_PHRASES) and len(text) < 150
+
+def check_question(item):
+    """MCQ record ka reject reason, ya None agar valid (q, a, options, cat)."""
+    if not isinstance(item, dict):
+        return "not an object"
+    question, answer, options = item.get("q"), item.get("a"), item.get("options")
+    if not isinstance(question, str) or not question.strip():
+        return "missing question"
+    if not isinstance(options, list) or len(options) < 2:
+        return "fewer than 2 options"
+    if not all(isinstance(o, str) and o.strip() for o in options):
+        return "empty option"
+    if len(set(options)) != len(options):
+        return "duplicate options"
+    if answer not in options:
+        return "answer not in options"
+    if has_error_phrase(question):
+        return "error text"
+    return None
+
+def clean_bullets(bullets):
+    """
+    Model ke facts saaf karta hai: bullet symbols, chatter lines ("Here are the facts:"),
+    chhote / error strings hatate hain. Return: (bullets[:MAX_BULLETS], reject reason ya None).
+    """
+    if isinstance(bullets, dict):
+        bullets = bullets.get("bullets")  # Kuch models {"bullets": [...]} wrap kar dete hain
+    if not isinstance(bullets, list):
+        return [], "bullets is not a list"
+
+    cleaned, reasons = [], Counter()
+    for bullet in bullets:
+        if not isinstance(bullet, str):
+            reasons["non-string bullet"] += 1
+            continue
+        bullet = BULLET_PREFIX_RE.sub("", bullet).strip()
+        if CHATTER_RE.match(bullet):
+            reasons["chatter"] += 1
+        elif has_error_phrase(bullet):
+            reasons["error text"] += 1
+        elif len(bullet) < MIN_BULLET_CHARS:
+            reasons["too short"] += 1
+        else:
+            cleaned.append(bullet)
+
+    if len(cleaned) < MIN_BULLETS:
+        detail = f" ({', '.join(f'{r} x{n}' for r, n in reasons.items())})" if reasons else ""
+        return cleaned, f"only {len(cleaned)} usable bullets{detail}"
+    return cleaned[:MAX_BULLETS], None
+
+class Report:
+    """Ek response ke records ka hisaab: kitne valid, kaun reject aur kyun."""
+
+    def __init__(self, name):
+        self.name = name
+        self.valid = 0
+        self.truncated = None
+        self.rejected = []     # (index ya key, reason)
+
+    def reject(self, key, reason):
+        self.rejected.append((key, reason))
+        METRICS.incr(f"{self.name}.rejected")
+
+    def mark_truncated(self, reason):
+        if reason:
+            self.truncated = reason
+            METRICS.incr(f"{self.name}.truncated")
+
+    def reasons(self):
+        return Counter(reason for _, reason in self.rejected)
+
+    def summary(self):
+        parts = []
+        if self.truncated:
+            parts.append(f"salvaged {self.valid} from truncated response ({self.truncated})")
+        if self.rejected:
+            parts.append(f"{len(self.rejected)} rejected: " +
+                         ", ".join(f"{reason} x{n}" for reason, n in self.reasons().most_common()))
+        return "; ".join(parts)
+
+def validate(items, check, name, truncated=None):
+    """`check(item)` se har record validate. Return: (valid items, Report)."""
+    report = Report(name)
+    report.mark_truncated(truncated)
+    valid = []
+    for i, item in enumerate(items):
+        reason = check(item)
+        if reason:
+            report.reject(i, reason)
+        else:
+            valid.append(item)
+    report.valid = len(valid)
+    METRICS.incr(f"{name}.valid", len(valid))
+    return valid, report
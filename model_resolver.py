@@ -0,0 +1,114 @@
+"""
+Gemini model resolution, ai_magic aur gen_pro_quiz dono ke liye ek jagah.
+
+- `google.generativeai` SDK pehli zaroorat par import hota hai (`genai()`), module load
+  par nahi; jo stages LLM nahi chhoote wo SDK import ka kharcha nahi dete.
+- `genai.list_models()` ka result `model_cache.json` me TTL ke saath cache hota hai
+  (API key ke fingerprint ke saath, key khud save nahi hoti). Warm cache par listing
+  ka network round-trip nahi lagta; listing fail ho to purana (stale) cache bhi chalega.
+  Fingerprint key se bana hai, isliye file git me nahi jaati (.gitignore); workflows
+  ise Actions cache me rakhte hain.
+- GEMINI_MODEL env var se model pin karo: tab listing bilkul nahi hoti.
+
+    from model_resolver import genai, resolve_model
+    model_name = resolve_model("quiz")          # PREFERENCES["quiz"] order me pehla available
+    genai().GenerativeModel(model_name)
+
+Config (env vars): GEMINI_API_KEY, GEMINI_MODEL (pin), MODEL_CACHE_TTL_H (default 24, 0 = off)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from metrics import METRICS
+
+MODEL_CACHE_FILE = "model_cache.json"
+DEFAULT_TTL_HOURS = 24
+
+# Har use-case ka preference order (pehla available model chuna jaata hai)
+PREFERENCES = {
+    "summary": ["models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro"],
+    "quiz": ["models/gemini-1.5-pro", "models/gemini-1.5-flash", "models/gemini-pro"],
+}
+
+_sdk = None
+_sdk_lock = threading.Lock()
+
+def api_key():
+    return os.environ.get("GEMINI_API_KEY")
+
+def genai():
+    """Configured `google.generativeai` module (pehli call par import + configure)."""
+    global _sdk
+    if _sdk is None:
+        with _sdk_lock:
+            if _sdk is None:
+                with METRICS.timer("models.sdk_import_s"):
+                    import google.generativeai as sdk
+                sdk.configure(api_key=api_key())
+                _sdk = sdk
+    return _sdk
+
+def key_fingerprint(key):
+    return hashlib.sha256((key or "").encode("utf-8")).hexdigest()[:12]
+
+def read_cache(path=MODEL_CACHE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_cache(models, path=MODEL_CACHE_FILE):
+    entry = {"key": key_fingerprint(api_key()), "fetched": int(time.time()), "models": models}
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(entry, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+def list_models():
+    """generateContent support karne wale models, seedha API se."""
+    with METRICS.timer("models.list_s"):
+        return [m.name for m in genai().list_models() if 'generateContent' in m.supported_generation_methods]
+
+def available_models(ttl_hours=None, path=MODEL_CACHE_FILE):
+    """Cached model list (TTL ke andar), warna API listing. Listing fail ho to stale cache ya raise."""
+    if ttl_hours is None:
+        ttl_hours = float(os.environ.get("MODEL_CACHE_TTL_H", DEFAULT_TTL_HOURS))
+    cache = read_cache(path)
+    if cache.get("key") != key_fingerprint(api_key()):
+        cache = {}
+
+    if cache and ttl_hours > 0 and time.time() - cache.get("fetched", 0) < ttl_hours * 3600:
+        METRICS.incr("models.cache_hits")
+        return cache["models"]
+
+    try:
+        models = list_models()
+    except Exception as e:
+        if cache.get("models"):
+            print(f"⚠️ Model listing failed ({str(e)[:80]}), cached list use ho rahi hai.")
+            METRICS.incr("models.stale_cache")
+            return cache["models"]
+        raise
+    METRICS.incr("models.listed")
+    if models and ttl_hours > 0:
+        write_cache(models, path)
+    return models
+
+def resolve_model(purpose, pinned=None):
+    """
+    `purpose` (PREFERENCES key) ke liye model name: pinned (arg ya GEMINI_MODEL) ho to wahi,
+    warna preference order me pehla available, phir koi bhi available. Kuch na mile to None.
+    Listing errors caller tak jaate hain.
+    """
+    pinned = pinned or os.environ.get("GEMINI_MODEL")
+    if pinned:
+        return pinned if pinned.startswith("models/") else f"models/{pinned}"
+
+    models = available_models()
+    for name in PREFERENCES.get(purpose, []):
+        if name in models:
+            return name
+    return models[0] if models else None
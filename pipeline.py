@@ -0,0 +1,177 @@
+"""
+Poori daily pipeline ek process me: scrape -> clean -> dedup -> ai -> store.
+
+Har stage apna output file likhta hai (1.jsonl -> 2.jsonl -> 4.jsonl -> 3.json) aur
+per-record stages (clean, ai, store) `.pipeline/` me checkpoint rakhte hain. Agar
+run beech me crash/timeout ho jaye to same command dobara chalao: complete hue
+records skip honge, sirf bache hue process honge (AI quota bachta hai).
+
+Usage:
+    python pipeline.py                       # saare stages
+    python pipeline.py --stages ai,store     # sirf ye stages
+    python pipeline.py --from dedup          # dedup se aage tak
+    python pipeline.py --fresh               # checkpoints mita ke shuru se
+
+Naya scrape `1.jsonl` overwrite karta hai, isliye pichle run ke adhure records (clean /
+ai / store ne complete nahi kiye, e.g. AI quota fail) naye `1.jsonl` me carry forward
+hote hain (CARRY_DAYS tak), warna wo hamesha ke liye chhoot jaate: unke links URL
+history me hain, scraper unhe dobara nahi laata.
+
+Har run ke end me `metrics.json` (stage timings, counters, latency histograms) likhi
+jaati hai; profiling ke liye dekho metrics.py (METRICS_PROFILE / METRICS_TRACEMALLOC).
+"""
+import argparse
+import datetime
+import os
+import sys
+
+from checkpoints import StageCheckpoint, record_key
+from metrics import METRICS
+from records import append_records, read_records, resolve_input
+
+CARRY_DAYS = 3   # Itne din purane adhure records tak retry (hamesha drop hone wale records yahan tak)
+
+# (stage, us stage ka input): input ke jo records stage ke journal me nahi, wo adhure hain.
+# Dedup ke hataye duplicates 2.jsonl me hote hi nahi, isliye wo carry nahi hote.
+CARRY_STAGES = [("clean", "1.jsonl"), ("ai", "2.jsonl"), ("store", "4.jsonl")]
+
+def unfinished_records(today=None):
+    """Pichle run ke stage inputs me se wo records jo apna agla stage complete nahi kar paaye."""
+    today = today or datetime.date.today()
+    oldest = (today - datetime.timedelta(days=CARRY_DAYS)).isoformat()
+    pending, seen = [], set()
+    for stage, path in CARRY_STAGES:
+        source = resolve_input(path)
+        if not source or not os.path.exists(os.path.join(".pipeline", f"{stage}.jsonl")):
+            continue
+        checkpoint = StageCheckpoint(stage)
+        try:
+            for record in read_records(source):
+                key = record_key(record)
+                if key in checkpoint or key in seen or record.get("date", "") < oldest:
+                    continue
+                seen.add(key)
+                # Jo stages complete ho chuke unka output journals se resume hota hai
+                pending.append(record)
+        except ValueError:
+            continue
+    return pending
+
+def run_scrape(checkpoint):
+    from scraper import run_scraper
+
+    # Scrape se pehle hi: overwrite ke baad pichle inputs nahi bachenge
+    pending = unfinished_records()
+    count = run_scraper("1.jsonl")
+    if count and pending:
+        scraped = {record_key(r) for r in read_records("1.jsonl")}
+        carried = append_records("1.jsonl", (r for r in pending if record_key(r) not in scraped))
+        METRICS.incr("pipeline.carried", carried)
+        print(f"↪️ {carried} adhure records pichle run se carry forward hue (clean/ai/store me resume honge).")
+    return count
+
+def run_clean(checkpoint):
+    from cut import process_cleaning
+    return process_cleaning("1.jsonl", "2.jsonl", checkpoint=checkpoint)
+
+def run_dedup(checkpoint):
+    # Whole-set stage (clusters poore din ke data par bante hain), har baar poora chalta hai
+    from dedup import run_dedup
+    return run_dedup("2.jsonl", "2.jsonl")
+
+def run_ai(checkpoint):
+    from ai_magic import process_news
+    return process_news("2.jsonl", "4.jsonl", checkpoint=checkpoint)
+
+def run_store(checkpoint):
+    from cut3 import clean_and_store
+    return clean_and_store("4.jsonl", "3.json", checkpoint=checkpoint)
+
+# (name, runner, checkpointed?)
+STAGES = [
+    ("scrape", run_scrape, False),
+    ("clean", run_clean, True),
+    ("dedup", run_dedup, False),
+    ("ai", run_ai, True),
+    ("store", run_store, True),
+]
+STAGE_NAMES = [name for name, _, _ in STAGES]
+
+def select_stages(names=None, start=None):
+    """`--stages` aur `--from` se chalne wale stages (pipeline order me)."""
+    selected = STAGE_NAMES
+    if names:
+        wanted = [n.strip() for n in names.split(",") if n.strip()]
+        unknown = [n for n in wanted if n not in STAGE_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGE_NAMES)})")
+        selected = [n for n in STAGE_NAMES if n in wanted]
+    if start:
+        if start not in STAGE_NAMES:
+            raise ValueError(f"Unknown stage: {start} (choose from {', '.join(STAGE_NAMES)})")
+        selected = [n for n in selected if STAGE_NAMES.index(n) >= STAGE_NAMES.index(start)]
+    return selected
+
+def run_pipeline(names=None, start=None, fresh=False):
+    """Stages chalata hai; koi stage fail (None) ho to aage ke stages skip. Return: results list."""
+    selected = select_stages(names, start)
+    results = []
+
+    for name, runner, checkpointed in STAGES:
+        if name not in selected:
+            continue
+
+        checkpoint = StageCheckpoint(name) if checkpointed else None
+        if checkpoint and fresh:
+            checkpoint.clear()
+
+        print(f"\n{'=' * 20} ▶️ {name} {'=' * 20}")
+        with METRICS.stage(name) as info:
+            count = runner(checkpoint)
+            info["count"] = count
+            if checkpoint:
+                info["resumed"] = checkpoint.resumed
+                info["processed"] = checkpoint.processed
+
+        results.append({
+            "stage": name,
+            "count": count,
+            "seconds": info["seconds"],
+            "resumed": checkpoint.resumed if checkpoint else 0,
+            "processed": checkpoint.processed if checkpoint else 0,
+        })
+
+        if count is None:
+            print(f"\n❌ Stage '{name}' fail hua, aage ke stages skip. Dobara chalane par yahin se resume hoga.")
+            break
+
+    print_summary(results)
+    print(f"📈 Metrics saved to '{METRICS.write()}'")
+    return results
+
+def print_summary(results):
+    print(f"\n📊 Pipeline Summary")
+    for r in results:
+        status = "❌ failed" if r["count"] is None else f"{r['count']} records"
+        line = f"   {r['stage']:<7} {r['seconds']:7.1f}s  {status}"
+        if r["resumed"]:
+            line += f"  (resumed {r['resumed']}, processed {r['processed']})"
+        print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daily news pipeline runner")
+    parser.add_argument("--stages", help=f"Comma-separated stages ({','.join(STAGE_NAMES)})")
+    parser.add_argument("--from", dest="start", choices=STAGE_NAMES, help="Is stage se aage tak chalao")
+    parser.add_argument("--fresh", action="store_true", help="Checkpoints mita ke sab records dobara process karo")
+    args = parser.parse_args(argv)
+
+    try:
+        results = run_pipeline(args.stages, args.start, args.fresh)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if any(r["count"] is None for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Rolling quiz bank: har din ke MCQs ek jagah, source article ke saath.
+
+Pehle har run poori news par quiz dobara banata tha, chahe wo news kal hi cover ho
+chuki ho. Ab gen_pro_quiz sirf un articles ke questions maangta hai jo bank me
+nahi hain (`new_articles`), aur aaj ka quiz bank se banta hai (`questions_for`).
+
+Disk layout (`quiz_bank/`, append-only JSON Lines, crash me adhuri last line skip):
+    questions.jsonl   # {"id", "article", "day", "q", "a", "options", "cat"}
+                      # ya merge line {"merge": id, "article", "day"} (neeche dekho)
+    articles.jsonl    # {"article", "day", "questions"}: jin articles ke questions ban chuke
+
+Keys:
+  * article: normalized content ka hash (same news dobara aaye to same key)
+  * question: `normalize` kiya question text (gen_pro_quiz dedup bhi yahi use karta hai).
+    Duplicates aur near-duplicates (same answer, question words ka Jaccard >=
+    NEAR_DUP_THRESHOLD) merge hote hain: pehla question (text) rehta hai, naya source
+    article uski "also" list me judta hai (merge line), taaki us article ke quiz me bhi aaye.
+
+Sampling:
+    bank.sample(20, since="2026-08-01", cat="Who")   # random N
+    bank.window("2026-08-01", "2026-08-07")           # date range, din ke order me
+    bank.by_category("Amount")
+
+CLI:
+    python quiz_bank.py stats
+    python quiz_bank.py sample --n 20 [--cat Who] [--since 2026-08-01] [--until ...]
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import random
+from bisect import bisect_left, bisect_right
+
+from records import append_records, read_records
+from search_index import tokenize
+
+BANK_DIR = "quiz_bank"
+QUESTIONS_FILE = "questions.jsonl"
+ARTICLES_FILE = "articles.jsonl"
+NEAR_DUP_THRESHOLD = 0.7   # Same answer wale questions ka word overlap (Jaccard)
+ARTICLE_KEY_CHARS = 2000   # Article key ke liye content ka itna hissa kaafi hai
+
+def normalize(text):
+    """Lowercase, sirf letters/digits/spaces, whitespace collapse (question dedup key)."""
+    return " ".join("".join(ch for ch in str(text).lower() if ch.isalnum() or ch.isspace()).split())
+
+def article_key(content):
+    return hashlib.sha1(normalize(content[:ARTICLE_KEY_CHARS]).encode("utf-8")).hexdigest()[:16]
+
+def question_id(question):
+    return hashlib.sha1(normalize(question).encode("utf-8")).hexdigest()[:16]
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def read_bank_file(path):
+    """records.read_records, bas missing file = khaali aur crash me adhuri likhi last line par stop."""
+    if not os.path.exists(path):
+        return
+    try:
+        yield from read_records(path)
+    except ValueError:
+        return
+
+def best_article(question, article_tokens):
+    """Chunk ke articles me se wo jiske words question + answer se sabse zyada milte hain."""
+    words = set(tokenize(f"{question['q']} {question['a']}"))
+    best, best_overlap = 0, -1
+    for i, tokens in enumerate(article_tokens):
+        overlap = len(words & tokens)
+        if overlap > best_overlap:
+            best, best_overlap = i, overlap
+    return best
+
+class QuizBank:
+    def __init__(self, directory=BANK_DIR):
+        self.directory = directory
+        self.questions_path = os.path.join(directory, QUESTIONS_FILE)
+        self.articles_path = os.path.join(directory, ARTICLES_FILE)
+        self.stats = {"added": 0, "duplicates": 0, "near_duplicates": 0}
+        os.makedirs(directory, exist_ok=True)
+
+        self.articles = {entry["article"]: entry for entry in read_bank_file(self.articles_path)}
+        self.questions = []        # day ke order me (stable)
+        self._by_id = {}
+        self._by_answer = {}       # normalized answer -> [(words, item)] near-dup check ke liye
+        for entry in read_bank_file(self.questions_path):
+            if "merge" in entry:
+                if entry["merge"] in self._by_id:
+                    self._link(self._by_id[entry["merge"]], entry["article"])
+            else:
+                self._remember(entry)
+        self.questions.sort(key=lambda item: item["day"])
+        self._reindex()
+
+    def _remember(self, item):
+        self.questions.append(item)
+        self._by_id[item["id"]] = item
+        self._by_answer.setdefault(normalize(item["a"]), []).append((set(tokenize(item["q"])), item))
+
+    def _link(self, item, key):
+        """Kept question ko ek aur source article se jodo. Return: True agar naya link bana."""
+        if not key or key == item["article"] or key in item.get("also", []):
+            return False
+        item.setdefault("also", []).append(key)
+        return True
+
+    def _reindex(self):
+        self._days = [item["day"] for item in self.questions]
+        self._by_cat = {}
+        for i, item in enumerate(self.questions):
+            self._by_cat.setdefault(item.get("cat") or "Other", []).append(i)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __contains__(self, content):
+        return article_key(content) in self.articles
+
+    def find_duplicate(self, question):
+        """Bank ka wo item jiska exact (normalized text) ya near-duplicate hai, warna None."""
+        existing = self._by_id.get(question_id(question["q"]))
+        if existing:
+            self.stats["duplicates"] += 1
+            return existing
+        words = set(tokenize(question["q"]))
+        for existing_words, existing in self._by_answer.get(normalize(question["a"]), []):
+            if jaccard(words, existing_words) >= NEAR_DUP_THRESHOLD:
+                self.stats["near_duplicates"] += 1
+                return existing
+        return None
+
+    # --- writes ---
+
+    def new_articles(self, articles):
+        """Sirf wo article contents jinke questions bank me nahi (input order me)."""
+        return [content for content in articles if article_key(content) not in self.articles]
+
+    def add(self, articles, questions, day=None):
+        """
+        Ek chunk (ya single-shot prompt) ke `articles` aur unse bane `questions`. Har question
+        best matching article ko attribute hota hai; duplicate ho to naya article pehle wale
+        question se jud jaata hai. Saare `articles` covered mark hote hain. Return: kitne
+        naye questions jude.
+        """
+        day = day or datetime.date.today().isoformat()
+        keys = [article_key(content) for content in articles]
+        article_tokens = [set(tokenize(content)) for content in articles]
+        counts = dict.fromkeys(keys, 0)
+
+        new_items, merges = [], []
+        for question in questions:
+            key = keys[best_article(question, article_tokens)] if keys else ""
+            existing = self.find_duplicate(question)
+            if existing:
+                if self._link(existing, key):
+                    merges.append({"merge": existing["id"], "article": key, "day": day})
+                    counts[key] = counts.get(key, 0) + 1
+                continue
+            item = {"id": question_id(question["q"]), "article": key, "day": day,
+                    "q": question["q"], "a": question["a"], "options": question["options"],
+                    "cat": question.get("cat") or "Other"}
+            self._remember(item)
+            new_items.append(item)
+            counts[key] = counts.get(key, 0) + 1
+
+        new_articles = [{"article": key, "day": day, "questions": counts[key]}
+                        for key in dict.fromkeys(keys) if key not in self.articles]
+        # Pehle questions, phir articles: crash beech me ho to article dobara generate hoga, question kho nahi jaayega
+        append_records(self.questions_path, new_items + merges)
+        append_records(self.articles_path, new_articles)
+        for entry in new_articles:
+            self.articles[entry["article"]] = entry
+
+        if new_items and self._days and day < self._days[-1]:
+            self.questions.sort(key=lambda item: item["day"])
+        self._reindex()
+        self.stats["added"] += len(new_items)
+        return len(new_items)
+
+    # --- reads ---
+
+    def questions_for(self, articles, limit=None):
+        """
+        In articles ke bank questions (aaj ka quiz), articles me round-robin taaki `limit`
+        lagne par bhi har news represent ho.
+        """
+        wanted = list(dict.fromkeys(article_key(content) for content in articles))
+        by_article = {key: [] for key in wanted}
+        for item in self.questions:
+            for key in [item["article"]] + item.get("also", []):
+                if key in by_article:
+                    by_article[key].append(item)
+                    break
+
+        picked, round_no = [], 0
+        while True:
+            added = False
+            for key in wanted:
+                items = by_article[key]
+                if round_no < len(items):
+                    picked.append(items[round_no])
+                    added = True
+                    if limit and len(picked) >= limit:
+                        return picked
+            if not added:
+                return picked
+            round_no += 1
+
+    def window(self, since=None, until=None):
+        """`since` se `until` (dono inclusive, YYYY-MM-DD) tak ke questions, din ke order me."""
+        start = bisect_left(self._days, since) if since else 0
+        end = bisect_right(self._days, until) if until else len(self._days)
+        return self.questions[start:end]
+
+    def by_category(self, cat, since=None, until=None):
+        indexes = self._by_cat.get(cat, [])
+        if since or until:
+            start = bisect_left(self._days, since) if since else 0
+            end = bisect_right(self._days, until) if until else len(self._days)
+            indexes = indexes[bisect_left(indexes, start):bisect_left(indexes, end)]
+        return [self.questions[i] for i in indexes]
+
+    def sample(self, n, since=None, until=None, cat=None, seed=None):
+        """Random `n` questions (kam hon to saare), optional date window aur category."""
+        pool = self.by_category(cat, since, until) if cat else self.window(since, until)
+        rng = random.Random(seed)
+        return rng.sample(pool, min(n, len(pool)))
+
+    def categories(self):
+        return {cat: len(indexes) for cat, indexes in sorted(self._by_cat.items())}
+
+    def summary(self):
+        s = self.stats
+        return (f"🏦 Quiz Bank: {len(self.questions)} questions, {len(self.articles)} articles "
+                f"(+{s['added']} new, {s['duplicates']} duplicates, {s['near_duplicates']} near-duplicates merged)")
+
+def public_question(item):
+    """Bank item -> quiz.json format (q, a, options, cat)."""
+    return {"q": item["q"], "a": item["a"], "options": item["options"], "cat": item["cat"]}
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling quiz question bank")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Bank size, categories, date range")
+    sample = sub.add_parser("sample", help="Random questions as JSON")
+    sample.add_argument("--n", type=int, default=20)
+    sample.add_argument("--cat")
+    sample.add_argument("--since", help="YYYY-MM-DD")
+    sample.add_argument("--until", help="YYYY-MM-DD")
+    sample.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    bank = QuizBank()
+    if args.command == "stats":
+        print(bank.summary())
+        if bank.questions:
+            print(f"   Days: {bank.questions[0]['day']} -> {bank.questions[-1]['day']}")
+        for cat, count in bank.categories().items():
+            print(f"   {cat:<10} {count}")
+    else:
+        picked = bank.sample(args.n, args.since, args.until, args.cat, args.seed)
+        print(json.dumps([public_question(item) for item in picked], indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Quiz publishing: quiz.json ke saath PWA ke liye chhote, cache-friendly bundles.
+
+quiz.json (indent=4) poora download + parse karna padta hai. Yahan har run par:
+
+    quiz_bundles/manifest.json                   # chhota index, hamesha fresh fetch
+    quiz_bundles/day/2026-08-22.3f9a1c0b2d4e.json     # us din ke saare questions
+    quiz_bundles/cat/who.7b21e09c44af.json            # ek category (`cat`), saare rakhe gaye din
+    ... + har shard ka .gz aur .br (brotli installed ho to)
+
+Shards minified (no indent, UTF-8 direct, koi \\u escapes nahi) aur file name me content
+hash hai, isliye client unhe hamesha ke liye cache kar sakta hai (immutable); sirf
+manifest dekh kar pata chalta hai kya badla. Purane din MAX_DAYS ke baad hat jaate hain.
+
+Manifest:
+    {"version": 1, "generated": "...", "latest": "2026-08-22",
+     "days": {"2026-08-22": {"file": "day/...json", "hash": "...", "count": 40,
+                             "bytes": 9120, "gz": 3011, "br": 2650}},
+     "categories": {"who": {..same fields.., "name": "Who"}}}
+
+    python quiz_publish.py               # quiz.json ko aaj ki date se publish
+    python quiz_publish.py --date 2026-08-22 quiz.json
+"""
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUNDLE_DIR = "quiz_bundles"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+MAX_DAYS = 30            # Itne din ke day shards (aur category shards me questions)
+HASH_CHARS = 12
+GZIP_LEVEL = 9           # Ek baar compress, har client download par fayda
+BROTLI_QUALITY = 11
+DEFAULT_CATEGORY = "Other"
+
+def minify(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def category_slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "other"
+
+def write_atomic(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        f.write(payload)
+    os.replace(path + ".tmp", path)
+
+def write_shard(directory, folder, name, data):
+    """Minified shard + .gz/.br variants. Return: manifest entry."""
+    payload = minify(data)
+    digest = hashlib.sha256(payload).hexdigest()[:HASH_CHARS]
+    relative = f"{folder}/{name}.{digest}.json"
+    path = os.path.join(directory, relative)
+    entry = {"file": relative, "hash": digest, "count": len(data), "bytes": len(payload)}
+
+    # Same content = same naam, dobara likhne ki zaroorat nahi
+    if not os.path.exists(path):
+        write_atomic(path, payload)
+        # mtime=0 taaki same content ka .gz bhi byte-for-byte same rahe
+        write_atomic(path + ".gz", gzip.compress(payload, GZIP_LEVEL, mtime=0))
+        if brotli:
+            write_atomic(path + ".br", brotli.compress(payload, quality=BROTLI_QUALITY))
+    entry["gz"] = os.path.getsize(path + ".gz")
+    if brotli and os.path.exists(path + ".br"):
+        entry["br"] = os.path.getsize(path + ".br")
+    return entry
+
+def load_manifest(directory=BUNDLE_DIR):
+    path = os.path.join(directory, MANIFEST_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+def load_shard(directory, entry):
+    with open(os.path.join(directory, entry["file"]), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def remove_unreferenced(directory, manifest):
+    """Jo shard manifest me nahi (purane din / badla content) unhe hatao."""
+    keep = {entry["file"] for section in ("days", "categories") for entry in manifest[section].values()}
+    removed = 0
+    for folder in ("day", "cat"):
+        folder_path = os.path.join(directory, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for name in os.listdir(folder_path):
+            base = name
+            for suffix in (".gz", ".br", ".tmp"):
+                if base.endswith(suffix):
+                    base = base[:-len(suffix)]
+            if f"{folder}/{base}" not in keep:
+                os.remove(os.path.join(folder_path, name))
+                removed += 1
+    return removed
+
+def publish(questions, day=None, directory=BUNDLE_DIR, max_days=MAX_DAYS):
+    """
+    `questions` ko `day` (default aaj) ka shard bana ke manifest update karta hai.
+    Pichhle din ke shards manifest se padhe jaate hain; category shards retained
+    dino se dobara bante hain (naye din pehle). Return: manifest dict.
+    """
+    day = day or datetime.date.today().isoformat()
+    previous = load_manifest(directory) or {"days": {}}
+
+    days = {}
+    for old_day in sorted(previous["days"], reverse=True):
+        if old_day != day and len(days) < max_days - 1:
+            days[old_day] = previous["days"][old_day]
+    days[day] = write_shard(directory, "day", day, questions)
+
+    by_category, names = {}, {}
+    for shard_day in sorted(days, reverse=True):
+        data = questions if shard_day == day else load_shard(directory, days[shard_day])
+        for item in data:
+            name = item.get("cat") or DEFAULT_CATEGORY
+            slug = category_slug(name)
+            names.setdefault(slug, name)
+            by_category.setdefault(slug, []).append(dict(item, day=shard_day))
+
+    categories = {}
+    for slug in sorted(by_category):
+        entry = write_shard(directory, "cat", slug, by_category[slug])
+        entry["name"] = names[slug]
+        categories[slug] = entry
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+        "latest": max(days),
+        "days": {d: days[d] for d in sorted(days, reverse=True)},
+        "categories": categories,
+    }
+    # Manifest sabse last: client ko kabhi adhure shards ka reference na mile
+    write_atomic(os.path.join(directory, MANIFEST_FILE), minify(manifest))
+    remove_unreferenced(directory, manifest)
+    return manifest
+
+def summary(manifest, day):
+    entry = manifest["days"][day]
+    line = (f"📦 Quiz bundles: {day} -> {entry['count']} questions, {entry['bytes'] / 1024:.1f} KB "
+            f"(gz {entry['gz'] / 1024:.1f} KB")
+    if "br" in entry:
+        line += f", br {entry['br'] / 1024:.1f} KB"
+    return line + f"), {len(manifest['categories'])} categories, {len(manifest['days'])} days"
+
+def main():
+    parser = argparse.ArgumentParser(description="quiz.json ko sharded PWA bundles me publish karo")
+    parser.add_argument("quiz_file", nargs="?", default="quiz.json")
+    parser.add_argument("--date", help="Shard date (YYYY-MM-DD), default aaj")
+    parser.add_argument("--dir", default=BUNDLE_DIR)
+    args = parser.parse_args()
+
+    with open(args.quiz_file, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+    day = args.date or datetime.date.today().isoformat()
+    manifest = publish(questions, day, args.dir)
+    print(summary(manifest, day))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Quiz generator ka input layer: aaj ki news kahan se aaye.
+
+Sources (QUIZ_SOURCES env var, comma-separated, isi order me try hote hain):
+    local    pipeline ka output (`2.jsonl`, purana `2.json` bhi) repo checkout me hi hai,
+             isliye network ki zaroorat nahi. Default pehla source.
+    archive  archive store (archive_store.py) me aaj archive hue records
+    url      QUIZ_NEWS_URL (default: GitHub raw 2.jsonl), stream karke parse
+
+Pehla source jo kam se kam MIN_TOTAL_CHARS ki news de wahi use hota hai; baaki sirf
+fallback hain. Har source article contents (str) stream karta hai.
+
+    from quiz_sources import load_articles
+    articles, source = load_articles()
+"""
+import datetime
+import io
+import os
+
+from records import iter_records, read_records, resolve_input
+
+LOCAL_FILE = "2.jsonl"
+NEWS_URL = "https://raw.githubusercontent.com/GOLutheGhosT-4444/Today-Current-Affairs/refs/heads/main/2.jsonl"
+DEFAULT_SOURCES = "local,archive,url"
+MIN_CONTENT_CHARS = 50   # Isse chhote articles me quiz laayak facts nahi hote
+MIN_TOTAL_CHARS = 100
+
+def article_contents(records):
+    for item in records:
+        content = item.get('content', '') or item.get('summary', '')
+        if len(content) > MIN_CONTENT_CHARS:
+            yield content
+
+def local_articles(path=LOCAL_FILE):
+    source = resolve_input(path)
+    if not source:
+        raise FileNotFoundError(f"'{path}' nahi mila")
+    yield from article_contents(read_records(source))
+
+def archive_articles(day=None):
+    """Archive store me `day` (default aaj) ko archive hue records (AI summaries)."""
+    from archive_store import ArchiveStore
+
+    day = day or datetime.date.today().isoformat()
+    store = ArchiveStore()
+    try:
+        yield from article_contents(store.query(day, day, field="archived_on"))
+    finally:
+        store.close()
+
+def url_articles(url=None):
+    """Shared HTTP session (timeout + retry) se stream: poora response memory me nahi."""
+    import http_client
+
+    url = url or os.environ.get("QUIZ_NEWS_URL", NEWS_URL)
+    response = http_client.get(url, stream=True)
+    try:
+        response.raise_for_status()
+        response.raw.decode_content = True  # gzip/br transfer encoding decode
+        yield from article_contents(iter_records(io.TextIOWrapper(response.raw, encoding="utf-8")))
+    finally:
+        response.close()
+
+SOURCES = {
+    "local": local_articles,
+    "archive": archive_articles,
+    "url": url_articles,
+}
+
+def source_names(value=None):
+    names = [n.strip() for n in (value or os.environ.get("QUIZ_SOURCES", DEFAULT_SOURCES)).split(",") if n.strip()]
+    unknown = [n for n in names if n not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown quiz source(s): {', '.join(unknown)} (choose from {', '.join(SOURCES)})")
+    return names
+
+def load_articles(names=None):
+    """
+    Sources ko order me try karta hai. Return: (articles, source name), ya ([], None)
+    agar kisi source se kaafi news nahi mili.
+    """
+    for name in source_names(names):
+        try:
+            articles = list(SOURCES[name]())
+        except Exception as e:
+            print(f"   ⚠️ Source '{name}' fail: {str(e)[:100]}")
+            continue
+        total_chars = sum(len(content) for content in articles)
+        if total_chars >= MIN_TOTAL_CHARS:
+            return articles, name
+        print(f"   ⚠️ Source '{name}' me kaafi news nahi ({len(articles)} articles, {total_chars} chars)")
+    return [], None
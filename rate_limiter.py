@@ -0,0 +1,193 @@
+"""
+Shared rate limiting aur request scheduling (Gemini calls ke liye).
+
+- TokenBucket: requests-per-minute (RPM) aur tokens-per-minute (TPM) budget.
+- classify_error(): exception ko rate_limited / transient / fatal me baantta hai.
+- Scheduler: har call ko bucket se guzarta hai, error ke hisaab se exponential
+  backoff + jitter ke saath retry karta hai, aur 429 aane par RPM ko adaptively
+  aadha kar deta hai (success par dheere dheere wapas badhta hai).
+  Scheduler.map() asyncio se ek saath kai jobs chalata hai (bounded concurrency).
+
+Config (env vars): GEMINI_RPM, GEMINI_TPM, GEMINI_CONCURRENCY, GEMINI_MAX_RETRIES
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+
+from metrics import METRICS
+
+RATE_LIMITED = "rate_limited"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+RATE_LIMIT_HINTS = ("429", "quota", "rate limit", "resource exhausted", "resourceexhausted", "too many requests")
+TRANSIENT_HINTS = ("500", "502", "503", "504", "deadline", "timeout", "timed out", "unavailable",
+                   "overloaded", "internal", "connection", "reset by peer")
+
+# Backoff: (base seconds, cap seconds) per error kind
+BACKOFF = {
+    RATE_LIMITED: (15.0, 120.0),
+    TRANSIENT: (2.0, 30.0),
+}
+
+def classify_error(exc):
+    """Exception ko retry policy ke liye classify karta hai."""
+    text = f"{type(exc).__name__} {exc}".lower()
+    if any(hint in text for hint in RATE_LIMIT_HINTS):
+        return RATE_LIMITED
+    if isinstance(exc, (TimeoutError, ConnectionError)) or any(hint in text for hint in TRANSIENT_HINTS):
+        return TRANSIENT
+    return FATAL
+
+def backoff_delay(attempt, kind, policy=BACKOFF, rng=random):
+    """Exponential backoff with jitter: [d/2, d] jahan d = base * 2^attempt (cap tak)."""
+    base, cap = policy[kind]
+    delay = min(cap, base * (2 ** attempt))
+    return rng.uniform(delay / 2, delay)
+
+class TokenBucket:
+    """
+    Per-minute budget. reserve() turant budget kaat leta hai (chahe negative ho jaaye)
+    aur batata hai kitna wait karna hai, isliye bade requests bhi kabhi starve nahi hote.
+    """
+
+    def __init__(self, per_minute, clock=time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = float(per_minute)   # Abhi ka refill rate (adaptive)
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / 60.0)
+        self._updated = now
+
+    def reserve(self, amount=1):
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens * 60.0 / self.rate
+
+    def slow_down(self, factor=0.5, floor=1.0):
+        with self._lock:
+            self._refill(self.clock())
+            self.rate = max(floor, self.rate * factor)
+
+    def speed_up(self, step=1.0):
+        with self._lock:
+            self._refill(self.clock())
+            self.rate = min(self.capacity, self.rate + step)
+
+class Scheduler:
+    def __init__(self, rpm, tpm=None, concurrency=2, max_retries=4, name="gemini",
+                 backoff=BACKOFF, clock=time.monotonic, sleep=time.sleep):
+        self.name = name
+        self.backoff = backoff
+        self.requests = TokenBucket(rpm, clock)
+        self.tokens = TokenBucket(tpm, clock) if tpm else None
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.clock = clock
+        self.sleep = sleep
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._cooldown_until = 0.0
+        self.stats = {"requests": 0, "retries": 0, RATE_LIMITED: 0, TRANSIENT: 0, "waited_s": 0.0}
+
+    def _wait_turn(self, tokens):
+        delay = self.requests.reserve(1)
+        if self.tokens and tokens:
+            delay = max(delay, self.tokens.reserve(tokens))
+        with self._lock:
+            delay = max(delay, self._cooldown_until - self.clock())
+        if delay > 0:
+            with self._lock:
+                self.stats["waited_s"] += delay
+            self.sleep(delay)
+
+    def call(self, func, *args, tokens=0, **kwargs):
+        """
+        func(*args, **kwargs) ko rate limit ke andar chalata hai; retryable errors par
+        backoff ke baad dobara try. Fatal error ya retries khatam hone par exception raise.
+        """
+        for attempt in range(self.max_retries + 1):
+            with self._slots:
+                self._wait_turn(tokens)
+                with self._lock:
+                    self.stats["requests"] += 1
+                started = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                    METRICS.observe(f"{self.name}.latency_s", time.perf_counter() - started)
+                    self.requests.speed_up()
+                    return result
+                except Exception as e:
+                    kind = classify_error(e)
+                    METRICS.incr(f"{self.name}.errors_{kind}")
+                    if kind == FATAL or attempt == self.max_retries:
+                        raise
+                    error = e
+
+            delay = backoff_delay(attempt, kind, self.backoff)
+            with self._lock:
+                self.stats["retries"] += 1
+                self.stats[kind] += 1
+                if kind == RATE_LIMITED:
+                    # Quota hit: sab workers ruk jaayen aur RPM aadha ho jaaye
+                    self._cooldown_until = max(self._cooldown_until, self.clock() + delay)
+            if kind == RATE_LIMITED:
+                self.requests.slow_down()
+                print(f"   ⚠️ Quota Hit! Waiting {delay:.1f}s before retry {attempt+1}/{self.max_retries}...")
+            else:
+                print(f"   ⚠️ Temporary error ({str(error)[:40]}). Retry {attempt+1}/{self.max_retries} in {delay:.1f}s...")
+            self.sleep(delay)
+
+    async def submit(self, func, *args, tokens=0, **kwargs):
+        """Async wrapper: blocking call ko worker thread me chalata hai."""
+        return await asyncio.to_thread(self.call, func, *args, tokens=tokens, **kwargs)
+
+    async def _gather(self, func, items):
+        return await asyncio.gather(*(asyncio.to_thread(func, item) for item in items),
+                                    return_exceptions=True)
+
+    def map(self, func, items, window=None):
+        """
+        func(item) ko har item par concurrently chalata hai aur results input order me
+        yield karta hai. `func` andar scheduler.call() use kare; concurrency wahi bound hoti hai.
+        Items `window` ke chunks me aate hain, isliye memory bounded rehti hai.
+        """
+        window = window or self.concurrency * 2
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= window:
+                yield from self._run_chunk(func, chunk)
+                chunk = []
+        if chunk:
+            yield from self._run_chunk(func, chunk)
+
+    def _run_chunk(self, func, chunk):
+        for result in asyncio.run(self._gather(func, chunk)):
+            if isinstance(result, BaseException):
+                raise result
+            yield result
+
+    def summary(self):
+        s = self.stats
+        return (f"📊 {self.name}: {s['requests']} requests, {s['retries']} retries "
+                f"({s[RATE_LIMITED]} quota, {s[TRANSIENT]} transient), waited {s['waited_s']:.1f}s, "
+                f"current RPM {self.requests.rate:.1f}")
+
+def scheduler_from_env(name="gemini"):
+    """Env vars se shared Gemini scheduler banata hai (defaults free tier ke hisaab se)."""
+    return Scheduler(
+        rpm=float(os.environ.get("GEMINI_RPM", 10)),
+        tpm=float(os.environ.get("GEMINI_TPM", 250000)),
+        concurrency=int(os.environ.get("GEMINI_CONCURRENCY", 2)),
+        max_retries=int(os.environ.get("GEMINI_MAX_RETRIES", 4)),
+        name=name,
+    )
@@ -0,0 +1,190 @@
+"""
+Pipeline stages ke beech records ka streaming format (JSON Lines).
+
+Har line ek JSON object hai, isliye stages poori file memory me load kiye bina
+ek-ek record padh aur likh sakte hain. Purani `[ {...}, {...} ]` array files
+bhi read_records() se padhi ja sakti hain (backward compatibility).
+"""
+import json
+import os
+
+CHUNK_SIZE = 64 * 1024
+
+def resolve_input(path):
+    """
+    Stage input ka asli path deta hai. Agar '2.jsonl' nahi hai to purani
+    '2.json' array file use hoti hai. Dono na hon to None.
+    """
+    if os.path.exists(path):
+        return path
+    legacy = os.path.splitext(path)[0] + ".json"
+    if os.path.exists(legacy):
+        return legacy
+    return None
+
+def _iter_json_array(f, buf):
+    """Legacy JSON array ko chunk by chunk decode karta hai, poora file load nahi hota."""
+    decoder = json.JSONDecoder()
+    pos = buf.index("[") + 1
+    eof = False
+
+    while True:
+        # Whitespace aur commas skip karo
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            chunk = f.read(CHUNK_SIZE)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+
+        if pos >= len(buf):
+            raise ValueError("Unterminated JSON array")
+        if buf[pos] == "]":
+            return
+
+        try:
+            record, end = decoder.raw_decode(buf, pos)
+            # Scalar (number/true/false/null) tabhi poora jab baad me `,` ya `]` dikhe:
+            # chunk `12.` par kata ho to bhi 12 decode hota hai, asal me `12.5` tha
+            after = end
+            while after < len(buf) and buf[after] in " \t\r\n":
+                after += 1
+            if buf[end - 1] in '}]"' or (after < len(buf) and buf[after] in ",]"):
+                yield record
+                pos = end
+                continue
+            if eof:
+                raise ValueError(f"Malformed JSON array value near: {buf[pos:after + 10]!r}")
+        except json.JSONDecodeError:
+            if eof:
+                raise
+
+        chunk = f.read(CHUNK_SIZE)
+        buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+
+def iter_records(f):
+    """Open text file (ya StringIO) se records ek-ek karke yield karta hai. Format auto-detect hota hai."""
+    buf = ""
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        buf += chunk
+        if buf.strip() or not chunk:
+            break
+
+    stripped = buf.lstrip()
+    if not stripped:
+        return
+
+    if stripped[0] == "[":
+        yield from _iter_json_array(f, stripped)
+        return
+
+    # JSON Lines: pehle chunk ka adhura last line agle chunk se judta hai
+    while True:
+        lines = buf.split("\n")
+        buf = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        buf += chunk
+    if buf.strip():
+        yield json.loads(buf)
+
+def read_records(path):
+    """File se records stream karta hai (JSON Lines ya legacy JSON array)."""
+    with open(path, "r", encoding="utf-8") as f:
+        yield from iter_records(f)
+
+class RecordWriter:
+    """
+    Records ko temp file me likhta hai aur close par atomically replace karta hai,
+    taaki beech me crash hone par purani file kharab na ho.
+
+    array=True par output purane `json.dump(data, f, indent=4)` jaisa JSON array
+    hota hai (PWA frontend wali files ke liye), warna JSON Lines.
+    """
+
+    def __init__(self, path, array=False):
+        self.path = path
+        self.array = array
+        self.count = 0
+        self._tmp_path = path + ".tmp"
+        self._f = open(self._tmp_path, "w", encoding="utf-8")
+
+    def write(self, record):
+        if self.array:
+            text = json.dumps(record, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+            self._f.write(("[\n    " if self.count == 0 else ",\n    ") + text)
+        else:
+            self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        if self.array:
+            self._f.write("\n]" if self.count else "[]")
+        self._f.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """Kuch save nahi karna; purani file jaisi thi waisi rahegi."""
+        self._f.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._f.closed:
+            return
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def write_records(path, records, array=False):
+    """Iterable/generator ke saare records likhta hai aur count return karta hai."""
+    with RecordWriter(path, array=array) as out:
+        for record in records:
+            out.write(record)
+    return out.count
+
+def append_json_array(path, records):
+    """
+    JSON array file (RecordWriter array / `json.dump(indent=4)` format) ke end me records
+    jodta hai, file dobara likhe bina: closing `]` ki jagah naye records + `]`. Isliye
+    kaam (aur git diff) sirf naye records jitna. File na ho to nayi banti hai. Return: count.
+    """
+    records = list(records)
+    if not records:
+        return 0
+    if not os.path.exists(path):
+        return write_records(path, records, array=True)
+
+    texts = [json.dumps(record, indent=4, ensure_ascii=False).replace("\n", "\n    ") for record in records]
+    with open(path, "r+b") as f:
+        tail_start = max(0, f.seek(0, os.SEEK_END) - CHUNK_SIZE)
+        f.seek(tail_start)
+        tail = f.read().rstrip()
+        if not tail.endswith(b"]"):
+            raise ValueError(f"'{path}' JSON array par khatam nahi hota")
+        body = tail[:-1].rstrip()
+        f.seek(tail_start + len(body))
+        f.truncate()
+        separator = "\n    " if body.endswith(b"[") else ",\n    "
+        f.write((separator + ",\n    ".join(texts) + "\n]").encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    return len(records)
+
+def append_records(path, records):
+    """JSON Lines file ke end me records jodta hai (history logs ke liye)."""
+    count = 0
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
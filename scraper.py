@@ -1,41 +1,24 @@
 import json
 import os
+import argparse
 import datetime
 import time
+import sys
+import threading
+import multiprocessing
+import requests
 import trafilatura
 import feedparser
-import re # Naya import exact word match ke liye
-
-EXAM_KEYWORDS = [
-    # 🏦 Banking, Finance & Economy
-    "Quarterly Result", "Fiscal Deficit", "Direct Tax", "GST", "Forex Reserves", 
-    "World Bank", "IMF", "RBI", "SEBI", "Repo Rate", "Inflation", "UPI", "NPCI",
-    "Fund", "Allocated", "Budget", "Penalty", "Fined", "Acquires", "Merger", 
-    "Stake", "Dividend", "Economy", "GDP Growth",
-    
-    # 🏅 Ranks, Reports & Indices
-    "Ranked", "Index", "Rank", "Report", "Position", "Topped",
-    
-    # 👔 Appointments, Resignations & Obituaries
-    "Appointed as", "Takes charge as", "Selected as", "Elected", "Takes over", 
-    "Resigns", "Steps down", "Passes away",
-    
-    # 🤝 Agreements & Partnerships
-    "MoU", "Bilateral Agreement", "Signs", "Pact", "Agrees", "Partnered", 
-    "Collaborates", "Deal",
-    
-    # 🚀 Defence, Space & Science
-    "DRDO", "ISRO", "Military Exercise", "Naval Exercise", "Air Force", "Missile", 
-    "Spacecraft", "Satellite", "Defence Ministry", "Inducted", "Commissioned",
-    
-    # 🏛️ National, Schemes & Judiciary
-    "Yojana", "Scheme", "Cabinet Approval", "Supreme Court", "Election Commission", 
-    "Launched", "Unveiled", "Inaugurated", "Approved", "Sanctioned", "Portal", "Initiative",
-    
-    # 🏆 Awards & Sports
-    "Nobel Prize", "Sahitya Akademi", "Awarded", "Honoured", "Host", "Venue", 
-    "Medal", "Tournament", "Championship", "Cup", "Trophy", "Grand Slam", "Olympics"
-]
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import http_client
+from html_store import store_from_env
+from keywords import MATCHER
+from metrics import METRICS
+from records import RecordWriter, append_records
+from url_history import open_history
 
 RSS_FEEDS = [
     # 🏦 Pure Economy & Business (Most Important for Banking)
@@ -64,91 +47,379 @@ RSS_FEEDS = [
     "https://www.ndtv.com/rss/india-news" # NDTV Top Stories
 ]
 
-HISTORY_FILE = "scraped_urls.json"
+FEED_CACHE_FILE = "feed_cache.json"  # Har feed ka ETag / Last-Modified yahan save hota hai
+OUTPUT_FILE = "1.jsonl"       # Agle stage (cut.py) ka input, JSON Lines format
+ALL_ARTICLES_LOG = "all.txt"  # Har scraped article ki permanent history (JSON Lines)
+
+# --- FETCH ENGINE SETTINGS ---
+MAX_WORKERS = 16      # Total parallel downloads (feeds + articles)
+PER_HOST_LIMIT = 2    # Ek domain par ek saath kitne requests chal sakte hain
+HOST_DELAY = 0.5      # Same domain ke do requests ke beech ka gap (seconds)
+
+# --- EXTRACTION SETTINGS ---
+# trafilatura.extract CPU-heavy hai; GIL ki wajah se threads me serial chalta tha.
+# Ab downloads threads me aur extraction alag processes (har core ek) me hota hai.
+EXTRACT_PROCESSES = os.cpu_count() or 1
+PROCESS_POOL_MIN_ARTICLES = 20        # Isse kam articles par process start karna mehenga, inline extract
+MAX_HTML_BYTES = 5 * 1024 * 1024      # Isse badi page (galeries, PDFs) download hote hi skip
+SKIP_NON_HTML = True                  # Content-Type text/html nahi (PDF, image, video) to skip
+
+# Downloaded HTML ka snapshot (HTML_STORE=1), taaki `--reextract` bina network ke chale
+HTML_STORE = store_from_env()
+
+class HostThrottle:
+    """
+    Har domain ke liye alag concurrency limit aur politeness delay.
+    Pehle global sleep(0.5) tha, ab sirf same host wale requests hi wait karte hain.
+    """
+    def __init__(self, per_host=PER_HOST_LIMIT, delay=HOST_DELAY):
+        self.per_host = per_host
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    @contextmanager
+    def slot(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            sem = self._slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        with sem:
+            # Har host ke request start times ko 'delay' ke gap par reserve karo
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.delay
+            if start > now:
+                METRICS.observe("throttle.wait_s", start - now)
+                time.sleep(start - now)
+            yield
+
+THROTTLE = HostThrottle()
 
 def load_history():
     """Pehle se scrape kiye gaye URLs ko load karta hai taki duplicates na aayen."""
-    if os.path.exists(HISTORY_FILE):
-        with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-            return set(json.load(f))
-    return set()
-
-def save_history(history_set):
-    """Scrape ho chuke URLs ko save karta hai."""
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(list(history_set), f, indent=4)
-
-def fetch_clean_article(url):
-    """Trafilatura ka use karke sirf pure news text nikalta hai."""
+    return open_history()
+
+def save_history(history):
+    """Scrape ho chuke URLs ko save karta hai (sirf naye entries, dekho url_history.py)."""
+    history.save()
+
+def load_feed_cache():
+    """Pichle run ke ETag / Last-Modified headers load karta hai (feed URL -> validators)."""
+    if os.path.exists(FEED_CACHE_FILE):
+        with open(FEED_CACHE_FILE, "r", encoding="utf-8") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return {}
+    return {}
+
+def save_feed_cache(cache):
+    """Feed validators ko disk par save karta hai taaki agla run conditional request bheje."""
+    with open(FEED_CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=4, sort_keys=True)
+
+def fetch_feed(feed_url, validators=None):
+    """
+    Ek RSS feed ko shared HTTP session (keep-alive pool) se host throttle ke saath
+    download karta hai aur raw bytes feedparser ko deta hai.
+    Agar pichla ETag / Last-Modified pata hai to conditional request jaati hai;
+    server 304 bhejta hai to parsing skip (entries khali).
+    """
+    validators = validators or {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("modified"):
+        headers["If-Modified-Since"] = validators["modified"]
+
     try:
-        time.sleep(0.5)
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded:
-            text = trafilatura.extract(downloaded, include_comments=False, include_tables=False)
-            return text if text else ""
-        return ""
+        with THROTTLE.slot(feed_url), METRICS.timer("feed.fetch_s", label=feed_url):
+            response = http_client.get(feed_url, headers=headers)
+    except requests.RequestException as e:
+        print(f"⚠️ Feed download error: {feed_url} | Issue: {e}")
+        return feedparser.FeedParserDict(status=None, entries=[])
+
+    if response.status_code == 304 or response.status_code >= 400:
+        return feedparser.FeedParserDict(status=response.status_code, entries=[])
+
+    # Encoding feedparser khud XML declaration / Content-Type se detect karta hai
+    content_type = response.headers.get("Content-Type")
+    feed = feedparser.parse(response.content,
+                            response_headers={"content-type": content_type} if content_type else None)
+    feed["status"] = response.status_code
+    feed["etag"] = response.headers.get("ETag")
+    feed["modified"] = response.headers.get("Last-Modified")
+    return feed
+
+def download_article(url):
+    """
+    Article page ke raw bytes (shared pooled session, host throttle ke saath).
+    Non-HTML ya MAX_HTML_BYTES se badi response par None: body poori download hi nahi hoti.
+    """
+    with THROTTLE.slot(url), METRICS.timer("article.download_s"):
+        response = http_client.get(url, stream=True)
+        with response:
+            response.raise_for_status()
+
+            content_type = response.headers.get("Content-Type", "").lower()
+            if SKIP_NON_HTML and content_type and "html" not in content_type:
+                METRICS.incr("article.skipped_non_html")
+                print(f"⏭️ Skipped (not HTML: {content_type.split(';')[0]}): {url}")
+                return None
+
+            declared = response.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > MAX_HTML_BYTES:
+                METRICS.incr("article.skipped_too_large")
+                print(f"⏭️ Skipped (too large: {int(declared) // 1024} KB): {url}")
+                return None
+
+            body = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                body.extend(chunk)
+                if len(body) > MAX_HTML_BYTES:
+                    METRICS.incr("article.skipped_too_large")
+                    print(f"⏭️ Skipped (too large: >{MAX_HTML_BYTES // 1024} KB): {url}")
+                    return None
+            return bytes(body)
+
+def safe_download(url, failed=None):
+    """
+    download_article, par error par None (ek kharab link poore run ko na roke).
+    `failed` set diya ho to error wale URLs usme jaate hain (skip kiye non-HTML nahi).
+    """
+    try:
+        downloaded = download_article(url)
     except Exception as e:
+        METRICS.incr("article.errors")
         print(f"⚠️ Error fetching: {url} | Issue: {e}")
+        if failed is not None:
+            failed.add(url)
+        return None
+    if downloaded and HTML_STORE:
+        HTML_STORE.put(url, downloaded)
+    return downloaded
+
+def extract_article(downloaded):
+    """
+    Raw HTML se sirf pure news text (process pool worker me bhi chalta hai, isliye top-level).
+    Return: (text, seconds) taaki timing parent process ke METRICS me jaaye.
+    """
+    started = time.perf_counter()
+    text = trafilatura.extract(downloaded, include_comments=False, include_tables=False)
+    return text or "", time.perf_counter() - started
+
+def fetch_clean_article(url, download=None):
+    """Trafilatura ka use karke sirf pure news text nikalta hai (ek URL, inline)."""
+    downloaded = (download or safe_download)(url)
+    if not downloaded:
+        return ""
+    try:
+        text, seconds = extract_article(downloaded)
+    except Exception as e:
+        METRICS.incr("article.errors")
+        print(f"⚠️ Error extracting: {url} | Issue: {e}")
         return ""
+    METRICS.observe("article.extract_s", seconds)
+    return text
+
+def fetch_clean_articles(urls, download_pool, download=None):
+    """
+    Generator: downloads `download_pool` threads me concurrently, aur har download
+    hote hi uska extraction process pool me submit. Text input order me hi yield hota hai.
+    `download(url)` -> bytes/None (default: network se safe_download).
+    """
+    download = download or safe_download
+    if EXTRACT_PROCESSES < 2 or len(urls) < PROCESS_POOL_MIN_ARTICLES:
+        yield from download_pool.map(lambda url: fetch_clean_article(url, download), urls)
+        return
+
+    # 'spawn': download threads chal rahe hote hain, unke saath fork karna safe nahi
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=EXTRACT_PROCESSES, mp_context=context) as extractors:
+        pending = deque()
+
+        def finished(url, future):
+            if future is None:
+                return ""
+            try:
+                text, seconds = future.result()
+            except Exception as e:
+                METRICS.incr("article.errors")
+                print(f"⚠️ Error extracting: {url} | Issue: {e}")
+                return ""
+            METRICS.observe("article.extract_s", seconds)
+            return text
+
+        for url, downloaded in zip(urls, download_pool.map(download, urls)):
+            pending.append((url, extractors.submit(extract_article, downloaded) if downloaded else None))
+            # Jo aage ke results ready hain unhe turant stream karo
+            while pending and (pending[0][1] is None or pending[0][1].done()):
+                yield finished(*pending.popleft())
+
+        while pending:
+            yield finished(*pending.popleft())
 
 def is_exam_relevant(title):
     """
-    Regex ka use karke exact word boundaries (\b) match karta hai.
+    Exact word boundaries (\b) ke saath keyword match karta hai.
     Isse 'MoU', 'famous' me match nahi hoga.
+    Saare keywords ek precompiled pattern me hain (dekho keywords.KeywordMatcher).
     """
-    for keyword in EXAM_KEYWORDS:
-        # \b ensures that we match the exact whole word or phrase
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        if re.search(pattern, title, re.IGNORECASE):
-            return True
-    return False
+    return MATCHER.is_relevant(title)
 
-def run_scraper():
+def run_scraper(output_file=OUTPUT_FILE):
+    """Feeds scan karke naye articles `output_file` me likhta hai. Return: kitne naye articles."""
     scraped_history = load_history()
-    new_articles = []
+    feed_cache = load_feed_cache()
+    cache_stats = {"hit": 0, "miss": 0, "error": 0}
     today_date = datetime.date.today().strftime("%Y-%m-%d")
 
     print("🚀 Scraper Started: Fetching premium exam-oriented news...\n")
 
-    for feed_url in RSS_FEEDS:
-        print(f"📡 Scanning Feed: {feed_url}")
-        feed = feedparser.parse(feed_url)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        # 1. Saare feeds parallel me download honge, par map() order same rakhta hai
+        feeds = pool.map(fetch_feed, RSS_FEEDS, [feed_cache.get(url) for url in RSS_FEEDS])
+
+        candidates = []
+        queued_links = set()
+        # Naye ETag/Last-Modified tabhi save jab feed ke saare candidates download ho jaayein,
+        # warna agla run 304 pa kar failed links kabhi dobara nahi dekhta
+        new_validators, feed_links = {}, {}
+        for feed_url, feed in zip(RSS_FEEDS, feeds):
+            status = feed.get("status")
 
-        for entry in feed.entries:
-            title = entry.get("title", "").strip()
-            link = entry.get("link", "").strip()
+            # 304 = feed pichle run se badli nahi, parsing ki zaroorat hi nahi
+            if status == 304:
+                cache_stats["hit"] += 1
+                print(f"💤 Not Modified (cache hit): {feed_url}")
+                continue
 
-            if link in scraped_history:
+            if status is None or status >= 400:
+                cache_stats["error"] += 1
+                print(f"⚠️ Feed failed (status {status}): {feed_url}")
                 continue
 
-            # Naya updated strict checking logic yahan apply kiya hai
-            if is_exam_relevant(title):
-                clean_content = fetch_clean_article(link)
+            cache_stats["miss"] += 1
+            new_validators[feed_url] = ({"etag": feed.get("etag"), "modified": feed.get("modified")}
+                                        if feed.get("etag") or feed.get("modified") else None)
+            links = feed_links[feed_url] = []
+
+            print(f"📡 Scanned Feed: {feed_url} ({len(feed.entries)} entries)")
+
+            for entry in feed.entries:
+                title = entry.get("title", "").strip()
+                link = entry.get("link", "").strip()
+
+                if link in scraped_history or link in queued_links:
+                    continue
 
+                # Naya updated strict checking logic yahan apply kiya hai
+                METRICS.incr("feed.entries_checked")
+                if is_exam_relevant(title):
+                    queued_links.add(link)
+                    candidates.append((title, link))
+                    links.append(link)
+
+        for kind, n in cache_stats.items():
+            METRICS.incr(f"feed.cache_{kind}", n)
+        print(f"\n📊 Feed Cache: {cache_stats['hit']} hit (304), {cache_stats['miss']} miss, {cache_stats['error']} error")
+        print(f"🔎 {len(candidates)} relevant links mile. Parallel fetching shuru...\n")
+        if HTML_STORE:
+            HTML_STORE.save_manifest(today_date, [{"title": t, "link": l, "date": today_date} for t, l in candidates])
+
+        # 2. Downloads threads me, extraction process pool me; results feed order me hi aayenge
+        failed_links = set()
+        contents = fetch_clean_articles([link for _, link in candidates], pool,
+                                        lambda url: safe_download(url, failed_links))
+
+        # Articles aate hi disk par stream hote hain, memory me list nahi banti
+        with RecordWriter(output_file) as out:
+            for (title, link), clean_content in zip(candidates, contents):
                 if clean_content and len(clean_content) > 200:
-                    new_articles.append({
+                    article = {
                         "title": title,
                         "content": clean_content,
                         "link": link,
                         "date": today_date,
-                    })
+                    }
+                    out.write(article)
+                    append_records(ALL_ARTICLES_LOG, [article])
                     scraped_history.add(link)
                     print(f"✅ Saved: {title[:60]}...")
 
-    if new_articles:
-        with open("1.json", "w", encoding="utf-8") as f:
-            json.dump(new_articles, f, indent=4, ensure_ascii=False)
-        print(f"✅ {len(new_articles)} naye articles '1.json' me overwrite ho gaye hain.")
+            # Kuch naya nahi mila to purana output jaisa hai waisa rehne do
+            if not out.count:
+                out.abort()
 
-        with open("all.txt", "a", encoding="utf-8") as f:
-            for article in new_articles:
-                f.write(json.dumps(article, ensure_ascii=False) + "\n")
-        print(f"✅ Sabhi naye articles 'all.txt' me history ke roop me add ho gaye hain.")
+    METRICS.incr("article.candidates", len(candidates))
+    METRICS.incr("article.saved", out.count)
+    for feed_url, validators in new_validators.items():
+        if any(link in failed_links for link in feed_links[feed_url]):
+            # Purane validators rehne do: agla run poori feed dobara laayega aur failed links retry honge
+            METRICS.incr("feed.cache_held")
+            print(f"↩️ Feed cache not advanced (downloads failed): {feed_url}")
+        elif validators:
+            feed_cache[feed_url] = validators
+        else:
+            feed_cache.pop(feed_url, None)
+    save_feed_cache(feed_cache)
+    if HTML_STORE:
+        HTML_STORE.evict()
+        print(HTML_STORE.summary())
+
+    if out.count:
+        print(f"✅ {out.count} naye articles '{output_file}' me overwrite ho gaye hain.")
+        print(f"✅ Sabhi naye articles '{ALL_ARTICLES_LOG}' me history ke roop me add ho gaye hain.")
 
         save_history(scraped_history)
         print("\n🎉 Success! Scraper ka kaam complete ho gaya.")
     else:
         print("\n🤷‍♂️ Koi nayi relevant news nahi mili. Sab up-to-date hai!")
 
+    return out.count
+
+def reextract(output_file=OUTPUT_FILE, day=None):
+    """
+    Stored HTML se `output_file` dobara banata hai (zero network I/O): naye KILL_PHRASES /
+    trafilatura options ko same articles par test karne ke liye. History, all.txt aur
+    feed cache ko touch nahi karta. Return: articles count (error par None).
+    """
+    store = HTML_STORE or store_from_env(force=True)
+    day, manifest = store.load_manifest(day)
+    if not manifest:
+        print(f"❌ '{store.runs_dir}' me koi run manifest nahi mila. Pehle HTML_STORE=1 ke saath scraper chalao.")
+        return None
+
+    print(f"♻️ Re-extracting {len(manifest)} articles of {day} from '{store.directory}' (no network)...\n")
+    links = [item["link"] for item in manifest]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        contents = fetch_clean_articles(links, pool, download=store.get)
+        with RecordWriter(output_file) as out:
+            for item, clean_content in zip(manifest, contents):
+                if clean_content and len(clean_content) > 200:
+                    out.write({
+                        "title": item["title"],
+                        "content": clean_content,
+                        "link": item["link"],
+                        "date": item["date"],
+                    })
+
+    print(store.summary())
+    print(f"✅ {out.count} articles '{output_file}' me re-extract ho gaye "
+          f"({store.stats['misses']} snapshots missing/evicted).")
+    return out.count
+
 if __name__ == "__main__":
-    run_scraper()
+    parser = argparse.ArgumentParser(description="Exam news scraper")
+    parser.add_argument("--reextract", action="store_true",
+                        help="Network ke bina stored HTML se output dobara banao")
+    parser.add_argument("--date", help="--reextract ke liye run date (YYYY-MM-DD), default latest")
+    args = parser.parse_args()
+
+    if args.reextract:
+        if reextract(day=args.date) is None:
+            sys.exit(1)
+    else:
+        run_scraper()
@@ -0,0 +1,600 @@
+"""
+Incremental inverted index (BM25) over archived news aur quiz questions.
+
+    from search_index import SearchIndex
+    index = SearchIndex()
+    index.add_news(records)            # cut3.clean_and_store har run me
+    index.add_quiz(questions, date)    # gen_pro_quiz.save_quiz har run me
+    index.search("RBI repo rate", since="2026-03-01", kind="news")
+
+Disk layout (`search_index/`):
+    docs.jsonl        # har document ki ek line: [kind, key, date, length, title]; line number = doc id
+    docs.bin          # docs.jsonl ki fixed-size table (key hash, kind, day, length, line offset)
+    seg-000001.bin    # ek add() batch ke posting lists (immutable segment)
+
+docs.bin derived hai: open par sirf ye padhi jaati hai (JSON parse nahi), title/key result
+ke waqt line offset se. Crash par docs.jsonl ki jo lines table me nahi, wo open par judti hain.
+
+Segment file: b"SIX3" + u32 header length + JSON header (term -> [byte offset, count,
+doc typecode, tf typecode], doc id range, likhte waqt ka avgdl) + postings. Har term ki
+list chaar arrays hai, sabse chhote fitting typecode (B/H/I) me, 4-byte aligned:
+    doc ids (segment ke first doc se relative, badhte order me) + unke tfs
+    wahi postings "impact" order me (ghatte) + unke tfs
+Impact = tf / (tf + norm) likhte waqt ke avgdl se, yaani idf ke bina BM25 contribution.
+Arrays mmap par memoryview se seedhe padhe jaate hain (copy/decode nahi).
+
+Merging tiered hai: MAX_SEGMENTS se zyada hone par sirf naye chhote segments (aur
+unse chhote/barabar purane) merge hote hain, bade purane segments dobara nahi likhe jaate.
+
+Search exact BM25 hai, threshold algorithm se: har (term, segment) list impact order me
+BLOCK docs ke blocks me padhi jaati hai (sabse bade bound wali list pehle); naye doc ka
+baaki terms ka tf doc-order array par binary search se. List ke agle doc ka impact us
+list ke baaki docs ka upper bound hai (avgdl badhne par us ratio se dheela), isliye jab
+har segment ke bounds ka jod current k-th score se kam ho, koi ankha doc top-k me nahi
+aa sakta aur search ruk jaata hai.
+
+Index derived data hai (archive store + quiz bank se `rebuild`), isliye git me commit
+nahi hota; workflows Actions cache me rakhte hain.
+
+CLI:
+    python search_index.py search "RBI repo rate" [--since 2026-03-01] [--kind news] [--limit 10]
+    python search_index.py rebuild      # archive + quiz bank se poora index dobara
+    python search_index.py stats
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from archive_store import ArchiveStore, day_number
+
+INDEX_DIR = "search_index"
+MAX_SEGMENTS = 8
+MAGIC = b"SIX3"
+MERGE_WIDTH = 4   # Merge me kam se kam itne naye segments
+BLOCK = 32        # Search ek baar me list ke itne postings padhta hai
+HEADER = struct.Struct("<4sI")
+DOC = struct.Struct("<QBIIQ")  # key hash, kind index, day, length, docs.jsonl offset
+K1 = 1.2
+B = 0.75
+
+KINDS = ("news", "quiz")
+ITEMSIZE = {code: array(code).itemsize for code in "BHI"}
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = set("""
+a an and are as at be been by for from has have in into is it its of on or that the this
+to was were will with which who what when where why how than then there their they he she
+said also after over about more new not but all its one two
+""".split())
+
+def tokenize(text):
+    """Lowercase words, stopwords ke bina ("India's" -> "india", "s" alag token ban ke hat jaata hai)."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS and token != "s"]
+
+def question_key(question):
+    return hashlib.sha1(" ".join(tokenize(question)).encode("utf-8")).hexdigest()[:16]
+
+def typecode_for(largest):
+    for code in ("B", "H", "I"):
+        if largest < 1 << (8 * array(code).itemsize):
+            return code
+    raise ValueError(f"Posting value too large: {largest}")
+
+def to_bytes(values):
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def doc_hash(kind, key):
+    return int.from_bytes(hashlib.blake2b(f"{kind}\n{key}".encode("utf-8"), digest_size=8).digest(), "little")
+
+def padded(blob, size=4):
+    return blob + b"\0" * (-len(blob) % size)
+
+class Segment:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, header_len = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Not a search index segment (or old format): {path}")
+            header = json.loads(f.read(header_len))
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.terms = header["terms"]
+        self.first_doc, self.last_doc = header["docs"]
+        self.avgdl = header["avgdl"]
+        self.base = HEADER.size + header_len
+        self._view = memoryview(self._map)
+
+    @property
+    def doc_count(self):
+        return self.last_doc - self.first_doc + 1
+
+    def _values(self, code, start, count):
+        end = start + count * ITEMSIZE[code]
+        if sys.byteorder == "little":
+            return self._view[start:end].cast(code)
+        values = array(code, self._map[start:end])
+        values.byteswap()
+        return values
+
+    def lists(self, term):
+        """
+        (doc ids, tfs, impact-order doc ids, impact-order tfs) ya None. Doc ids
+        `first_doc` se relative; arrays mmap ke views hain, copy nahi.
+        """
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        offset, count, doc_code, tf_code = entry
+        start = self.base + offset
+        doc_bytes = count * ITEMSIZE[doc_code]
+        tf_start = start + 2 * doc_bytes
+        return (self._values(doc_code, start, count), self._values(tf_code, tf_start, count),
+                self._values(doc_code, start + doc_bytes, count),
+                self._values(tf_code, tf_start + count * ITEMSIZE[tf_code], count))
+
+    def close(self):
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # Kisi search ka view abhi zinda hai; GC mmap band karega
+
+def write_segment(path, postings, first_doc, last_doc, norms, avgdl):
+    """
+    postings: term -> (doc ids, tfs), doc ids badhte order me. `norms[doc]`: BM25 length
+    norm (`avgdl` ke saath), impact order ke liye.
+    """
+    doc_code = typecode_for(last_doc - first_doc)
+    terms, chunks, offset = {}, [], 0
+    for term in sorted(postings):
+        docs, tfs = postings[term]
+        tf_code = typecode_for(max(tfs))
+        order = sorted(range(len(docs)), key=lambda i: tfs[i] / (tfs[i] + norms[docs[i]]), reverse=True)
+        relative = [doc - first_doc for doc in docs]
+        blob = padded(to_bytes(array(doc_code, relative)) +
+                      to_bytes(array(doc_code, [relative[i] for i in order])) +
+                      to_bytes(array(tf_code, tfs)) +
+                      to_bytes(array(tf_code, [tfs[i] for i in order])))
+        terms[term] = [offset, len(docs), doc_code, tf_code]
+        chunks.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({"terms": terms, "docs": [first_doc, last_doc], "avgdl": avgdl},
+                        ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(HEADER.size + len(header)) % 4)   # Postings 4-byte aligned (memoryview cast)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(b"".join(chunks))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class SearchIndex:
+    def __init__(self, directory=INDEX_DIR):
+        self.directory = directory
+        self.docs_path = os.path.join(directory, "docs.jsonl")
+        self.table_path = os.path.join(directory, "docs.bin")
+        self._reader = None
+        os.makedirs(directory, exist_ok=True)
+        self._load_docs()
+        self._load_segments()
+
+    # --- loading ---
+
+    def _load_docs(self):
+        """docs.bin padho, aur docs.jsonl ki jo lines usme nahi (crash / pehli baar) wo jodo."""
+        rows, table_size = [], 0
+        if os.path.exists(self.table_path):
+            with open(self.table_path, "rb") as f:
+                data = f.read()
+            table_size = len(data)
+            if os.path.exists(self.docs_path):
+                rows = list(DOC.iter_unpack(data[:len(data) - len(data) % DOC.size]))
+
+        end, added = 0, []
+        if os.path.exists(self.docs_path):
+            with open(self.docs_path, "rb") as f:
+                if rows:
+                    f.seek(rows[-1][4])
+                    line = f.readline()
+                    if line.endswith(b"\n"):
+                        end = rows[-1][4] + len(line)
+                    else:
+                        rows = []   # Table docs.jsonl se aage: shuru se dobara
+                f.seek(end)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Adhuri line (crash) -> truncate
+                    added.append(self._row(json.loads(line), end))
+                    end += len(line)
+            if end < os.path.getsize(self.docs_path):
+                with open(self.docs_path, "r+b") as f:
+                    f.truncate(end)
+
+        if rows and table_size == len(rows) * DOC.size:
+            self._write_table(added)
+        elif rows or added or table_size:
+            self._write_table(rows + added, append=False)
+        rows.extend(added)
+
+        hashes, kinds, days, lengths, offsets = zip(*rows) if rows else ((),) * 5
+        self.keys = set(hashes)
+        self.kinds = bytearray(kinds)
+        self.days = array("I", days)
+        self.lengths = array("I", lengths)
+        self.offsets = array("Q", offsets)
+        self._refresh_norms()
+
+    @staticmethod
+    def _row(doc, offset):
+        kind, key, date, length = doc[:4]
+        return doc_hash(kind, key), KINDS.index(kind), day_number(date), length, offset
+
+    def _write_table(self, rows, append=True):
+        if append and not rows:
+            return
+        with open(self.table_path, "ab" if append else "wb") as f:
+            f.write(b"".join(DOC.pack(*row) for row in rows))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load_segments(self):
+        self.segments = []
+        for name in sorted(os.listdir(self.directory)):
+            if not (name.startswith("seg-") and name.endswith(".bin")):
+                continue
+            try:
+                segment = Segment(os.path.join(self.directory, name))
+            except ValueError as e:
+                # Purana format: index derived data hai, mita ke dobara bharo (cut3 / gen_pro_quiz backfill)
+                print(f"⚠️ {e}. Search index reset ho raha hai.")
+                self.reset()
+                return
+            if segment.last_doc >= len(self):
+                # Segment likha gaya par docs nahi (crash): uske docs dobara add honge
+                segment.close()
+                os.remove(segment.path)
+                continue
+            self.segments.append(segment)
+
+    def reset(self):
+        self.close()
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        self.segments = []
+        self._load_docs()
+
+    def _refresh_norms(self):
+        """BM25 length normalisation har doc ke liye pehle se (query me sirf lookup)."""
+        self.avgdl = (sum(self.lengths) / len(self.lengths) if self.lengths else 0) or 1.0
+        self.norms = [K1 * (1 - B + B * length / self.avgdl) for length in self.lengths]
+        self._masks = {}   # (kind, since, until) -> bytearray, docs badalne par purane
+
+    def _filter_mask(self, kind, since, until):
+        """Filter pass karne wale docs ka bytearray (1/0), har filter ke liye ek baar banta hai."""
+        key = (kind, since, until)
+        mask = self._masks.get(key)
+        if mask is None:
+            if len(self._masks) >= 32:
+                self._masks.clear()
+            wanted = KINDS.index(kind) if kind else None
+            first = day_number(since) if since else 0
+            last = day_number(until) if until else 0
+            mask = self._masks[key] = bytearray(
+                (wanted is None or k == wanted) and day >= first and (not last or day <= last)
+                for k, day in zip(self.kinds, self.days))
+        return mask
+
+    def _doc(self, doc_id):
+        """[kind, key, date, length, title] docs.jsonl se."""
+        if self._reader is None:
+            self._reader = open(self.docs_path, "rb")
+        self._reader.seek(self.offsets[doc_id])
+        return json.loads(self._reader.readline())
+
+    # --- writes ---
+
+    def add(self, items):
+        """
+        items: (kind, key, date, title, text) tuples. Jo (kind, key) pehle se index me hai
+        wo skip. Ek naya segment banta hai. Return: kitne docs jude.
+        """
+        postings, new_docs = {}, []
+        next_id = len(self)
+        for kind, key, date, title, text in items:
+            if kind not in KINDS:
+                raise ValueError(f"Unknown document kind: {kind}")
+            if not key or doc_hash(kind, key) in self.keys:
+                continue
+            tokens = tokenize(f"{title}\n{text}")
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            doc_id = next_id + len(new_docs)
+            for token, tf in counts.items():
+                entry = postings.get(token)
+                if entry is None:
+                    entry = postings[token] = ([], [])
+                entry[0].append(doc_id)
+                entry[1].append(tf)
+            new_docs.append([kind, key, date or "", len(tokens), title[:200]])
+            self.keys.add(doc_hash(kind, key))
+
+        if not new_docs:
+            return 0
+
+        # Pehle segment (atomic rename), phir docs: crash par orphan segment open par hat jaata hai
+        seq = int(self.segments[-1].path[-10:-4]) + 1 if self.segments else 1
+        path = os.path.join(self.directory, f"seg-{seq:06d}.bin")
+        # Naye docs samet avgdl se norms (segment ke impact order ke liye)
+        total = sum(self.lengths) + sum(doc[3] for doc in new_docs)
+        avgdl = total / (len(self) + len(new_docs)) or 1.0
+        norms = {next_id + i: K1 * (1 - B + B * doc[3] / avgdl) for i, doc in enumerate(new_docs)}
+        write_segment(path, postings, next_id, next_id + len(new_docs) - 1, norms, avgdl)
+
+        lines, rows = [], []
+        offset = os.path.getsize(self.docs_path) if os.path.exists(self.docs_path) else 0
+        for doc in new_docs:
+            line = (json.dumps(doc, ensure_ascii=False) + "\n").encode("utf-8")
+            rows.append(self._row(doc, offset))
+            lines.append(line)
+            offset += len(line)
+        with open(self.docs_path, "ab") as f:
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self._write_table(rows)
+
+        for row in rows:
+            self.kinds.append(row[1])
+            self.days.append(row[2])
+            self.lengths.append(row[3])
+            self.offsets.append(row[4])
+        self._refresh_norms()
+        self.segments.append(Segment(path))
+        if len(self.segments) > MAX_SEGMENTS:
+            self.merge()
+        return len(new_docs)
+
+    def add_news(self, records):
+        return self.add(("news", r.get("link"), r.get("date"), r.get("title", ""), r.get("content", ""))
+                        for r in records)
+
+    def add_quiz(self, questions, date=None):
+        """quiz.json questions (`date` ke saath) ya quiz bank items (apna "day")."""
+        return self.add(("quiz", question_key(q.get("q", "")), q.get("day") or date, q.get("q", ""),
+                         f"{q.get('a', '')} {q.get('cat', '')}")
+                        for q in questions if isinstance(q, dict) and q.get("q"))
+
+    def merge(self, full=False):
+        """
+        Tiered merge: naye MERGE_WIDTH segments, aur unse pehle wale tab tak jab tak wo in
+        sab ke total se bade na hon (`full` par saare). Doc ids contiguous hain, isliye
+        sirf aakhri (naye) segments ki range merge hoti hai.
+        """
+        if len(self.segments) < 2:
+            return
+        start = 0 if full else max(0, len(self.segments) - MERGE_WIDTH)
+        while start > 0 and self.segments[start - 1].doc_count <= sum(s.doc_count for s in self.segments[start:]):
+            start -= 1
+        group = self.segments[start:]
+        if len(group) < 2:
+            return
+
+        merged = {}
+        for segment in group:
+            first = segment.first_doc
+            for term in segment.terms:
+                docs, tfs, _, _ = segment.lists(term)
+                entry = merged.get(term)
+                if entry is None:
+                    entry = merged[term] = ([], [])
+                entry[0].extend(first + doc for doc in docs)
+                entry[1].extend(tfs)
+        docs = tfs = None   # mmap views chhodo, taaki segments band ho sakein
+
+        last = group[-1]
+        path = last.path  # Sabse naye segment ka naam, taaki sequence aage badhta rahe
+        for segment in group:
+            segment.close()
+        write_segment(path, merged, group[0].first_doc, last.last_doc, self.norms, self.avgdl)
+        for segment in group[:-1]:
+            os.remove(segment.path)
+        self.segments = self.segments[:start] + [Segment(path)]
+
+    # --- reads ---
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __contains__(self, kind_key):
+        return doc_hash(*kind_key) in self.keys
+
+    def count(self, kind):
+        return self.kinds.count(KINDS.index(kind))
+
+    def _cursors(self, terms):
+        """
+        Impact-order cursors [segment no, term no, weight, bound scale, segment, docs, tfs,
+        position, head bound] aur har segment ke liye random access lists
+        [term no, weight, docs, tfs, lookup count, dict ya None].
+        """
+        total_docs = len(self)
+        cursors, lookups = [], [[] for _ in self.segments]
+        for term_no, term in enumerate(terms):
+            found = [(number, segment, segment.lists(term)) for number, segment in enumerate(self.segments)]
+            found = [item for item in found if item[2]]
+            df = sum(len(lists[0]) for _, _, lists in found)
+            if not df:
+                continue
+            weight = math.log(1 + (total_docs - df + 0.5) / (df + 0.5)) * (K1 + 1)
+            for number, segment, (docs, tfs, impact_docs, impact_tfs) in found:
+                # avgdl badha ho to norms chhote, impact (avgdl_w / avgdl) guna tak bada ho sakta hai;
+                # (1 + 1e-9): float rounding se bound kabhi chhota na pade
+                scale = weight * (1 + 1e-9) / min(1.0, segment.avgdl / self.avgdl)
+                cursor = [number, term_no, weight, scale, segment, impact_docs, impact_tfs, 0, 0.0]
+                self._head_bound(cursor)
+                cursors.append(cursor)
+                lookups[number].append([term_no, weight, docs, tfs, 0, None])
+        return cursors, lookups
+
+    def _head_bound(self, cursor):
+        """List ke agle (aur isliye har baaki) doc ke score ka upper bound; khatam list par 0."""
+        segment, docs, tfs, position = cursor[4], cursor[5], cursor[6], cursor[7]
+        if position >= len(docs):
+            cursor[8] = 0.0
+            return
+        tf = tfs[position]
+        length = self.lengths[segment.first_doc + docs[position]]
+        cursor[8] = cursor[3] * tf / (tf + K1 * (1 - B + B * length / segment.avgdl))
+
+    def search(self, query, limit=10, kind=None, since=None, until=None):
+        """Exact BM25 top `limit` results: [{score, kind, key, date, title}], best pehle."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not len(self) or limit < 1:
+            return []
+        norms = self.norms
+        mask = self._filter_mask(kind, since, until) if kind or since or until else None
+        cursors, lookups = self._cursors(terms)
+        seen, heap = set(), []   # heap: (score, doc), sabse chhota upar
+
+        while True:
+            sums = [0.0] * len(self.segments)
+            best = None
+            for cursor in cursors:
+                if cursor[8]:
+                    sums[cursor[0]] += cursor[8]
+                    if best is None or cursor[8] > best[8]:
+                        best = cursor
+            # Har ankhe doc ka score uske segment ke head bounds ke jod se kam
+            if best is None or (len(heap) >= limit and heap[0][0] >= max(sums)):
+                break
+
+            number, term_no, weight, _, segment, docs, tfs, position, bound = best
+            rest = sums[number] - bound   # Is doc ke baaki terms ka upper bound
+            end = position + BLOCK
+            block = zip(docs[position:end], tfs[position:end])
+            best[7] = end
+            self._head_bound(best)
+
+            first = segment.first_doc
+            others = [entry for entry in lookups[number] if entry[0] != term_no]
+            floor = heap[0][0] if len(heap) >= limit else -1.0
+            for doc, tf in block:
+                doc += first
+                if doc in seen or (mask is not None and not mask[doc]):
+                    continue
+                norm = norms[doc]
+                score = weight * tf / (tf + norm)
+                if score + rest <= floor:
+                    continue   # Baaki terms mila kar bhi top-k me nahi aa sakta
+                seen.add(doc)
+                relative = doc - first
+                for entry in others:
+                    table = entry[5]
+                    if table is None:
+                        entry[4] += 1
+                        ids = entry[2]
+                        if entry[4] * 8 <= len(ids):
+                            i = bisect_left(ids, relative)
+                            if i < len(ids) and ids[i] == relative:
+                                other_tf = entry[3][i]
+                                score += entry[1] * other_tf / (other_tf + norm)
+                            continue
+                        # Bahut lookups: poori list ek baar dict me (binary search se sasta)
+                        table = entry[5] = dict(zip(ids, entry[3]))
+                    other_tf = table.get(relative)
+                    if other_tf:
+                        score += entry[1] * other_tf / (other_tf + norm)
+                if score > floor:
+                    if len(heap) < limit:
+                        heapq.heappush(heap, (score, doc))
+                    else:
+                        heapq.heapreplace(heap, (score, doc))
+                    if len(heap) >= limit:
+                        floor = heap[0][0]
+
+        results = []
+        for score, doc in sorted(heap, reverse=True):
+            kind, key, date, _, title = self._doc(doc)
+            results.append({"score": round(score, 3), "kind": kind, "key": key, "date": date, "title": title})
+        return results
+
+    def stats(self):
+        size = sum(os.path.getsize(os.path.join(self.directory, f)) for f in os.listdir(self.directory))
+        counts = {kind: self.count(kind) for kind in KINDS}
+        return {"docs": len(self), "by_kind": counts, "segments": len(self.segments),
+                "terms": len(set().union(*(s.terms for s in self.segments))) if self.segments else 0,
+                "bytes": size}
+
+    def close(self):
+        for segment in getattr(self, "segments", []):
+            segment.close()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+def rebuild(directory=INDEX_DIR, quiz_file="quiz.json"):
+    """Index mita ke archive store, quiz bank aur quiz.json se dobara banata hai."""
+    from quiz_bank import QuizBank
+
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+    index = SearchIndex(directory)
+    store = ArchiveStore()
+    news = index.add_news(store.query())
+    store.close()
+
+    quiz = index.add_quiz(QuizBank().questions)
+    if os.path.exists(quiz_file):
+        with open(quiz_file, "r", encoding="utf-8") as f:
+            quiz += index.add_quiz(json.load(f))
+    index.merge()
+    return index, news, quiz
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over archive and quiz questions")
+    sub = parser.add_subparsers(dest="command", required=True)
+    search = sub.add_parser("search", help="BM25 search")
+    search.add_argument("query")
+    search.add_argument("--since", help="YYYY-MM-DD")
+    search.add_argument("--until", help="YYYY-MM-DD")
+    search.add_argument("--kind", choices=KINDS)
+    search.add_argument("--limit", type=int, default=10)
+    sub.add_parser("rebuild", help="Archive + quiz.json se index dobara banao")
+    sub.add_parser("stats", help="Index size")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        index, news, quiz = rebuild()
+        print(f"✅ Index rebuilt: {news} news + {quiz} quiz questions")
+    else:
+        index = SearchIndex()
+        if args.command == "stats":
+            stats = index.stats()
+            print(f"🔎 {stats['docs']} docs ({stats['by_kind']}), {stats['terms']} terms, "
+                  f"{stats['segments']} segments, {stats['bytes'] / 1e6:.1f} MB")
+        else:
+            for hit in index.search(args.query, args.limit, args.kind, args.since, args.until):
+                print(f"{hit['score']:7.3f}  [{hit['kind']}] {hit['date'] or '----------'}  {hit['title'][:80]}")
+                if hit["kind"] == "news":
+                    print(f"         {hit['key']}")
+    index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+StageCheckpoint (checkpoints.py): clean stage ke drop kiye chhote articles journal me
+finished hone chahiye, taaki pipeline unhe har run carry forward na kare.
+
+    python -m pytest -q test_checkpoints.py
+"""
+import datetime
+
+import pipeline
+from checkpoints import StageCheckpoint
+from cut import process_cleaning
+from records import read_records, write_records
+
+LONG = "The finance ministry announced a new export policy for the coming year. " * 4
+
+def test_dropped_records_are_not_carried(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    today = datetime.date.today().isoformat()
+    write_records("1.jsonl", [{"link": "long", "title": "A", "date": today, "content": LONG},
+                              {"link": "short", "title": "B", "date": today, "content": "Too short."}])
+
+    assert process_cleaning("1.jsonl", "2.jsonl", checkpoint=StageCheckpoint("clean")) == 1
+    assert "short" in StageCheckpoint("clean")
+    assert [r["link"] for r in pipeline.unfinished_records()] == []
+
+    # Rerun: drop journal se resume hota hai, output me phir bhi nahi aata
+    assert process_cleaning("1.jsonl", "2.jsonl", checkpoint=StageCheckpoint("clean")) == 1
+    assert [r["link"] for r in read_records("2.jsonl")] == ["long"]
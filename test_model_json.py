@@ -0,0 +1,28 @@
+"""
+model_json salvage: model ka jawab kisi bhi byte par kata ho, salvage sirf wahi items
+de jo poore jawab me bhi the (adhura number `12.` -> 12 kabhi nahi).
+
+    python -m pytest -q test_model_json.py
+"""
+import json
+
+from model_json import salvage_array, salvage_object
+
+ITEMS = [1, -2.5, 12.75, -0.001, 3e-4, 1e10, True, None, "ab,c]", {"q": "x", "n": -7.25}, [4, 5.5], 0, False]
+OBJECT = {"score": -2.5, "total": 12.75, "ok": True, "tags": ["a", 1.5], "none": None, "exp": 6e-3, "n": 120}
+
+def test_array_cut_at_every_offset():
+    text = json.dumps(ITEMS)
+    assert salvage_array(text) == (ITEMS, None)
+    for cut in range(len(text)):
+        items, truncated = salvage_array(text[:cut])
+        assert items == ITEMS[:len(items)], text[:cut]
+        assert truncated
+
+def test_object_cut_at_every_offset():
+    text = json.dumps(OBJECT, indent=2)
+    assert salvage_object(text) == (OBJECT, None)
+    for cut in range(len(text)):
+        result, truncated = salvage_object(text[:cut])
+        assert all(OBJECT[key] == value for key, value in result.items()), text[:cut]
+        assert truncated
@@ -0,0 +1,33 @@
+"""
+Scheduler (rate_limiter.py) fake quota ke against: har job ka sahi result, quota
+sach me hit hota hai, aur har 429 ek rate-limited retry ban kar wapas aata hai.
+
+    python -m pytest -q test_rate_limiter.py
+"""
+import fake_genai
+from rate_limiter import RATE_LIMITED, TRANSIENT, Scheduler
+
+def echo_item(prompt):
+    """Prompt ka aakhri word wapas: har job apna alag, pehchaanne laayak text paata hai."""
+    return prompt.split()[-1]
+
+def run_jobs(jobs=30, quota_per_s=10, concurrency=4):
+    backend = fake_genai.install(echo_item, rpm=quota_per_s, window_s=1.0)
+    # Scheduler quota se dugne RPM par shuru hota hai, taaki 429 aaye aur wo slow down kare
+    scheduler = Scheduler(rpm=quota_per_s * 60 * 2, concurrency=concurrency, max_retries=10, name="test",
+                          backoff={RATE_LIMITED: (0.1, 1.0), TRANSIENT: (0.05, 0.5)})
+    model = fake_genai.GenerativeModel("models/gemini-1.5-flash")
+
+    def job(i):
+        return scheduler.call(model.generate_content, f"item-{i}").text
+
+    return list(scheduler.map(job, range(jobs))), scheduler, backend
+
+def test_scheduler_under_fake_quota():
+    results, scheduler, backend = run_jobs()
+
+    assert results == [f"item-{i}" for i in range(30)]
+    assert backend.quota.rejected > 0
+    assert scheduler.stats[RATE_LIMITED] == backend.quota.rejected
+    assert scheduler.stats["retries"] == backend.quota.rejected
+    assert scheduler.stats["requests"] == 30 + backend.quota.rejected
@@ -0,0 +1,31 @@
+"""
+records.py legacy JSON array reader: chunk kisi bhi byte par kate, records json.load
+jaise hi aayein; kati hui file par prefix ke baad error, galat value kabhi nahi.
+
+    python -m pytest -q test_records.py
+"""
+import io
+import json
+
+import pytest
+
+import records
+
+VALUES = [-2.5, 12.75, -0.001, 3e-4, 1e10, 7, True, None, False, "x]", {"a": -2.5, "b": [1.5, -3]}, [0, -1e-2]]
+
+@pytest.fixture(autouse=True)
+def tiny_chunks(monkeypatch):
+    monkeypatch.setattr(records, "CHUNK_SIZE", 1)
+
+def test_array_read_with_one_char_chunks():
+    for text in (json.dumps(VALUES), json.dumps(VALUES, indent=4)):
+        assert list(records.iter_records(io.StringIO(text))) == VALUES
+
+def test_truncated_array_never_misparses():
+    text = json.dumps(VALUES, indent=4)
+    for cut in range(1, len(text)):
+        got = []
+        with pytest.raises(ValueError):
+            for record in records.iter_records(io.StringIO(text[:cut])):
+                got.append(record)
+        assert got == VALUES[:len(got)], text[:cut]
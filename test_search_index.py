@@ -0,0 +1,71 @@
+"""
+SearchIndex (search_index.py): threshold-algorithm search ka result brute-force BM25
+jaisa hi hona chahiye (merge ke baad bhi), aur docs.bin crash / delete hone par docs.jsonl
+se wapas banni chahiye.
+
+    python -m pytest -q test_search_index.py
+"""
+import heapq
+import math
+import os
+import random
+
+from search_index import K1, SearchIndex, tokenize
+
+WORDS = ("rbi repo rate india defence deal gst court judge forex reserves billion trade tariff "
+         "scheme launch minister state bank policy export crude oil").split()
+
+def make_records(count, seed=3):
+    rng = random.Random(seed)
+    return [{"link": f"https://example.com/{i}", "date": f"2026-0{1 + i % 9}-1{i % 10}",
+             "title": " ".join(rng.choices(WORDS, k=4)),
+             "content": " ".join(rng.choices(WORDS, k=rng.randint(5, 80)))}
+            for i in range(count)]
+
+def brute_force(index, query, limit=10, kind=None, since=None, until=None):
+    mask = index._filter_mask(kind, since, until) if kind or since or until else None
+    scores = {}
+    for term in dict.fromkeys(tokenize(query)):
+        found = [(segment, segment.lists(term)) for segment in index.segments]
+        found = [(segment, lists) for segment, lists in found if lists]
+        df = sum(len(lists[0]) for _, lists in found)
+        if not df:
+            continue
+        weight = math.log(1 + (len(index) - df + 0.5) / (df + 0.5)) * (K1 + 1)
+        for segment, (docs, tfs, _, _) in found:
+            for doc, tf in zip(docs, tfs):
+                doc += segment.first_doc
+                if mask is None or mask[doc]:
+                    scores[doc] = scores.get(doc, 0.0) + weight * tf / (tf + index.norms[doc])
+    return [round(score, 3) for score in heapq.nlargest(limit, scores.values())]
+
+def test_search_matches_brute_force(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    records = make_records(1200)
+    for i in range(0, len(records), 100):   # 12 batches -> tiered merges bhi
+        index.add_news(records[i:i + 100])
+    for query in ("rbi repo rate", "forex reserves billion", "trade deal tariff", "court", "crude oil export"):
+        for filters in ({}, {"since": "2026-05-01"}, {"until": "2026-03-01", "limit": 3}, {"limit": 50}):
+            hits = index.search(query, **filters)
+            assert [hit["score"] for hit in hits] == brute_force(index, query, **filters)
+    index.close()
+
+def test_doc_table_rebuilt_from_jsonl(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.add_news(make_records(300))
+    expected = index.search("rbi repo rate")
+    index.close()
+
+    table = tmp_path / "docs.bin"
+    with open(table, "r+b") as f:
+        f.truncate(os.path.getsize(table) - 40)   # Aakhri rows adhuri (crash)
+    index = SearchIndex(str(tmp_path))
+    assert len(index) == 300 and index.search("rbi repo rate") == expected
+    index.close()
+
+    os.remove(table)
+    index = SearchIndex(str(tmp_path))
+    assert ("news", "https://example.com/7") in index
+    assert index.count("news") == 300 and index.search("rbi repo rate") == expected
+    assert index.add_news(make_records(300)) == 0
+    index.close()
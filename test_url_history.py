@@ -0,0 +1,49 @@
+"""
+FingerprintHistory (url_history.py): save ke baad reopen karne par saare dekhe hue
+URLs yaad rehne chahiye, chahe main file ho ya na ho, ya history JSON se migrate hui ho.
+
+    python -m pytest -q test_url_history.py
+"""
+import json
+import os
+
+from url_history import JOURNAL_SUFFIX, FingerprintHistory
+
+URLS = [f"https://example.com/news/{i}" for i in range(31)]
+
+def reopen(tmp_path, **kwargs):
+    return FingerprintHistory(str(tmp_path / "urls.bin"), legacy_path=str(tmp_path / "urls.json"), **kwargs)
+
+def test_fresh_install_remembers_after_save(tmp_path):
+    history = reopen(tmp_path)
+    for url in URLS:
+        history.add(url)
+    history.save()
+
+    history = reopen(tmp_path)
+    assert all(url in history for url in URLS)
+    assert "https://example.com/other" not in history
+
+def test_journal_only_entries_are_loaded(tmp_path):
+    history = reopen(tmp_path)
+    history.add(URLS[0])
+    history.save()                 # Main file banti hai
+    history.add(URLS[1])
+    history.save()                 # Sirf journal me
+    assert os.path.exists(str(tmp_path / "urls.bin") + JOURNAL_SUFFIX)
+
+    os.remove(tmp_path / "urls.bin")   # Journal bacha, main file nahi
+    history = reopen(tmp_path)
+    assert URLS[1] in history
+
+def test_legacy_migration_then_incremental_save(tmp_path):
+    (tmp_path / "urls.json").write_text(json.dumps(URLS[:10]), encoding="utf-8")
+    history = reopen(tmp_path)
+    assert not (tmp_path / "urls.json").exists()
+    for url in URLS[10:]:
+        history.add(url)
+    history.save()
+
+    history = reopen(tmp_path)
+    assert all(url in history for url in URLS)
+    assert len(history) == len(URLS)
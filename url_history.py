@@ -0,0 +1,209 @@
+"""
+Scraped URL history backends.
+
+Scraper ko sirf "ye link pehle dekha hai ya nahi" jaanna hota hai, isliye poore
+URLs save karne ki zaroorat nahi. Default backend har URL ka 64-bit fingerprint
+(blake2b) aur pehli baar dekhe jaane ka din save karta hai:
+
+- `scraped_urls.bin`      sorted fingerprints + days (12 bytes / URL)
+- `scraped_urls.bin.log`  naye entries ka append-only journal (incremental save)
+
+Journal bada hone par ya TTL se purane entries expire hone par dono merge
+(compact) hote hain; main file na ho to pehla save hi compact karta hai. Purana
+`scraped_urls.json` pehli baar automatically import hota hai aur phir hata diya
+jaata hai (stale copy na rahe).
+
+Config (env vars):
+    HISTORY_BACKEND   = fingerprint (default) | json
+    HISTORY_TTL_DAYS  = 180 (0 = kabhi expire nahi)
+"""
+import datetime
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+LEGACY_HISTORY_FILE = "scraped_urls.json"
+FINGERPRINT_FILE = "scraped_urls.bin"
+JOURNAL_SUFFIX = ".log"
+
+DEFAULT_TTL_DAYS = 180
+COMPACT_MIN_JOURNAL = 1000  # Journal kam se kam itna bada ho tabhi compaction
+COMPACT_RATIO = 0.1         # ...aur main file ka 10% se zyada
+
+HEADER = struct.Struct("<4sII")  # magic, count, oldest day
+MAGIC = b"URLH"
+JOURNAL_ENTRY = struct.Struct("<QI")
+
+def fingerprint(url):
+    """URL ka stable 64-bit hash."""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+def today_number():
+    return datetime.date.today().toordinal()
+
+def _to_le(arr):
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+class JsonHistory:
+    """Purana backend: poore URLs ki JSON list, har save par full rewrite."""
+
+    def __init__(self, path=LEGACY_HISTORY_FILE):
+        self.path = path
+        self._urls = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._urls = set(json.load(f))
+
+    def __contains__(self, url):
+        return url in self._urls
+
+    def __len__(self):
+        return len(self._urls)
+
+    def add(self, url):
+        self._urls.add(url)
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(list(self._urls), f, indent=4)
+
+class FingerprintHistory:
+    """Compact fingerprint set with TTL eviction aur journal-based incremental saves."""
+
+    def __init__(self, path=FINGERPRINT_FILE, ttl_days=DEFAULT_TTL_DAYS,
+                 legacy_path=LEGACY_HISTORY_FILE, today=None):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.ttl_days = ttl_days
+        self.today = today or today_number()
+
+        self._fps = array("Q")    # Sorted fingerprints (main file)
+        self._days = array("I")   # Same index par pehli baar dekhe jaane ka din
+        self._oldest = None       # Main file ka sabse purana din (TTL check ke liye)
+        self._journal = {}        # Journal me pade entries (fingerprint -> day)
+        self._pending = {}        # Is run me jude, abhi save nahi hue
+
+        if os.path.exists(path):
+            self._load_main()
+        elif legacy_path and os.path.exists(legacy_path):
+            # Pehli baar: purani JSON list import karo aur turant compact file banao
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                for url in json.load(f):
+                    self.add(url)
+            self.compact()
+            os.remove(legacy_path)
+            print(f"📦 '{legacy_path}' se {len(self)} URLs '{path}' me migrate hue (JSON file hata di).")
+        # Journal hamesha: main file ke bina bhi (crash / purana version) usme entries ho sakti hain
+        self._load_journal()
+
+    # --- loading ---
+
+    def _load_main(self):
+        with open(self.path, "rb") as f:
+            magic, count, self._oldest = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"'{self.path}' is not a URL history file")
+            self._fps.frombytes(f.read(8 * count))
+            self._days.frombytes(f.read(4 * count))
+        _to_le(self._fps)
+        _to_le(self._days)
+
+    def _load_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            data = f.read()
+        # Adhuri entry (crash ke beech likhi) ignore hoti hai
+        usable = len(data) - len(data) % JOURNAL_ENTRY.size
+        for fp, day in JOURNAL_ENTRY.iter_unpack(data[:usable]):
+            self._journal.setdefault(fp, day)
+
+    # --- set API ---
+
+    def _in_main(self, fp):
+        i = bisect_left(self._fps, fp)
+        return i < len(self._fps) and self._fps[i] == fp
+
+    def __contains__(self, url):
+        fp = fingerprint(url)
+        return fp in self._pending or fp in self._journal or self._in_main(fp)
+
+    def __len__(self):
+        return len(self._fps) + len(self._journal) + len(self._pending)
+
+    def add(self, url):
+        fp = fingerprint(url)
+        if fp not in self._pending and fp not in self._journal and not self._in_main(fp):
+            self._pending[fp] = self.today
+
+    # --- saving ---
+
+    def _needs_compaction(self):
+        journal_size = len(self._journal) + len(self._pending)
+        if journal_size >= max(COMPACT_MIN_JOURNAL, COMPACT_RATIO * len(self._fps)):
+            return True
+        # TTL: sabse purana entry expire ho chuka ho to bhi compact karo
+        return bool(self.ttl_days and self._fps and self._oldest < self.today - self.ttl_days)
+
+    def save(self):
+        """Sirf naye entries journal me append hote hain; zaroorat ho (ya main file na ho) to full compaction."""
+        if self._needs_compaction() or not os.path.exists(self.path):
+            self.compact()
+            return
+        if not self._pending:
+            return
+        with open(self.journal_path, "ab") as f:
+            f.write(b"".join(JOURNAL_ENTRY.pack(fp, day) for fp, day in self._pending.items()))
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal.update(self._pending)
+        self._pending = {}
+
+    def compact(self):
+        """Main file + journal + pending ko merge karke expired entries hata deta hai."""
+        merged = dict(zip(self._fps, self._days))
+        merged.update(self._journal)
+        merged.update(self._pending)
+
+        if self.ttl_days:
+            cutoff = self.today - self.ttl_days
+            merged = {fp: day for fp, day in merged.items() if day >= cutoff}
+
+        fps = sorted(merged)
+        self._fps = array("Q", fps)
+        self._days = array("I", (merged[fp] for fp in fps))
+        self._oldest = min(self._days) if self._days else 0
+        self._journal, self._pending = {}, {}
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(fps), self._oldest))
+            f.write(_to_le(array("Q", self._fps)).tobytes())
+            f.write(_to_le(array("I", self._days)).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+BACKENDS = {
+    "fingerprint": FingerprintHistory,
+    "json": JsonHistory,
+}
+
+def open_history(backend=None, ttl_days=None):
+    """Env/config ke hisaab se history backend kholta hai."""
+    backend = backend or os.environ.get("HISTORY_BACKEND", "fingerprint")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown history backend: {backend}. Available: {', '.join(BACKENDS)}")
+    if backend == "json":
+        return JsonHistory()
+    if ttl_days is None:
+        ttl_days = int(os.environ.get("HISTORY_TTL_DAYS", DEFAULT_TTL_DAYS))
+    return FingerprintHistory(ttl_days=ttl_days)